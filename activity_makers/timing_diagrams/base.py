@@ -87,9 +87,52 @@ def draw_timing_grid(t_end,
     return fig, ax
 
 
+def _bus_label(value, width=None) -> str:
+    """ Hex text for a bus value, non int values (e.g. "X", "Z") as they are. """
+    if isinstance(value, (int, np.integer)):
+        digits = (width + 3) // 4 if width else 1
+        return f"{int(value):0{digits}X}"
+    return str(value)
+
+
+def _draw_bus(ax, pts, end_time, base_y, amp, width=None):
+    """
+    Draw a bus lane: two rails that cross at every transition, with the
+    value of each segment written in hex in the middle.
+    """
+    slope = 0.01 * end_time  # half width of the crossing
+    # hold the last value until end_time
+    times = [t for t, _ in pts] + [end_time]
+    top, bottom, mid = base_y + amp, base_y, base_y + 0.5 * amp
+    line = None
+    for (t_start, value), t_end in zip(pts, times[1:]):
+        if t_end <= t_start:
+            continue
+        d = min(slope, 0.25 * (t_end - t_start))
+        # the first segment starts flat at t = 0, others come out of a crossing
+        x_in = t_start + d if t_start > 0 else t_start
+        x_out = t_end - d if t_end < end_time else t_end
+        xs = [t_start, x_in, x_out, t_end]
+        color = line.get_color() if line is not None else None
+        line, = ax.plot(xs, [mid if t_start > 0 else top, top, top,
+                             mid if t_end < end_time else top], color=color)
+        ax.plot(xs, [mid if t_start > 0 else bottom, bottom, bottom,
+                     mid if t_end < end_time else bottom], color=line.get_color())
+        ax.text(0.5 * (t_start + t_end), mid, _bus_label(value, width),
+                ha='center', va='center', fontsize=8)
+
+
 def draw_signals(signals: dict, end_time=50,
                  row_height = 0.45, dt = 5, x_label="Time (ns)",
-                 filename=None, start_signals ={}, **kwargs):
+                 filename=None, start_signals ={}, bus_widths=None, **kwargs):
+    """
+    Draw the signals of a simulate_circuit history as a timing diagram.
+
+    Signals listed in bus_widths (name -> bits, e.g. from
+    circuit_timing.buses.signal_widths) or with any value other than 0 / 1
+    are drawn as bus lanes labelled with their value in hex.
+    """
+    bus_widths = bus_widths or {}
     print("bb", len(signals))
     fig, ax = draw_timing_grid(end_time, n_rows=len(signals),
                                row_height=row_height, column_length=dt,
@@ -155,6 +198,10 @@ def draw_signals(signals: dict, end_time=50,
         times = []
         levels = []
 
+        if name in bus_widths or any(v not in (0, 1) for _, v in pts):
+            _draw_bus(ax, pts, end_time, base_y, amp, bus_widths.get(name))
+            continue
+
         # Build piecewise-constant segments
         last_t = pts[0][0]
         last_v = pts[0][1]
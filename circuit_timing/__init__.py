@@ -0,0 +1,27 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Gate level timing simulation for the timing diagram activities.
+
+Gate and DFF are the circuit model every engine takes; simulate() runs a
+circuit on the engine picked per call (see simulators.ENGINES).
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+# local files
+from circuit_timing.circuit_timing import (DFF, Gate, LogicValue, SimStats, Time, TimingViolation,
+                                            check_timing, eval_gate, iter_circuit,
+                                            simulate_circuit)
+from circuit_timing.netlist import Netlist, compile_netlist, simulate_netlist
+from circuit_timing.simulators import (ENGINES, BitParallelSimulator, CompiledSimulator,
+                                       CycleSimulator, ReferenceSimulator, Simulator,
+                                       get_simulator, simulate)
+
+__all__ = [
+    "DFF", "Gate", "LogicValue", "SimStats", "Time", "TimingViolation", "check_timing",
+    "eval_gate", "iter_circuit", "simulate_circuit",
+    "Netlist", "compile_netlist", "simulate_netlist",
+    "ENGINES", "BitParallelSimulator", "CompiledSimulator", "CycleSimulator",
+    "ReferenceSimulator", "Simulator", "get_simulator", "simulate",
+]
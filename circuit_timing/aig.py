@@ -0,0 +1,238 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Compile Boolean expressions into a shared And-Inverter Graph and emit it as
+a Gate netlist.
+
+The expressions are the Var / Unary / Binary trees of
+schematic_makers/schem_from_eqn_generator (parse_expr, random_expr). They
+are read by their attributes only (name, op, child, left, right), so this
+module does not need schemdraw; ints 0 and 1 are accepted as constants.
+
+Every signal of the graph is a literal, 2 * node + complement, node 0 being
+the constant 0 (so literal 0 is false and literal 1 is true). AND nodes are
+structurally hashed: an AND of the same two literals is built once however
+many times the expression repeats it, and the usual identities (x & 0,
+x & 1, x & x, x & !x) fold away before a node is made. OR and NOT are
+complements, XOR is three ANDs unless keep_xor=True gives it nodes of its
+own, hashed the same way.
+
+to_gates() maps each node back onto the cells: an AND node is an AND gate,
+or a NAND where its complement is used, and an AND of two complements is a
+NOR (its complement an OR), so the netlist reads like a hand drawn one.
+Only primary inputs get NOT gates.
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+# standard libraries
+from typing import Dict, List, Tuple
+
+# local files
+from circuit_timing.circuit_timing import Gate, LogicValue, Time
+
+FALSE, TRUE = 0, 1
+DEFAULT_DELAYS: Dict[str, Time] = {
+    "NOT": 1, "BUF": 1, "AND": 2, "NAND": 1, "OR": 2, "NOR": 1, "XOR": 3, "XNOR": 3,
+}
+
+
+class AIG:
+    """
+    And-Inverter Graph with structural hashing and constant folding.
+
+    Parameters
+    ----------
+    keep_xor : bool, optional
+        Keep XOR as a node type (emitted as XOR / XNOR gates) instead of
+        building it from three ANDs.
+
+    Attributes
+    ----------
+    nodes : list of tuple
+        ("CONST",), ("IN", name), ("AND", a, b) or ("XOR", a, b) per node,
+        fanins before the nodes that use them.
+    outputs : dict
+        Output name -> literal.
+    """
+    def __init__(self, keep_xor: bool = False):
+        self.keep_xor = keep_xor
+        self.nodes: List[Tuple] = [("CONST",)]
+        self.outputs: Dict[str, int] = {}
+        self._inputs: Dict[str, int] = {}
+        self._hashed: Dict[Tuple[str, int, int], int] = {}
+
+    @property
+    def n_gates(self) -> int:
+        """ Number of AND (and XOR) nodes. """
+        return len(self._hashed)
+
+    def input(self, name: str) -> int:
+        """ Literal of a primary input, made on first use. """
+        if name not in self._inputs:
+            self._inputs[name] = 2 * len(self.nodes)
+            self.nodes.append(("IN", name))
+        return self._inputs[name]
+
+    def _node(self, kind: str, a: int, b: int) -> int:
+        key = (kind, min(a, b), max(a, b))
+        if key not in self._hashed:
+            self._hashed[key] = 2 * len(self.nodes)
+            self.nodes.append(key)
+        return self._hashed[key]
+
+    def and_(self, a: int, b: int) -> int:
+        if a == FALSE or b == FALSE or a == b ^ 1:
+            return FALSE
+        if a == TRUE or a == b:
+            return b
+        if b == TRUE:
+            return a
+        return self._node("AND", a, b)
+
+    def or_(self, a: int, b: int) -> int:
+        return self.and_(a ^ 1, b ^ 1) ^ 1
+
+    def xor(self, a: int, b: int) -> int:
+        # complements move to the output, so x ^ !y shares the node of x ^ y
+        invert = (a ^ b) & 1
+        a, b = a & ~1, b & ~1
+        if a == b:
+            return invert
+        if a == FALSE or b == FALSE:
+            return a ^ b ^ invert
+        if self.keep_xor:
+            return self._node("XOR", a, b) ^ invert
+        return self.or_(self.and_(a, b ^ 1), self.and_(a ^ 1, b)) ^ invert
+
+    def add_expr(self, expr) -> int:
+        """ Literal of an expression tree (Var / Unary / Binary or 0 / 1). """
+        if isinstance(expr, int):
+            if expr not in (0, 1):
+                raise ValueError(f"Constants must be 0 or 1, got {expr}")
+            return expr
+        if hasattr(expr, "child"):
+            if expr.op != "NOT":
+                raise ValueError(f"Unknown unary operator: {expr.op}")
+            return self.add_expr(expr.child) ^ 1
+        if hasattr(expr, "left"):
+            ops = {"AND": self.and_, "OR": self.or_, "XOR": self.xor}
+            if expr.op not in ops:
+                raise ValueError(f"Unknown binary operator: {expr.op}")
+            return ops[expr.op](self.add_expr(expr.left), self.add_expr(expr.right))
+        if hasattr(expr, "name"):
+            return self.input(expr.name) ^ int(getattr(expr, "inv", False))
+        raise ValueError(f"Not an expression node: {expr!r}")
+
+    def add_output(self, name: str, expr) -> int:
+        """ Compile expr and make it the output `name`, returns its literal. """
+        self.outputs[name] = self.add_expr(expr)
+        return self.outputs[name]
+
+    def evaluate(self, inputs: Dict[str, LogicValue]) -> Dict[str, LogicValue]:
+        """ Output values for one set of input values (missing inputs are 0). """
+        values = [0] * len(self.nodes)
+        for n, node in enumerate(self.nodes):
+            if node[0] == "IN":
+                values[n] = inputs.get(node[1], 0)
+            elif node[0] != "CONST":
+                a = values[node[1] >> 1] ^ (node[1] & 1)
+                b = values[node[2] >> 1] ^ (node[2] & 1)
+                values[n] = a & b if node[0] == "AND" else a ^ b
+        return {name: values[lit >> 1] ^ (lit & 1) for name, lit in self.outputs.items()}
+
+    def _is_input(self, lit: int) -> bool:
+        """ True for the (uncomplemented) literal of a primary input. """
+        return not lit & 1 and self.nodes[lit >> 1][0] == "IN"
+
+    def _cell(self, lit: int) -> Tuple[str, List[int]]:
+        """ Gate type and input literals that drive lit (an AND / XOR node or !input). """
+        node = self.nodes[lit >> 1]
+        invert = lit & 1
+        if node[0] == "IN":
+            return "NOT", [lit ^ 1]
+        _, a, b = node
+        if node[0] == "XOR":
+            return ("XNOR" if invert else "XOR"), [a, b]
+        if a & b & 1:   # AND of two complements
+            return ("OR" if invert else "NOR"), [a ^ 1, b ^ 1]
+        return ("NAND" if invert else "AND"), [a, b]
+
+    def to_gates(self, delays: Dict[str, Time] | None = None,
+                 prefix: str = "n") -> Tuple[List[Gate], Dict[str, LogicValue]]:
+        """
+        Gates for every output, for simulate_circuit and the other engines.
+
+        Parameters
+        ----------
+        delays : dict, optional
+            Gate type -> delay, merged over DEFAULT_DELAYS.
+        prefix : str, optional
+            Start of the internal signal names, {prefix}{node} and
+            {prefix}{node}_n for the complement.
+
+        Returns
+        -------
+        gates : list of Gate
+            In topological order, each output driven by a gate of its name.
+        constants : dict
+            Outputs that folded to a constant -> 0 or 1, to go in
+            initial_signals since no gate drives them.
+        """
+        delays = {**DEFAULT_DELAYS, **(delays or {})}
+        constants = {name: lit for name, lit in self.outputs.items() if lit in (FALSE, TRUE)}
+
+        # name every literal that needs a signal, outputs keep their own name
+        names: Dict[int, str] = {}
+        buffers: List[Tuple[str, int]] = []
+        for name, lit in self.outputs.items():
+            if lit in (FALSE, TRUE):
+                continue
+            if lit in names or self._is_input(lit):
+                buffers.append((name, lit))   # the signal already has a name
+            else:
+                names[lit] = name
+        needed = set(names) | {lit for _, lit in buffers}
+        stack = list(needed)
+        while stack:
+            lit = stack.pop()
+            if self._is_input(lit):
+                continue
+            for fanin in self._cell(lit)[1]:
+                if fanin not in needed:
+                    needed.add(fanin)
+                    stack.append(fanin)
+
+        def signal(lit: int) -> str:
+            if self._is_input(lit):
+                return self.nodes[lit >> 1][1]
+            if lit not in names:
+                names[lit] = f"{prefix}{lit >> 1}" + ("_n" if lit & 1 else "")
+            return names[lit]
+
+        gates = []
+        for lit in sorted(needed):
+            if self._is_input(lit):
+                continue
+            gate_type, fanins = self._cell(lit)
+            out = signal(lit)
+            gates.append(Gate(f"U_{out}", gate_type, [signal(f) for f in fanins],
+                              out, delays[gate_type]))
+        for name, lit in buffers:
+            gates.append(Gate(f"U_{name}", "BUF", [signal(lit)], name, delays["BUF"]))
+        return gates, constants
+
+
+def compile_expressions(expressions: Dict[str, object],
+                        delays: Dict[str, Time] | None = None,
+                        keep_xor: bool = False) -> Tuple[List[Gate], Dict[str, LogicValue]]:
+    """
+    Gates computing every expression, subexpressions shared between all of
+    them. expressions maps output name -> Var / Unary / Binary tree.
+
+    returns: (gates, constants), see AIG.to_gates
+    """
+    aig = AIG(keep_xor=keep_xor)
+    for name, expr in expressions.items():
+        aig.add_output(name, expr)
+    return aig.to_gates(delays)
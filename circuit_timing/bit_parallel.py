@@ -0,0 +1,216 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Zero-delay, bit-parallel evaluation of a Gate netlist over every row of its
+truth table.
+
+Each signal is a NumPy array of uint64 words, bit r of the array being the
+value of the signal in truth table row r (row r = input combination r with
+the first input as the MSB, the same numbering TruthTable and KarnaughMap
+use for minterms). One topological pass over the gates therefore evaluates
+64 rows per machine word instead of running simulate_circuit once per row.
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+# standard libraries
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# installed libraries
+import numpy as np
+
+# local files
+from circuit_timing.cells import table_op
+from circuit_timing.circuit_timing import Gate
+from circuit_timing.netlist import Netlist, check_driven, compile_netlist, topological_order
+
+WORD_BITS = 64
+ALL_ONES = np.uint64(0xFFFF_FFFF_FFFF_FFFF)
+# bit r of LANE_PATTERNS[k] is bit k of r, for the 6 row bits inside a word
+LANE_PATTERNS = (
+    0xAAAA_AAAA_AAAA_AAAA,
+    0xCCCC_CCCC_CCCC_CCCC,
+    0xF0F0_F0F0_F0F0_F0F0,
+    0xFF00_FF00_FF00_FF00,
+    0xFFFF_0000_FFFF_0000,
+    0xFFFF_FFFF_0000_0000,
+)
+
+Words = np.ndarray
+
+
+def _reduce(op: np.ufunc) -> Callable[[List[Words]], Words]:
+    def word_op(ins: List[Words]) -> Words:
+        out = ins[0].copy()
+        for w in ins[1:]:
+            op(out, w, out=out)
+        return out
+    return word_op
+
+
+def _inverted(word_op: Callable[[List[Words]], Words]) -> Callable[[List[Words]], Words]:
+    def inv_op(ins: List[Words]) -> Words:
+        out = word_op(ins)
+        np.invert(out, out=out)
+        return out
+    return inv_op
+
+
+# gate type -> function of the input words
+WORD_OPS: Dict[str, Callable[[List[Words]], Words]] = {
+    "AND": _reduce(np.bitwise_and),
+    "OR": _reduce(np.bitwise_or),
+    "XOR": _reduce(np.bitwise_xor),
+    "NOT": lambda ins: np.invert(ins[0]),
+    "NAND": _inverted(_reduce(np.bitwise_and)),
+    "NOR": _inverted(_reduce(np.bitwise_or)),
+}
+
+
+def gate_word_ops(netlist: Netlist) -> List[Callable[[List[Words]], Words]]:
+    """
+    Word operation of every gate of a netlist, from WORD_OPS or else from
+    the gate's lookup table.
+
+    Raises
+    ------
+    ValueError
+        If a gate has neither (a custom cell too wide for a table).
+    """
+    word_ops = []
+    for gate_type, table in zip(netlist.gate_types, netlist.gate_tables):
+        if gate_type in WORD_OPS:
+            word_ops.append(WORD_OPS[gate_type])
+        elif table is not None:
+            word_ops.append(table_op(table, ALL_ONES))
+        else:
+            raise ValueError(f"No bit-parallel operation for gate type: {gate_type}")
+    return word_ops
+
+
+def input_words(n_inputs: int, position: int) -> Words:
+    """
+    Return the packed column of one input of an n_inputs truth table.
+
+    Parameters
+    ----------
+    n_inputs : int
+        Number of inputs of the truth table.
+    position : int
+        Index of the input, 0 being the MSB (first column of the table).
+
+    Returns
+    -------
+    numpy.ndarray of uint64
+        Bit r is 1 where row r has this input set.
+    """
+    n_words = max(1, (1 << n_inputs) // WORD_BITS)
+    k = n_inputs - 1 - position  # bit of the row number
+    if k < 6:
+        return np.full(n_words, LANE_PATTERNS[k], dtype=np.uint64)
+    word_index = np.arange(n_words, dtype=np.uint64)
+    selected = ((word_index >> np.uint64(k - 6)) & np.uint64(1)).astype(bool)
+    return np.where(selected, ALL_ONES, np.uint64(0))
+
+
+@dataclass
+class PackedTruthTable:
+    """
+    Packed truth table of the outputs of a circuit.
+
+    words[name] holds the column of output `name`, one bit per row, 64 rows
+    per uint64 word.
+    """
+    inputs: Tuple[str, ...]
+    words: Dict[str, Words]
+
+    @property
+    def outputs(self) -> Tuple[str, ...]:
+        return tuple(self.words)
+
+    @property
+    def n_rows(self) -> int:
+        return 1 << len(self.inputs)
+
+    def column(self, output: str) -> np.ndarray:
+        """ Return the output column as a uint8 array of 0/1, one per row. """
+        as_bytes = self.words[output].view(np.uint8)
+        return np.unpackbits(as_bytes, bitorder="little")[:self.n_rows]
+
+    def minterms(self, output: str | None = None) -> List[int]:
+        """
+        Return the rows where an output is 1, e.g. for
+        TruthTable(minterms=...) or KarnaughMap(minterms=...).
+        Defaults to the first output.
+        """
+        if output is None:
+            output = self.outputs[0]
+        return np.flatnonzero(self.column(output)).tolist()
+
+    def minterm_lists(self) -> List[List[int]]:
+        """ Minterms of every output, for a multi-output TruthTable. """
+        return [self.minterms(name) for name in self.outputs]
+
+
+def exhaustive_truth_table(gates: Iterable[Gate],
+                           inputs: Sequence[str],
+                           outputs: Sequence[str] | None = None
+                           ) -> PackedTruthTable:
+    """
+    Evaluate a combinational netlist for all 2^n input combinations at once.
+
+    Parameters
+    ----------
+    gates : iterable of Gate
+        The combinational gates, delays are ignored.
+    inputs : sequence of str
+        Primary inputs in MSB..LSB order.
+    outputs : sequence of str, optional
+        Signals to return. Defaults to the gate outputs no other gate reads.
+
+    Returns
+    -------
+    PackedTruthTable
+
+    Raises
+    ------
+    ValueError
+        If a gate reads a signal that is neither an input nor driven by a
+        gate, the gates form a loop, or a gate type has no word operation.
+    """
+    netlist = compile_netlist(gates, extra_signals=inputs)
+    ids = netlist.signal_ids
+    n_inputs = len(inputs)
+
+    if outputs is None:
+        outputs = [netlist.signal_names[s] for s in dict.fromkeys(netlist.gate_outputs)
+                   if not netlist.fanout(s)]
+    output_ids = {ids[name] for name in outputs}
+
+    check_driven(netlist, inputs)
+    word_ops = gate_word_ops(netlist)
+
+    # count the readers of each signal so intermediate words can be freed
+    # as soon as the last gate that needs them has run
+    readers = [netlist.fanout_ptr[s + 1] - netlist.fanout_ptr[s]
+               for s in range(netlist.n_signals)]
+
+    values: Dict[int, Words] = {ids[name]: input_words(n_inputs, i)
+                                for i, name in enumerate(inputs)}
+    for g in topological_order(netlist):
+        ins = netlist.gate_inputs(g)
+        values[netlist.gate_outputs[g]] = word_ops[g]([values[s] for s in ins])
+        for s in set(ins):
+            readers[s] -= 1
+            if readers[s] == 0 and s not in output_ids:
+                del values[s]
+
+    n_rows = 1 << n_inputs
+    words = {}
+    for name in outputs:
+        w = values[ids[name]].copy()
+        if n_rows < WORD_BITS:  # clear the unused rows of a short table
+            w &= np.uint64((1 << n_rows) - 1)
+        words[name] = w
+    return PackedTruthTable(inputs=tuple(inputs), words=words)
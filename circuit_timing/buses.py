@@ -0,0 +1,185 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Multi-bit bus signals.
+
+A bus is a signal whose value is an int of a declared width instead of a
+single 0 / 1, so a 16-bit datapath is one signal and one event per change
+instead of 16. WordGate is a Gate with a width that works on whole words
+(ADD, SUB, INC, MUX, AND, OR, XOR, NOT, EQ); its result is masked to the
+width. A DFF whose D and Q are buses is a register, the event engine copies
+the whole word on the clock edge, and MUX + DFF makes a register with a
+load enable.
+
+Word gates are compiled with the gate type "<TYPE>[<width>]", e.g.
+"ADD[16]", so they never get a bit lookup table and the bit-parallel and
+symbolic evaluators reject them instead of treating them as 1-bit gates.
+signal_widths() gives the widths for VCDWriter and draw_signals.
+
+A bus that is not a known int, the "X" / "Z" of logic4 (e.g. an unwritten
+RAM word or a RAM with CE# high), makes the output of any word gate that
+uses it X (a MUX only uses its select and the selected data input, and a
+select past the last data input is X too), so an unknown word propagates
+instead of crashing the run.
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+# standard libraries
+from dataclasses import dataclass
+import re
+from typing import Callable, Dict, Iterable, List, Tuple
+
+# local files
+from circuit_timing.circuit_timing import DFF, Gate, LogicValue, X
+
+WordEvaluator = Callable[[List[LogicValue]], LogicValue]
+
+_WORD_TYPE = re.compile(r"^(\w+)\[(\d+)\]$")
+
+
+@dataclass
+class WordGate(Gate):
+    """
+    Gate on whole words. Inputs by gate type:
+    ADD: A, B[, Cin]; SUB: A, B (A - B); INC: A; NOT: A; EQ: A, B (1 bit
+    output); MUX: S, D0, D1, ... (output D[S]); AND / OR / XOR: any number.
+    """
+    width: int = 8  # bits of the output word
+
+
+def word_type(gate_type: str, width: int) -> str:
+    return f"{gate_type.upper()}[{width}]"
+
+
+def parse_word_type(gate_type: str) -> Tuple[str, int] | None:
+    """ ("ADD", 16) for "ADD[16]", None for a bit gate type. """
+    match = _WORD_TYPE.match(gate_type)
+    if match is None:
+        return None
+    return match.group(1), int(match.group(2))
+
+
+def _make_add(ins: Tuple[int, ...], mask: int) -> WordEvaluator:
+    if len(ins) == 3:
+        a, b, c = ins
+        return lambda v: (v[a] + v[b] + v[c]) & mask
+    a, b = ins
+    return lambda v: (v[a] + v[b]) & mask
+
+
+def _make_sub(ins: Tuple[int, ...], mask: int) -> WordEvaluator:
+    a, b = ins
+    return lambda v: (v[a] - v[b]) & mask
+
+
+def _make_inc(ins: Tuple[int, ...], mask: int) -> WordEvaluator:
+    a, = ins
+    return lambda v: (v[a] + 1) & mask
+
+
+def _make_mux(ins: Tuple[int, ...], mask: int) -> WordEvaluator:
+    s, *data = ins
+    n_data = len(data)
+
+    def evaluate(v):
+        select = v[s]
+        if isinstance(select, int) and 0 <= select < n_data:
+            return v[data[select]] & mask
+        return X  # unknown or no data input for that select
+    return evaluate
+
+
+def _make_bitwise(op: Callable[[int, int], int]) -> Callable[[Tuple[int, ...], int], WordEvaluator]:
+    def factory(ins: Tuple[int, ...], mask: int) -> WordEvaluator:
+        first, *rest = ins
+
+        def evaluate(v):
+            out = v[first]
+            for s in rest:
+                out = op(out, v[s])
+            return out & mask
+        return evaluate
+    return factory
+
+
+def _make_not(ins: Tuple[int, ...], mask: int) -> WordEvaluator:
+    a, = ins
+    return lambda v: ~v[a] & mask
+
+
+def _make_eq(ins: Tuple[int, ...], mask: int) -> WordEvaluator:
+    a, b = ins
+
+    def evaluate(v):
+        if isinstance(v[a], int) and isinstance(v[b], int):
+            return int(v[a] == v[b])
+        return X  # "X" == "X" does not make two unknown words equal
+    return evaluate
+
+
+# word gate type -> factory(input signal ids, output mask)
+WORD_FACTORIES: Dict[str, Callable[[Tuple[int, ...], int], WordEvaluator]] = {
+    "ADD": _make_add,
+    "SUB": _make_sub,
+    "INC": _make_inc,
+    "MUX": _make_mux,
+    "AND": _make_bitwise(int.__and__),
+    "OR": _make_bitwise(int.__or__),
+    "XOR": _make_bitwise(int.__xor__),
+    "NOT": _make_not,
+    "EQ": _make_eq,
+}
+
+
+def make_word_evaluator(gate_type: str, width: int, ins: Tuple[int, ...]) -> WordEvaluator:
+    """
+    Evaluator of a word gate whose output is X if an input is X or Z.
+
+    Raises
+    ------
+    ValueError
+        If gate_type is not in WORD_FACTORIES.
+    """
+    factory = WORD_FACTORIES.get(gate_type)
+    if factory is None:
+        raise ValueError(f"Unknown word gate type: {gate_type}")
+    evaluate = factory(ins, (1 << width) - 1)
+
+    def unknown_safe(v):
+        # the int arithmetic raises TypeError on a str ("X", "Z" or a bit
+        # string), which costs nothing while every input is known
+        try:
+            return evaluate(v)
+        except TypeError:
+            return X
+    return unknown_safe
+
+
+def signal_widths(gates: Iterable[Gate], dffs: Iterable[DFF] = ()) -> Dict[str, int]:
+    """
+    Width of every bus signal: word gate outputs and the data inputs of
+    word gates (MUX select and 1 bit EQ outputs excluded), and the D / Q
+    of flip-flops connected to those. Signals not listed are 1 bit.
+    """
+    widths: Dict[str, int] = {}
+    for g in gates:
+        if hasattr(g, "bus_widths"):  # memory blocks
+            widths.update(g.bus_widths())
+            continue
+        if not isinstance(g, WordGate):
+            continue
+        gate_type = g.gate_type.upper()
+        data = g.inputs[1:] if gate_type == "MUX" else g.inputs
+        if gate_type == "ADD" and len(g.inputs) == 3:
+            data = g.inputs[:2]  # carry in is 1 bit
+        for name in data:
+            widths.setdefault(name, g.width)
+        if gate_type != "EQ":
+            widths[g.output] = g.width
+    for ff in dffs:
+        width = widths.get(ff.d) or widths.get(ff.q)
+        if width:
+            widths.setdefault(ff.d, width)
+            widths.setdefault(ff.q, width)
+    return widths
@@ -0,0 +1,123 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Logic cells and their lookup tables.
+
+Every gate type is a function of its input bits. compile_netlist turns it
+into a 2^k entry table (one byte per row) for gates with up to
+MAX_LUT_INPUTS inputs, so the event loop keeps the inputs of each gate as
+an integer mask, flips one bit when an input toggles and reads the output
+with a single index, whatever the cell is. Row r of a table has input pin i
+at bit i of r (pin 0 is the least significant bit).
+
+Besides the six simulate_circuit gates there are a few common library
+cells, and register_cell adds your own, e.g. to give a half-adder carry or
+a seven-segment decoder bit its own gate type.
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+# standard libraries
+from functools import lru_cache
+from typing import Callable, Dict, List, Sequence, TypeVar
+
+# local files
+from circuit_timing.circuit_timing import LogicValue
+
+# input bits in pin order -> output bit
+CellFunction = Callable[[Sequence[LogicValue]], LogicValue]
+# a word of bits evaluated side by side: a Python int or NumPy uint64 array
+Word = TypeVar("Word")
+
+# gates with more inputs than this (e.g. a wide OR from a sum of products)
+# are evaluated from their input values instead of a table
+MAX_LUT_INPUTS = 8
+
+CELL_FUNCTIONS: Dict[str, CellFunction] = {
+    "AND": lambda x: int(all(x)),
+    "OR": lambda x: int(any(x)),
+    "NOT": lambda x: x[0] ^ 1,
+    "NAND": lambda x: int(not all(x)),
+    "NOR": lambda x: int(not any(x)),
+    "XOR": lambda x: sum(x) & 1,
+    "XNOR": lambda x: (sum(x) & 1) ^ 1,
+    "BUF": lambda x: x[0],
+    # inputs (S, D0, D1)
+    "MUX": lambda x: x[2] if x[0] else x[1],
+    "MAJ": lambda x: int(2 * sum(x) > len(x)),
+    # inputs (A, B, C): not (A B + C)
+    "AOI21": lambda x: int(not (x[0] and x[1] or x[2])),
+    # inputs (A, B, C, D): not (A B + C D)
+    "AOI22": lambda x: int(not (x[0] and x[1] or x[2] and x[3])),
+    # inputs (A, B, C): not ((A + B) C)
+    "OAI21": lambda x: int(not ((x[0] or x[1]) and x[2])),
+    # inputs (A, B, C, D): not ((A + B)(C + D))
+    "OAI22": lambda x: int(not ((x[0] or x[1]) and (x[2] or x[3]))),
+    # full adder with inputs (A, B, Cin)
+    "FA_SUM": lambda x: (x[0] + x[1] + x[2]) & 1,
+    "FA_CARRY": lambda x: int(x[0] + x[1] + x[2] >= 2),
+    # tri-state buffers with inputs (D, EN), see logic4 for the Z output;
+    # in two-state simulation a disabled buffer reads as a pulled down 0
+    "TBUF": lambda x: x[0] & x[1],
+    "TBUFN": lambda x: x[0] & (x[1] ^ 1),
+}
+
+
+def register_cell(name: str, function: CellFunction):
+    """
+    Add a gate type, usable in a Gate as gate_type=name.
+
+    Parameters
+    ----------
+    name : str
+        Gate type, case insensitive.
+    function : callable
+        Takes the tuple of input bits (in Gate.inputs order) and returns
+        the output bit.
+    """
+    CELL_FUNCTIONS[name.upper()] = function
+    truth_table.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def truth_table(gate_type: str, n_inputs: int) -> bytes:
+    """
+    Return the output of gate_type for every row of an n_inputs table.
+
+    Raises
+    ------
+    ValueError
+        If gate_type is not a known cell.
+    """
+    function = CELL_FUNCTIONS.get(gate_type.upper())
+    if function is None:
+        raise ValueError(f"Unknown gate type: {gate_type}")
+    return bytes(function(tuple((row >> pin) & 1 for pin in range(n_inputs)))
+                 for row in range(1 << n_inputs))
+
+
+def table_op(table: bytes, full: Word) -> Callable[[List[Word]], Word]:
+    """
+    Bitwise operation of a cell on words of input bits, one bit per truth
+    table row or vector lane, built from its lookup table as the OR of one
+    AND term per row where the table is 1 (pin i is bit i of the row).
+
+    Parameters
+    ----------
+    table : bytes
+        The cell's truth_table.
+    full : int or numpy.uint64
+        All ones word: (1 << n) - 1 for n bit Python ints (symbolic) or
+        bit_parallel.ALL_ONES for NumPy uint64 words.
+    """
+    rows = [row for row, bit in enumerate(table) if bit]
+
+    def op(ins: List[Word]) -> Word:
+        out = ins[0] ^ ins[0]  # a zero of the inputs' type
+        for row in rows:
+            term = full
+            for pin, w in enumerate(ins):
+                term = term & (w if (row >> pin) & 1 else w ^ full)
+            out |= term
+        return out
+    return op
@@ -1,19 +1,31 @@
 # Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
 
 """
+Reference event driven simulator for Gate / DFF circuits.
 
+simulate_circuit is the plain heap and dict version that every faster
+engine (netlist, cycle_sim, bit_parallel, see simulators) is checked
+against, and the Gate / DFF dataclasses are the one circuit model they all
+take.
 """
 
 __author__ = "Kyle Vitautas Lopin"
 
 
+from bisect import bisect_left, bisect_right
 import heapq
-from dataclasses import dataclass
-from typing import Dict, List, Tuple, Callable
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import count
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
 
-LogicValue = int  # 0 or 1
+LogicValue = int  # 0 or 1 (a whole word on a bus, X or Z in four-state logic)
 Time = float
 
+# four-state values, see logic4
+X = "X"   # unknown
+Z = "Z"   # high impedance
+
 @dataclass
 class Gate:
     name: str
@@ -23,6 +35,96 @@ class Gate:
     delay: Time              # propagation delay
 
 
+@dataclass
+class DFF:
+    name: str
+    d: str        # input signal name
+    clk: str      # clock signal name
+    q: str        # output signal name
+    delay: Time   # clk→Q propagation delay
+    setup: Time = 0   # D must be stable this long before the rising edge
+    hold: Time = 0    # ... and this long after it
+
+
+# value of a flip-flop output after a setup / hold violation with metastable=True
+METASTABLE = X
+
+
+@dataclass
+class TimingViolation:
+    """ A D transition inside the setup / hold window of a flip-flop. """
+    dff: str
+    kind: str            # "setup" or "hold"
+    edge_time: Time      # the rising clock edge
+    data_time: Time      # the D transition that broke the window
+    window: Time         # the setup or hold time it needed
+
+    @property
+    def margin(self) -> Time:
+        """ How much too close to the edge D changed, always > 0. """
+        return self.window - abs(self.edge_time - self.data_time)
+
+
+@dataclass
+class SimStats:
+    """
+    Counters filled in by simulate_circuit(..., stats=SimStats()) or
+    netlist.simulate_netlist(..., stats=SimStats()).
+
+    Attributes
+    ----------
+    pushed, popped : int
+        Events put on and taken off the queue (up to end_time).
+    discarded : int
+        Popped events that did not change their signal.
+    peak_depth : int
+        Most events waiting in the queue at once.
+    depth_samples : list of (time, depth)
+        Queue depth after every sample_every-th pop.
+    gate_evals : dict
+        Gate name -> number of times it was evaluated.
+    toggles : dict
+        Signal name -> number of committed transitions, the switching
+        activity of the net.
+    """
+    sample_every: int = 1
+    pushed: int = 0
+    popped: int = 0
+    discarded: int = 0
+    peak_depth: int = 0
+    depth_samples: List[Tuple[Time, int]] = field(default_factory=list)
+    gate_evals: Dict[str, int] = field(default_factory=dict)
+    toggles: Dict[str, int] = field(default_factory=dict)
+
+    def activity(self, end_time: Time) -> Dict[str, float]:
+        """ Toggles per unit time of every signal, e.g. for a dynamic power estimate. """
+        return {name: n / end_time for name, n in self.toggles.items()}
+
+    def hottest(self, n: int = 10) -> List[Tuple[str, int]]:
+        """ The n most evaluated gates, where event storms show up first. """
+        return sorted(self.gate_evals.items(), key=lambda kv: -kv[1])[:n]
+
+    def _queue_functions(self, end_time: Time,
+                         on_pop: Callable[[Time, str, LogicValue, int], None] | None):
+        """ heappush / heappop stand-ins that count as they go. """
+        def push(heap, event):
+            heapq.heappush(heap, event)
+            self.pushed += 1
+            if len(heap) > self.peak_depth:
+                self.peak_depth = len(heap)
+
+        def pop(heap):
+            event = heapq.heappop(heap)
+            if event[0] <= end_time:
+                self.popped += 1
+                if self.popped % self.sample_every == 0:
+                    self.depth_samples.append((event[0], len(heap)))
+                if on_pop is not None:
+                    on_pop(event[0], event[1], event[3], len(heap))
+            return event
+        return push, pop
+
+
 def eval_gate(gate: Gate, signals: Dict[str, LogicValue]) -> LogicValue:
     ins = [signals[name] for name in gate.inputs]
     g = gate.gate_type.upper()
@@ -39,97 +141,366 @@ def eval_gate(gate: Gate, signals: Dict[str, LogicValue]) -> LogicValue:
         return int(not any(ins))
     elif g == "XOR":
         return int(sum(ins) % 2)
-    else:
-        raise ValueError(f"Unknown gate type: {gate.gate_type}")
+    # the library cells of cells.py (imported here, cells imports this module)
+    from circuit_timing.cells import CELL_FUNCTIONS
+    if g in CELL_FUNCTIONS:
+        return CELL_FUNCTIONS[g](ins)
+    raise ValueError(f"Unknown gate type: {gate.gate_type}")
 
 
-def simulate_circuit(
-    gates: List[Gate],
+def eval_gate4(gate: Gate, signals: Dict[str, LogicValue]) -> LogicValue:
+    """ eval_gate that lets X inputs through (pessimistically, as logic4 does). """
+    ins = [signals[name] for name in gate.inputs]
+    if not any(isinstance(value, str) for value in ins):
+        return eval_gate(gate, signals)
+    return eval_unknown(gate.gate_type, ins)
+
+
+def eval_unknown(gate_type: str, ins: Sequence[LogicValue]) -> LogicValue:
+    """
+    Output of a bit gate whose inputs may be X or Z, X if it is not known:
+    the logic4 plane operation for the gates that have one, else the cell
+    function if every 0 / 1 the unknown inputs could take gives the same
+    output.
+
+    Raises
+    ------
+    ValueError
+        If gate_type is not a known cell.
+    """
+    g = gate_type.upper()
+    # logic4 and cells import this module
+    from circuit_timing.logic4 import PLANE_OPS, decode, encode
+    op = PLANE_OPS.get(g)
+    if op is not None:
+        out = decode(op([encode(value) for value in ins], 1))
+        return X if isinstance(out, str) else out
+    from circuit_timing.cells import CELL_FUNCTIONS
+    function = CELL_FUNCTIONS.get(g)
+    if function is None:
+        raise ValueError(f"Unknown gate type: {gate_type}")
+    unknown = [pin for pin, value in enumerate(ins) if value not in (0, 1)]
+    outs = set()
+    for row in range(1 << len(unknown)):
+        values = list(ins)
+        for k, pin in enumerate(unknown):
+            values[pin] = (row >> k) & 1
+        outs.add(function(values))
+    return outs.pop() if len(outs) == 1 else X
+
+
+def _gate_evaluator(gate: Gate) -> Callable[[Dict[str, LogicValue]], LogicValue]:
+    """
+    Evaluator of a gate on the name keyed signal values, the same the
+    compiled engine uses: a memory block's own, the buses word evaluator of
+    a WordGate (both look the values up by the input keys they are given,
+    here the names) or eval_gate4 for a bit gate.
+    """
+    if hasattr(gate, "make_evaluator"):
+        return gate.make_evaluator(tuple(gate.inputs))
+    if hasattr(gate, "width"):
+        # buses imports this module
+        from circuit_timing.buses import make_word_evaluator
+        return make_word_evaluator(gate.gate_type.upper(), gate.width, tuple(gate.inputs))
+    return partial(eval_gate4, gate)
+
+
+def _start_values(gates: Sequence[Gate],
+                  initial_signals: Dict[str, LogicValue],
+                  dffs: Sequence[DFF]) -> Dict[str, LogicValue]:
+    """ initial_signals plus every gate and DFF output not in it, at 0. """
+    signals = dict(initial_signals)
+    for out in [g.output for g in gates] + [ff.q for ff in dffs]:
+        signals.setdefault(out, 0)
+    return signals
+
+
+def iter_circuit(
+    gates: Sequence[Gate],
     initial_signals: Dict[str, LogicValue],
-    input_transitions: Dict[str, List[Tuple[Time, LogicValue]]],
+    input_transitions: Dict[str, Iterable[Tuple[Time, LogicValue]]],
     end_time: Time,
-) -> Dict[str, List[Tuple[Time, LogicValue]]]:
+    *,
+    dffs: Sequence[DFF] = (),
+    stats: SimStats | None = None,
+    on_pop: Callable[[Time, str, LogicValue, int], None] | None = None,
+    violations: List[TimingViolation] | None = None,
+    metastable: bool = False,
+) -> Iterator[Tuple[Time, str, LogicValue]]:
     """
-    returns: dict signal_name -> list of (time, value) transitions
-    suitable for your draw_signals() function
+    Generator version of simulate_circuit: yields (time, signal_name, value)
+    for every committed transition, in time order, as the simulation gets
+    to it.
+
+    The run only goes on when the next transition is asked for, so a slow
+    consumer (an animation, a plotter) holds the simulation back instead of
+    transitions piling up, and nothing but the circuit state is kept in
+    memory. An input can be a lazy source (e.g. sources.Clock(50)), whose
+    transitions are only pulled as the run reaches them, so an endless
+    stimulus runs for as long as the consumer keeps reading. Starting values
+    are not yielded, see initial_signals and the gate / DFF outputs, which
+    start at 0. A SimStats given as stats counts as the run goes, so it is
+    up to date even if the consumer stops reading part way.
+
+    Bit gates pass X and Z inputs on as logic4 does (eval_gate4), word
+    gates (buses.WordGate) work on whole words and memory blocks
+    (memory.MemoryGate) keep their contents for the run, the same models
+    the compiled engine uses.
+
+    Flip-flops with a setup or hold time are checked at every rising edge
+    and every D transition against the time of the last D transition and
+    the last clock edge, O(1) each. Violations are appended to violations
+    (if a list is given) and with metastable=True the Q of the flip-flop
+    goes to X (METASTABLE), which the gates after it pass on as logic4
+    does.
     """
     # Copy initial signals so we can mutate
-    signals = dict(initial_signals)
+    signals = _start_values(gates, initial_signals, dffs)
 
-    # Event queue: (time, signal_name, new_value)
-    event_queue: List[Tuple[Time, str, LogicValue]] = []
+    # Event queue: (time, signal_name, order, new_value), order counts the
+    # pushes so events of one signal at one time pop in the order they were
+    # queued and their values (0 / 1 / X / words) are never compared
+    event_queue: List[Tuple[Time, str, int, LogicValue]] = []
+    order = count()
 
-    # Record of transitions for plotting
-    history: Dict[str, List[Tuple[Time, LogicValue]]] = {
-        name: [(0, val)] for name, val in signals.items()
-    }
-
-    # Build fanout: which gates depend on a given signal
-    fanout: Dict[str, List[Gate]] = {}
+    # Build fanout: which gates depend on a given signal, with their evaluators
+    fanout: Dict[str, List[Tuple[Gate, Callable[[Dict[str, LogicValue]], LogicValue]]]] = {}
     for g in gates:
+        evaluate = _gate_evaluator(g)
         for inp in g.inputs:
-            fanout.setdefault(inp, []).append(g)
+            fanout.setdefault(inp, []).append((g, evaluate))
+
+    # Map clock signal -> list of DFFs triggered by that clock
+    dffs_by_clk: Dict[str, List[DFF]] = {}
+    for ff in dffs:
+        dffs_by_clk.setdefault(ff.clk, []).append(ff)
+
+    # setup / hold checks, only kept up when a flip-flop has a window: the
+    # time of the last transition of every signal and of every clock edge
+    checked = any(ff.setup or ff.hold for ff in dffs)
+    last_change: Dict[str, Time] = {}
+    last_edge: Dict[str, Time] = {}
+    hold_by_d: Dict[str, List[DFF]] = {}
+    for ff in dffs:
+        if ff.hold:
+            hold_by_d.setdefault(ff.d, []).append(ff)
 
-        # Ensure output exists in signals/history
-        if g.output not in signals:
-            signals[g.output] = 0
-            history[g.output] = [(0, 0)]
+    def violation(ff: DFF, kind: str, edge_time: Time, data_time: Time, window: Time):
+        if violations is not None:
+            violations.append(TimingViolation(ff.name, kind, edge_time, data_time, window))
+        if metastable and projected.get(ff.q, signals[ff.q]) != METASTABLE:
+            # Q goes unknown when the edge's own output would have come out
+            schedule(edge_time + ff.delay if kind == "setup" else
+                     max(edge_time + ff.delay, data_time), ff.q, METASTABLE)
 
-    # Schedule input transitions
+    push, pop = heapq.heappush, heapq.heappop
+    if stats is not None or on_pop is not None:
+        stats = SimStats() if stats is None else stats
+        push, pop = stats._queue_functions(end_time, on_pop)
+        # counted as the run goes, so a consumer that stops reading part
+        # way still has the counts up to where it stopped
+        stats.toggles = toggles = dict.fromkeys(signals, 0)
+        stats.gate_evals = gate_evals = dict.fromkeys((g.name for g in gates), 0)
+
+    # Schedule input transitions, a lazy source (sources.Clock etc.) only
+    # has its next transition queued, the one after is pulled when it pops
+    sources: Dict[str, Iterator[Tuple[Time, LogicValue]]] = {}
     for sig_name, trans_list in input_transitions.items():
+        if not isinstance(trans_list, Sequence):
+            trans_list = sources[sig_name] = iter(trans_list)
+            trans_list = [next(trans_list, (end_time + 1, 0))]
         for t, v in trans_list:
             if t <= end_time:
-                heapq.heappush(event_queue, (t, sig_name, v))
+                push(event_queue, (t, sig_name, next(order), v))
+
+    # Value each gate / DFF output will have once its queued events are
+    # done. A new evaluation is compared against this, not the current
+    # value, so a glitch shorter than the delay is followed by its recovery
+    projected: Dict[str, LogicValue] = {}
+    # The events of one output are queued in time order, so one at the same
+    # time as the last queued replaces its value instead of being queued
+    # too: the last evaluation at a time wins, not the smaller value
+    last_queued: Dict[str, Time] = {}
+    replaced: Dict[Tuple[Time, str], LogicValue] = {}
+
+    def schedule(event_time: Time, out_name: str, value: LogicValue):
+        if last_queued.get(out_name) == event_time:
+            replaced[event_time, out_name] = value
+        else:
+            push(event_queue, (event_time, out_name, next(order), value))
+            last_queued[out_name] = event_time
+        projected[out_name] = value
 
     # Main event loop
     while event_queue:
-        time, sig_name, new_val = heapq.heappop(event_queue)
+        time, sig_name, _, new_val = pop(event_queue)
         if time > end_time:
             break
+        if sources and sig_name in sources:
+            following = next(sources[sig_name], None)
+            if following is not None and following[0] <= end_time:
+                push(event_queue, (following[0], sig_name, next(order), following[1]))
+        if replaced:
+            new_val = replaced.pop((time, sig_name), new_val)
 
         # Ignore if no actual change
-        if signals.get(sig_name, 0) == new_val:
+        old_val = signals.get(sig_name, 0)
+        if old_val == new_val:
+            if stats is not None:
+                stats.discarded += 1
             continue
 
         # Update signal value
         signals[sig_name] = new_val
-        history[sig_name].append((time, new_val))
+        if stats is not None:
+            toggles[sig_name] = toggles.get(sig_name, 0) + 1
+            for gate, _ in fanout.get(sig_name, ()):
+                gate_evals[gate.name] += 1
+        if checked:
+            last_change[sig_name] = time
+            for ff in hold_by_d.get(sig_name, ()):
+                edge = last_edge.get(ff.clk)
+                if edge is not None and time - edge < ff.hold:
+                    violation(ff, "hold", edge, time, ff.hold)
+        yield time, sig_name, new_val
 
         # For each gate that uses this signal, recompute output
-        for gate in fanout.get(sig_name, []):
+        for gate, evaluate in fanout.get(sig_name, []):
             out_name = gate.output
-            old_out = signals[out_name]
-            new_out = eval_gate(gate, signals)
+            old_out = projected.get(out_name, signals[out_name])
+            new_out = evaluate(signals)
 
             if new_out != old_out:
                 # Schedule output change at time + gate.delay
                 event_time = time + gate.delay
                 if event_time <= end_time:
-                    heapq.heappush(event_queue, (event_time, out_name, new_out))
+                    schedule(event_time, out_name, new_out)
+
+        # DFFs clocked by this signal, rising edge: 0 -> 1
+        if old_val == 0 and new_val == 1:
+            if checked:
+                last_edge[sig_name] = time
+            for ff in dffs_by_clk.get(sig_name, []):
+                d_val = signals.get(ff.d, 0)  # sample D at clock edge
+                if d_val != projected.get(ff.q, signals[ff.q]):
+                    event_time = time + ff.delay
+                    if event_time <= end_time:
+                        schedule(event_time, ff.q, d_val)
+                if ff.setup and ff.d in last_change and time - last_change[ff.d] < ff.setup:
+                    violation(ff, "setup", time, last_change[ff.d], ff.setup)
+
 
+def simulate_circuit(
+    gates: List[Gate],
+    initial_signals: Dict[str, LogicValue],
+    input_transitions: Dict[str, List[Tuple[Time, LogicValue]]],
+    end_time: Time,
+    *,
+    dffs: Sequence[DFF] = (),
+    stats: SimStats | None = None,
+    on_pop: Callable[[Time, str, LogicValue, int], None] | None = None,
+    violations: List[TimingViolation] | None = None,
+    metastable: bool = False,
+) -> Dict[str, List[Tuple[Time, LogicValue]]]:
+    """
+    returns: dict signal_name -> list of (time, value) transitions
+    suitable for your draw_signals() function
+
+    Gates use transport delays and every DFF samples D on the rising (0 -> 1)
+    edge of its clock, Q following delay later. iter_circuit runs the same
+    simulation one transition at a time. dffs and the arguments after it are
+    keyword only, the old timing_diagrams version took dffs second.
+
+    With transport delays a pulse shorter than a gate's delay still comes
+    out of the gate, delay later: each new evaluation is compared with the
+    value the output will have after its queued events, not its current
+    value, so the change back is queued too. Two inputs changing at the
+    same time give two evaluations for the same output time and the output
+    takes the last one.
+
+    Give a SimStats as stats to count queue events, queue depth, gate
+    evaluations and toggles per signal, and on_pop(time, signal_name,
+    value, queue_depth) to watch every event as it leaves the queue. Without
+    either the plain heapq functions run the queue, so the instrumentation
+    costs nothing when it is not used.
+
+    DFF setup and hold times are checked as in iter_circuit: violations
+    collects a TimingViolation for each one and metastable=True drives the
+    flip-flop's Q to X after it. check_timing finds the same violations in
+    the history of a faster engine.
+    """
+    # Record of transitions for plotting
+    history: Dict[str, List[Tuple[Time, LogicValue]]] = {
+        name: [(0, val)] for name, val in _start_values(gates, initial_signals, dffs).items()
+    }
+    for time, sig_name, new_val in iter_circuit(gates, initial_signals, input_transitions,
+                                                end_time, dffs=dffs, stats=stats,
+                                                on_pop=on_pop, violations=violations,
+                                                metastable=metastable):
+        # an input that was not given a starting value started at 0
+        history.setdefault(sig_name, [(0, 0)]).append((time, new_val))
     return history
 
 
-gates = [
-    Gate(name="G1", gate_type="AND", inputs=["A", "B"], output="X", delay=3),
-    Gate(name="G2", gate_type="NOT", inputs=["X"],      output="Y", delay=2),
-]
+def check_timing(history: Dict[str, List[Tuple[Time, LogicValue]]],
+                 dffs: Sequence[DFF]) -> List[TimingViolation]:
+    """
+    Setup / hold violations of a finished run, the same ones (in the same
+    order) that simulate_circuit(..., violations=...) collects as it goes,
+    from the history of any exact engine, e.g. simulate_netlist, which is
+    much faster. A D change at the time of a clock edge is taken before or
+    after the edge in signal name order, as both event queues do.
+
+    Only the reference simulator can drive Q to X after a violation
+    (metastable=True), this only finds them.
+    """
+    found: List[Tuple[Tuple[Time, str, int], TimingViolation]] = []
+    for index, ff in enumerate(dffs):
+        if not (ff.setup or ff.hold):
+            continue
+        clk_points = history.get(ff.clk, [])
+        edges = [t for (_, last), (t, value) in zip(clk_points, clk_points[1:])
+                 if last == 0 and value == 1]
+        d_times = [t for t, _ in history.get(ff.d, [])[1:]]
+        d_first = ff.d < ff.clk
+        if ff.setup:
+            for edge in edges:
+                i = (bisect_right if d_first else bisect_left)(d_times, edge)
+                if i and edge - d_times[i - 1] < ff.setup:
+                    found.append(((edge, ff.clk, index), TimingViolation(
+                        ff.name, "setup", edge, d_times[i - 1], ff.setup)))
+        if ff.hold:
+            for data_time in d_times:
+                i = (bisect_left if d_first else bisect_right)(edges, data_time)
+                if i and data_time - edges[i - 1] < ff.hold:
+                    found.append(((data_time, ff.d, index), TimingViolation(
+                        ff.name, "hold", edges[i - 1], data_time, ff.hold)))
+    found.sort(key=lambda item: item[0])
+    return [violation for _, violation in found]
+
 
-initial_signals = {
-    "A": 0,
-    "B": 0,
-}
+if __name__ == '__main__':
+    gates = [
+        Gate(name="G1", gate_type="AND", inputs=["A", "B"], output="X", delay=3),
+        Gate(name="G2", gate_type="NOT", inputs=["X"],      output="Y", delay=2),
+    ]
 
-input_transitions = {
-    "A": [(5, 1), (20, 0)],   # A=1 at t=5, A=0 at t=20
-    "B": [(10, 1)],           # B=1 at t=10
-}
+    initial_signals = {
+        "A": 0,
+        "B": 0,
+    }
+
+    input_transitions = {
+        "A": [(5, 1), (20, 0)],   # A=1 at t=5, A=0 at t=20
+        "B": [(10, 1)],           # B=1 at t=10
+    }
 
-end_time = 40
+    end_time = 40
 
-history = simulate_circuit(
-    gates=gates,
-    initial_signals=initial_signals,
-    input_transitions=input_transitions,
-    end_time=end_time,
-)
+    history = simulate_circuit(
+        gates=gates,
+        initial_signals=initial_signals,
+        input_transitions=input_transitions,
+        end_time=end_time,
+    )
+    print(history)
@@ -0,0 +1,182 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Cycle based simulation of synchronous Gate / DFF circuits.
+
+The combinational gates are levelized once, then every clock cycle the
+inputs are applied, the gates are evaluated in topological order with zero
+delay and all flip-flops load their D value on the rising edge that ends
+the cycle. Only the settled value of each signal per cycle is kept, which is
+all that is needed for sequence detectors and state machines like mealy_1,
+so millions of cycles can be simulated instead of a few hundred ps.
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+# standard libraries
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# installed libraries
+import numpy as np
+
+# local files
+from circuit_timing.circuit_timing import DFF, Gate, LogicValue, Time
+from circuit_timing.netlist import compile_netlist, topological_order
+
+
+@dataclass
+class CycleTrace:
+    """
+    Per cycle state vectors of a cycle based simulation.
+
+    values[c, s] is the settled value of signal s during cycle c, i.e. just
+    before the rising edge that ends the cycle.
+    """
+    signal_names: Tuple[str, ...]
+    values: np.ndarray
+
+    @property
+    def n_cycles(self) -> int:
+        return self.values.shape[0]
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.values[:, self.signal_names.index(name)]
+
+    def to_history(self, period: Time,
+                   clock: str | None = "CLK",
+                   signals: Iterable[str] | None = None
+                   ) -> Dict[str, List[Tuple[Time, LogicValue]]]:
+        """
+        Expand the per cycle values into (time, value) transitions for
+        draw_signals().
+
+        Cycle c spans [c * period, (c + 1) * period) and every signal takes
+        its cycle value at the start of the cycle.
+
+        Parameters
+        ----------
+        period : int or float
+            Clock period in the time units of the diagram.
+        clock : str or None, optional
+            Name of the clock row to add in front of the signals (same
+            waveform as make_clock(period, n_cycles, 1)), None to leave
+            it out.
+        signals : iterable of str, optional
+            Signals to include, defaults to every signal.
+
+        Returns
+        -------
+        dict
+            signal_name -> list of (time, value) transitions.
+        """
+        history: Dict[str, List[Tuple[Time, LogicValue]]] = {}
+        if clock is not None:
+            half = period / 2
+            clk = [(0, 1)]
+            for c in range(self.n_cycles):
+                clk.append((c * period + half, 0))
+                clk.append(((c + 1) * period, 1))
+            history[clock] = clk
+
+        for name in (self.signal_names if signals is None else signals):
+            if name == clock:
+                continue
+            column = self[name]
+            cycles = np.flatnonzero(column[1:] != column[:-1]) + 1
+            history[name] = [(0, int(column[0]))] + list(
+                zip((cycles * period).tolist(), column[cycles].tolist()))
+        return history
+
+
+def sample_inputs(input_transitions: Dict[str, List[Tuple[Time, LogicValue]]],
+                  period: Time,
+                  n_cycles: int,
+                  initial_signals: Dict[str, LogicValue] | None = None
+                  ) -> Dict[str, List[LogicValue]]:
+    """
+    Turn timed input transitions into per cycle input values.
+
+    The value used for cycle c is the one the input holds just before the
+    rising edge at (c + 1) * period, i.e. what the flip-flops would sample.
+    """
+    initial_signals = initial_signals or {}
+    per_cycle = {}
+    for name, transitions in input_transitions.items():
+        pts = sorted(transitions, key=lambda p: p[0])
+        times = np.array([t for t, _ in pts], dtype=float)
+        levels = np.array([initial_signals.get(name, 0)] + [v for _, v in pts])
+        edges = np.arange(1, n_cycles + 1) * period
+        per_cycle[name] = levels[np.searchsorted(times, edges, side="left")].tolist()
+    return per_cycle
+
+
+def simulate_cycles(gates: Sequence[Gate],
+                    dffs: Sequence[DFF],
+                    initial_signals: Dict[str, LogicValue],
+                    inputs: Dict[str, Sequence[LogicValue]],
+                    n_cycles: int | None = None) -> CycleTrace:
+    """
+    Simulate a synchronous circuit one clock cycle at a time.
+
+    Parameters
+    ----------
+    gates : sequence of Gate
+        Combinational gates, delays are ignored.
+    dffs : sequence of DFF
+        Flip-flops, all clocked by the same signal.
+    initial_signals : dict
+        Starting values, the DFF outputs set the initial state.
+    inputs : dict
+        input name -> value for each cycle (see sample_inputs()).
+    n_cycles : int, optional
+        Number of cycles to run, defaults to the length of the shortest
+        input sequence.
+
+    Returns
+    -------
+    CycleTrace
+
+    Raises
+    ------
+    ValueError
+        If the flip-flops use more than one clock, a gate reads the clock or
+        the gates form a combinational loop.
+    """
+    netlist = compile_netlist(gates, dffs, extra_signals=list(initial_signals) + list(inputs))
+    ids = netlist.signal_ids
+    clocks = set(netlist.dff_clk)
+    if len(clocks) > 1:
+        raise ValueError("Cycle based simulation needs a single clock, got "
+                         f"{sorted(netlist.signal_names[c] for c in clocks)}")
+    if any(netlist.fanout(c) for c in clocks):
+        raise ValueError("Gated clocks can not be simulated cycle by cycle")
+
+    if n_cycles is None:
+        n_cycles = min((len(seq) for seq in inputs.values()), default=0)
+    order = topological_order(netlist)
+    steps = [(netlist.evaluators[g], netlist.gate_outputs[g]) for g in order]
+    input_cols = [(ids[name], seq) for name, seq in inputs.items()]
+    d_ids, q_ids = netlist.dff_d, netlist.dff_q
+
+    n_signals = netlist.n_signals
+    values = [0] * n_signals
+    for name, val in initial_signals.items():
+        values[ids[name]] = val
+    trace = bytearray(n_cycles * n_signals)
+
+    for c in range(n_cycles):
+        for sid, seq in input_cols:
+            values[sid] = seq[c]
+        for evaluate, out in steps:
+            values[out] = evaluate(values)
+        trace[c * n_signals:(c + 1) * n_signals] = bytes(values)
+        # rising edge: every flip-flop loads D at the same time
+        next_state = [values[d] for d in d_ids]
+        for q, val in zip(q_ids, next_state):
+            values[q] = val
+
+    return CycleTrace(
+        signal_names=netlist.signal_names,
+        values=np.frombuffer(trace, dtype=np.uint8).reshape(n_cycles, n_signals),
+    )
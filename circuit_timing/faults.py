@@ -0,0 +1,172 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Parallel-fault simulation of single stuck-at faults.
+
+Every signal of a combinational Gate netlist can be stuck at 0 or stuck at
+1. Instead of simulating each faulty circuit on its own, bit 0 of a uint64
+word runs the good circuit and bits 1 - 63 each run one faulty copy: a
+stuck-at-0 fault clears its bit of the signal word and a stuck-at-1 fault
+sets it, right after the word is computed. Each input vector is one element
+of a NumPy array, so one topological pass over the gates simulates 63
+faults for all the vectors at once. A vector detects a fault when any
+output bit of the faulty copy differs from the good one.
+
+This gives the answer key for "find the fault" troubleshooting exercises
+on the circuits drawn by schem_from_eqn_generator.draw_expression.
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+# standard libraries
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# installed libraries
+import numpy as np
+
+# local files
+from circuit_timing.bit_parallel import ALL_ONES, WORD_BITS, Words, gate_word_ops
+from circuit_timing.circuit_timing import Gate, LogicValue
+from circuit_timing.netlist import check_driven, compile_netlist, topological_order
+
+# bit 0 is the good circuit
+FAULTS_PER_WORD = WORD_BITS - 1
+
+
+@dataclass(frozen=True)
+class Fault:
+    signal: str
+    stuck_at: LogicValue
+
+    def __str__(self) -> str:
+        return f"{self.signal} s-a-{self.stuck_at}"
+
+
+@dataclass
+class FaultReport:
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+    vectors: np.ndarray                # (n_vectors, n_inputs) of 0 / 1
+    detections: Dict[Fault, List[int]]  # fault -> indexes of the vectors that detect it
+
+    @property
+    def undetected(self) -> List[Fault]:
+        """ Faults no vector detects (redundant logic or too few vectors). """
+        return [fault for fault, rows in self.detections.items() if not rows]
+
+    @property
+    def coverage(self) -> float:
+        """ Fraction of the faults detected by at least one vector. """
+        if not self.detections:
+            return 1.0
+        return 1 - len(self.undetected) / len(self.detections)
+
+    def detecting_vectors(self, fault: Fault) -> List[Dict[str, LogicValue]]:
+        """ Input values of every vector that detects fault. """
+        return [dict(zip(self.inputs, self.vectors[i].tolist()))
+                for i in self.detections[fault]]
+
+
+def enumerate_faults(gates: Iterable[Gate], inputs: Sequence[str] = ()) -> List[Fault]:
+    """ Stuck-at-0 and stuck-at-1 on every input and gate output, in that order. """
+    signals = list(dict.fromkeys(list(inputs) + [g.output for g in gates]))
+    return [Fault(name, value) for name in signals for value in (0, 1)]
+
+
+def exhaustive_vectors(n_inputs: int) -> np.ndarray:
+    """ Every input combination, row r being minterm r (first input is the MSB). """
+    rows = np.arange(1 << n_inputs)
+    shifts = np.arange(n_inputs - 1, -1, -1)
+    return ((rows[:, None] >> shifts) & 1).astype(np.uint8)
+
+
+def fault_simulate(gates: Sequence[Gate],
+                   inputs: Sequence[str],
+                   outputs: Sequence[str] | None = None,
+                   vectors: Sequence[Sequence[LogicValue]] | np.ndarray | None = None,
+                   faults: Iterable[Fault] | None = None) -> FaultReport:
+    """
+    Find the input vectors that detect each single stuck-at fault.
+
+    Parameters
+    ----------
+    gates : sequence of Gate
+        Combinational gates, delays are ignored.
+    inputs : sequence of str
+        Primary inputs, in the column order of the vectors.
+    outputs : sequence of str, optional
+        Observed signals. Defaults to the gate outputs no other gate reads.
+    vectors : array like, optional
+        (n_vectors, n_inputs) input values, default all 2^n combinations in
+        minterm order (so the detecting indexes are minterm numbers).
+    faults : iterable of Fault, optional
+        Faults to simulate, default enumerate_faults(gates, inputs).
+
+    Returns
+    -------
+    FaultReport
+
+    Raises
+    ------
+    ValueError
+        If a gate reads a signal that is neither an input nor driven by a
+        gate, the gates form a loop or a fault is on an unknown signal.
+    """
+    netlist = compile_netlist(gates, extra_signals=inputs)
+    ids = netlist.signal_ids
+    check_driven(netlist, inputs)
+    word_ops = gate_word_ops(netlist)
+    order = topological_order(netlist)
+
+    if outputs is None:
+        outputs = [netlist.signal_names[s] for s in dict.fromkeys(netlist.gate_outputs)
+                   if not netlist.fanout(s)]
+    output_ids = [ids[name] for name in outputs]
+    if vectors is None:
+        vectors = exhaustive_vectors(len(inputs))
+    vectors = np.asarray(vectors, dtype=np.uint8).reshape(-1, len(inputs))
+    faults = enumerate_faults(gates, inputs) if faults is None else list(faults)
+    for fault in faults:
+        if fault.signal not in ids:
+            raise ValueError(f"Fault on unknown signal: {fault.signal}")
+
+    # the good and faulty copies all see the same inputs
+    input_values: List[Words] = [np.where(column, ALL_ONES, np.uint64(0))
+                                 for column in vectors.T]
+
+    detections: Dict[Fault, List[int]] = {}
+    for start in range(0, len(faults), FAULTS_PER_WORD):
+        batch = faults[start:start + FAULTS_PER_WORD]
+        stuck_0: Dict[int, int] = {}
+        stuck_1: Dict[int, int] = {}
+        for lane, fault in enumerate(batch, 1):
+            stuck = stuck_1 if fault.stuck_at else stuck_0
+            sid = ids[fault.signal]
+            stuck[sid] = stuck.get(sid, 0) | 1 << lane
+
+        def inject(sid: int, word: Words) -> Words:
+            if sid in stuck_0:
+                word &= np.uint64(~stuck_0[sid] & 0xFFFF_FFFF_FFFF_FFFF)
+            if sid in stuck_1:
+                word |= np.uint64(stuck_1[sid])
+            return word
+
+        values: Dict[int, Words] = {ids[name]: inject(ids[name], word.copy())
+                                    for name, word in zip(inputs, input_values)}
+        for g in order:
+            word = word_ops[g]([values[s] for s in netlist.gate_inputs(g)])
+            values[netlist.gate_outputs[g]] = inject(netlist.gate_outputs[g], word)
+
+        # a faulty copy is wrong where its bit differs from bit 0
+        wrong = np.zeros(len(vectors), dtype=np.uint64)
+        for sid in output_ids:
+            word = values[sid]
+            good = np.where(word & np.uint64(1), ALL_ONES, np.uint64(0))
+            wrong |= word ^ good
+        for lane, fault in enumerate(batch, 1):
+            detected = (wrong >> np.uint64(lane)) & np.uint64(1)
+            detections[fault] = np.flatnonzero(detected).tolist()
+
+    return FaultReport(inputs=tuple(inputs), outputs=tuple(outputs),
+                       vectors=vectors, detections=detections)
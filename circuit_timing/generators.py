@@ -0,0 +1,174 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Synthetic circuits of any size, for tests and benchmarks.
+
+Every generator is deterministic for its arguments (the random ones take a
+seed), so a benchmark run can be repeated exactly:
+
+    ripple_adder(n)        A0.., B0.., C0 -> S0.., C{n}
+    array_multiplier(n)    A0.., B0.. -> P0..P{2n - 1}
+    lfsr(n)                shift register Q0..Q{n - 1} with XOR feedback, clock CLK
+    counter(n)             binary up counter Q0..Q{n - 1}, count enable EN, clock CLK
+    random_dag(...)        random combinational netlist I0.. -> N0..
+
+random_stimulus() gives random input transitions for any of them.
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+# standard libraries
+import random
+from typing import Dict, List, Sequence, Tuple
+
+# local files
+from circuit_timing.circuit_timing import DFF, Gate, LogicValue, Time
+
+# maximal length taps (1 indexed, Q{tap - 1}) for a few register lengths
+LFSR_TAPS = {
+    3: (3, 2), 4: (4, 3), 5: (5, 3), 6: (6, 5), 7: (7, 6), 8: (8, 6, 5, 4),
+    16: (16, 15, 13, 4), 24: (24, 23, 22, 17), 32: (32, 22, 2, 1),
+    64: (64, 63, 61, 60),
+}
+
+
+def ripple_adder(n_bits: int) -> List[Gate]:
+    """ Ripple carry adder of XOR / AND / NAND / NOT full adders. """
+    gates = []
+    carry = "C0"
+    for i in range(n_bits):
+        a, b, s, c_out = f"A{i}", f"B{i}", f"S{i}", f"C{i + 1}"
+        gates += [
+            Gate(f"X1_{i}", "XOR", [a, b], f"P{i}", 3),
+            Gate(f"X2_{i}", "XOR", [f"P{i}", carry], s, 3),
+            Gate(f"A1_{i}", "AND", [a, b], f"G{i}", 2),
+            Gate(f"A2_{i}", "NAND", [f"P{i}", carry], f"T{i}", 2),
+            Gate(f"N1_{i}", "NOT", [f"G{i}"], f"GN{i}", 1),
+            Gate(f"O1_{i}", "NAND", [f"GN{i}", f"T{i}"], c_out, 2),
+        ]
+        carry = c_out
+    return gates
+
+
+def _adder_cell(prefix: str, a: str, b: str, carry: str | None) -> Tuple[List[Gate], str, str]:
+    """ Half adder (carry None) or full adder gates, their sum and carry out. """
+    if carry is None:
+        return [Gate(f"{prefix}_X", "XOR", [a, b], f"{prefix}_S", 3),
+                Gate(f"{prefix}_A", "AND", [a, b], f"{prefix}_C", 2)], \
+            f"{prefix}_S", f"{prefix}_C"
+    return [Gate(f"{prefix}_X1", "XOR", [a, b], f"{prefix}_P", 3),
+            Gate(f"{prefix}_X2", "XOR", [f"{prefix}_P", carry], f"{prefix}_S", 3),
+            Gate(f"{prefix}_A1", "AND", [a, b], f"{prefix}_G", 2),
+            Gate(f"{prefix}_A2", "AND", [f"{prefix}_P", carry], f"{prefix}_T", 2),
+            Gate(f"{prefix}_O", "OR", [f"{prefix}_G", f"{prefix}_T"], f"{prefix}_C", 2)], \
+        f"{prefix}_S", f"{prefix}_C"
+
+
+def array_multiplier(n_bits: int) -> List[Gate]:
+    """
+    Unsigned n x n array multiplier: an AND gate per partial product bit and
+    one row of ripple carry adders per bit of B. Outputs P0..P{2n - 1} are
+    buffers on the result bits.
+    """
+    gates = [Gate(f"PP{i}_{j}", "AND", [f"A{j}", f"B{i}"], f"PP{i}_{j}", 2)
+             for i in range(n_bits) for j in range(n_bits)]
+    result: List[str | None] = [None] * (2 * n_bits)
+    for i in range(n_bits):
+        carry = None
+        for j in range(n_bits):
+            k = i + j
+            bit = f"PP{i}_{j}"
+            if result[k] is None:
+                if carry is None:
+                    result[k] = bit
+                    continue
+                cell, result[k], carry = _adder_cell(f"R{i}_{j}", bit, carry, None)
+            else:
+                cell, result[k], carry = _adder_cell(f"R{i}_{j}", result[k], bit, carry)
+            gates += cell
+        result[i + n_bits] = carry
+    for k, name in enumerate(result):
+        if name is not None:
+            gates.append(Gate(f"OUT{k}", "BUF", [name], f"P{k}", 1))
+    return gates
+
+
+def lfsr(n_bits: int, taps: Sequence[int] | None = None,
+         clk_to_q: Time = 3, xor_delay: Time = 2) -> Tuple[List[Gate], List[DFF]]:
+    """
+    Fibonacci LFSR: Q{i} shifts into Q{i + 1} every rising edge of CLK and
+    Q0 loads the XOR of the taps. Start it with at least one Q at 1.
+
+    Raises
+    ------
+    ValueError
+        If no taps are given and LFSR_TAPS has none for n_bits.
+    """
+    if taps is None:
+        if n_bits not in LFSR_TAPS:
+            raise ValueError(f"No default taps for a {n_bits} bit LFSR, give taps")
+        taps = LFSR_TAPS[n_bits]
+    gates = []
+    feedback = f"Q{taps[0] - 1}"
+    for k, tap in enumerate(taps[1:]):
+        out = "D0" if k == len(taps) - 2 else f"F{k}"
+        gates.append(Gate(f"FB{k}", "XOR", [feedback, f"Q{tap - 1}"], out, xor_delay))
+        feedback = out
+    dffs = [DFF(f"FF0", feedback, "CLK", "Q0", clk_to_q)]
+    dffs += [DFF(f"FF{i}", f"Q{i - 1}", "CLK", f"Q{i}", clk_to_q) for i in range(1, n_bits)]
+    return gates, dffs
+
+
+def counter(n_bits: int, clk_to_q: Time = 3, xor_delay: Time = 3,
+            and_delay: Time = 2) -> Tuple[List[Gate], List[DFF]]:
+    """
+    Synchronous binary counter, counts up on every rising edge of CLK while
+    EN is 1. The carry into bit i is E{i} (E0 = EN) through an AND chain.
+    """
+    gates, dffs = [], []
+    enable = "EN"
+    for i in range(n_bits):
+        gates.append(Gate(f"X{i}", "XOR", [f"Q{i}", enable], f"D{i}", xor_delay))
+        if i < n_bits - 1:
+            gates.append(Gate(f"A{i}", "AND", [f"Q{i}", enable], f"E{i + 1}", and_delay))
+            enable = f"E{i + 1}"
+        dffs.append(DFF(f"FF{i}", f"D{i}", "CLK", f"Q{i}", clk_to_q))
+    return gates, dffs
+
+
+def random_dag(n_inputs: int, n_gates: int, seed: int = 0, max_fanin: int = 3,
+               gate_types: Sequence[str] = ("AND", "OR", "NAND", "NOR", "XOR", "NOT"),
+               max_delay: int = 5, locality: int = 64) -> List[Gate]:
+    """
+    Random combinational netlist. Gate N{k} reads signals picked among the
+    inputs I0.. and the outputs of the `locality` gates before it, so the
+    logic depth grows with the size like a real datapath instead of every
+    gate hanging off the inputs.
+    """
+    rng = random.Random(seed)
+    signals = [f"I{i}" for i in range(n_inputs)]
+    gates = []
+    for k in range(n_gates):
+        gate_type = rng.choice(gate_types)
+        n_in = 1 if gate_type == "NOT" else rng.randint(2, max(2, max_fanin))
+        pool = signals[:n_inputs] + signals[max(n_inputs, len(signals) - locality):]
+        ins = rng.sample(pool, min(n_in, len(pool)))
+        gates.append(Gate(f"G{k}", gate_type, ins, f"N{k}", rng.randint(1, max_delay)))
+        signals.append(f"N{k}")
+    return gates
+
+
+def random_stimulus(inputs: Sequence[str], end_time: Time, n_changes: int,
+                    seed: int = 0) -> Dict[str, List[Tuple[Time, LogicValue]]]:
+    """ n_changes random toggles per input at whole number times up to end_time. """
+    rng = random.Random(seed)
+    stimulus = {}
+    for name in inputs:
+        times = sorted(rng.sample(range(1, int(end_time) + 1), min(n_changes, int(end_time))))
+        level = 0
+        points = []
+        for t in times:
+            level ^= 1
+            points.append((t, level))
+        stimulus[name] = points
+    return stimulus
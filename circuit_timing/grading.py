@@ -0,0 +1,267 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Compare student timing diagrams with the simulated answer key.
+
+A submission is a history in the simulate_circuit format, e.g. read from a
+CSV of transitions with read_class_csv(). grade_class() compares every
+submission with the key one signal at a time: the key and student
+transition times of the whole class are merged into one sorted time grid,
+every student is sampled on that grid with a single searchsorted call (the
+rows are kept apart by offsetting each student's times) and the wrong time,
+first divergence and mismatch intervals fall out of a boolean
+(students x grid) array. A tolerance forgives the time within that distance
+of each key edge, so an edge drawn a little early or late is not marked
+wrong.
+
+A signal missing from a submission is wrong for the whole run.
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+# standard libraries
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# installed libraries
+import numpy as np
+
+# local files
+from circuit_timing.circuit_timing import LogicValue, Time
+from circuit_timing.waveform import Waveform
+
+History = Dict[str, Iterable[Tuple[Time, LogicValue]]]
+Interval = Tuple[Time, Time]
+
+
+@dataclass
+class SignalDiff:
+    """ How one signal of one submission differs from the key. """
+    signal: str
+    wrong_time: float
+    first_divergence: float | None   # None if it always matches
+    intervals: List[Interval]        # (start, end) of every mismatch
+
+
+@dataclass
+class ClassGrades:
+    """
+    Result of grade_class().
+
+    Attributes
+    ----------
+    students, signals : tuple of str
+    end_time : int or float
+    wrong_time : numpy.ndarray
+        (n_students, n_signals) time each signal was wrong.
+    first_divergence : numpy.ndarray
+        (n_students, n_signals) first wrong time, NaN if never.
+    intervals : dict
+        (student, signal) -> list of (start, end) mismatch intervals.
+    """
+    students: Tuple[str, ...]
+    signals: Tuple[str, ...]
+    end_time: Time
+    wrong_time: np.ndarray
+    first_divergence: np.ndarray
+    intervals: Dict[Tuple[str, str], List[Interval]]
+
+    def scores(self, weights: Dict[str, float] | None = None) -> np.ndarray:
+        """
+        Fraction of the time each student got right, averaged over the
+        signals (weighted by weights, default equal). Shape (n_students,).
+        """
+        correct = 1 - self.wrong_time / self.end_time
+        w = np.array([1.0 if weights is None else weights.get(name, 0.0)
+                      for name in self.signals])
+        return correct @ w / w.sum()
+
+    def report(self, student: str) -> Dict[str, SignalDiff]:
+        """ Per signal differences of one student. """
+        i = self.students.index(student)
+        return {name: SignalDiff(
+                    signal=name,
+                    wrong_time=float(self.wrong_time[i, j]),
+                    first_divergence=(None if np.isnan(self.first_divergence[i, j])
+                                      else float(self.first_divergence[i, j])),
+                    intervals=self.intervals[student, name])
+                for j, name in enumerate(self.signals)}
+
+
+def _points(points: Iterable[Tuple[Time, LogicValue]]) -> Waveform:
+    """ Waveform of a history list, keeping "X" / "Z" next to ints as objects. """
+    if isinstance(points, Waveform):
+        return points
+    points = sorted(points, key=lambda p: p[0])
+    values = [value for _, value in points]
+    numeric = all(isinstance(value, (int, float)) for value in values)
+    return Waveform(np.array([t for t, _ in points], dtype=np.float64),
+                    np.array(values, dtype=None if numeric else object))
+
+
+def _common_dtype(arrays: Sequence[np.ndarray]):
+    """ float64 if every value is a number (so NaN can mark a missing row), else object. """
+    if all(a.dtype.kind in "biuf" for a in arrays):
+        return np.float64
+    return object
+
+
+def _grade_signal(key: Waveform, submissions: List[Waveform | None],
+                  end_time: Time, tolerance: Time):
+    """ wrong time, first divergence and mismatch intervals of every student. """
+    n_students = len(submissions)
+    present = [w for w in submissions if w is not None and len(w)]
+    dtype = _common_dtype([key.values] + [w.values for w in present])
+
+    # key edges, for the tolerance window
+    changed = np.flatnonzero(key.values[1:] != key.values[:-1]) + 1
+    edges = key.times[changed].astype(np.float64)
+    edges = edges[(edges > 0) & (edges <= end_time)]
+
+    # one time grid for the whole class
+    pieces = [[0.0], key.times.astype(np.float64)]
+    pieces += [w.times.astype(np.float64) for w in present]
+    if tolerance > 0:
+        pieces += [edges - tolerance, edges + tolerance]
+    grid = np.unique(np.clip(np.concatenate(pieces), 0, end_time))
+    grid = grid[grid < end_time]
+    if not grid.size:
+        grid = np.zeros(1)
+    durations = np.diff(grid, append=end_time)
+    key_values = key.sample(grid).astype(dtype)
+
+    # sample every submission on the grid at once, row r offset by r * span
+    span = end_time + 1.0
+    student_values = np.empty((n_students, grid.size), dtype=dtype)
+    student_values[:] = np.nan
+    rows = [r for r, w in enumerate(submissions) if w is not None and len(w)]
+    if rows:
+        lengths = np.array([len(submissions[r]) for r in rows])
+        row_of = np.repeat(np.arange(len(rows)), lengths)
+        flat_times = np.concatenate(
+            [np.clip(submissions[r].times.astype(np.float64), 0, end_time) for r in rows])
+        flat_times += row_of * span
+        flat_values = np.concatenate([submissions[r].values.astype(dtype) for r in rows])
+        row_start = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        query = (grid[None, :] + (np.arange(len(rows)) * span)[:, None]).ravel()
+        index = np.searchsorted(flat_times, query, side="right") - 1
+        # before a student's first point the first value holds
+        index = np.maximum(index, np.repeat(row_start, grid.size))
+        student_values[rows] = flat_values[index].reshape(len(rows), grid.size)
+
+    mismatch = student_values != key_values[None, :]
+    if dtype is object:
+        mismatch = mismatch.astype(bool)
+    if tolerance > 0 and edges.size:
+        mid = grid + durations / 2
+        i = np.searchsorted(edges, mid)
+        before = np.abs(mid - edges[np.maximum(i - 1, 0)])
+        after = np.abs(edges[np.minimum(i, edges.size - 1)] - mid)
+        mismatch &= ~(np.minimum(before, after) < tolerance)[None, :]
+
+    wrong_time = mismatch @ durations
+    any_wrong = mismatch.any(axis=1)
+    first = np.where(any_wrong, grid[mismatch.argmax(axis=1)], np.nan)
+
+    # runs of mismatching grid cells -> intervals
+    bounds = np.append(grid, end_time)
+    step = np.diff(np.pad(mismatch.astype(np.int8), ((0, 0), (1, 1))), axis=1)
+    run_rows, starts = np.nonzero(step == 1)
+    _, ends = np.nonzero(step == -1)
+    pairs = list(zip(bounds[starts].tolist(), bounds[ends].tolist()))
+    cuts = np.cumsum(np.bincount(run_rows, minlength=n_students)).tolist()
+    intervals = [pairs[lo:hi] for lo, hi in zip([0] + cuts[:-1], cuts)]
+    return wrong_time, first, intervals
+
+
+def grade_class(key: History,
+                submissions: Dict[str, History],
+                end_time: Time,
+                signals: Sequence[str] | None = None,
+                tolerance: Time = 0) -> ClassGrades:
+    """
+    Compare every submission with the answer key.
+
+    Parameters
+    ----------
+    key : dict
+        History from simulate_circuit / simulate_netlist (or a WaveformSet).
+    submissions : dict
+        Student name -> history of their diagram.
+    end_time : int or float
+        Compare from t = 0 up to this time.
+    signals : sequence of str, optional
+        Signals to grade, default every signal of the key.
+    tolerance : int or float, optional
+        Time on either side of each key edge where a mismatch is not
+        counted, default 0 (exact).
+
+    Returns
+    -------
+    ClassGrades
+    """
+    if end_time <= 0:
+        raise ValueError("end_time must be positive")
+    signals = tuple(key) if signals is None else tuple(signals)
+    students = tuple(submissions)
+    wrong_time = np.zeros((len(students), len(signals)))
+    first_divergence = np.full((len(students), len(signals)), np.nan)
+    intervals: Dict[Tuple[str, str], List[Interval]] = {}
+    for j, name in enumerate(signals):
+        waves = [_points(sub[name]) if name in sub else None
+                 for sub in submissions.values()]
+        wrong, first, runs = _grade_signal(_points(key[name]), waves, end_time, tolerance)
+        wrong_time[:, j] = wrong
+        first_divergence[:, j] = first
+        for student, run in zip(students, runs):
+            intervals[student, name] = run
+    return ClassGrades(students=students, signals=signals, end_time=end_time,
+                       wrong_time=wrong_time, first_divergence=first_divergence,
+                       intervals=intervals)
+
+
+def diff_waveforms(key: History, student: History, end_time: Time,
+                   signals: Sequence[str] | None = None,
+                   tolerance: Time = 0) -> Dict[str, SignalDiff]:
+    """ grade_class() for one submission, returns signal name -> SignalDiff. """
+    return grade_class(key, {"student": student}, end_time, signals,
+                       tolerance).report("student")
+
+
+def _parse_value(value) -> LogicValue | str:
+    """ 0 / 1 / bus words as int, anything else (X, Z) as an upper case string. """
+    text = str(value).strip()
+    try:
+        return int(text, 0)
+    except ValueError:
+        try:
+            return int(float(text))
+        except ValueError:
+            return text.upper()
+
+
+def read_class_csv(path: str, student_column: str = "student",
+                   signal_column: str = "signal", time_column: str = "time",
+                   value_column: str = "value") -> Dict[str, Dict[str, List[Tuple[Time, LogicValue]]]]:
+    """
+    Read submissions from a CSV with one row per transition, columns
+    student, signal, time, value. Without a student column the file is one
+    submission, returned under the name of the file.
+
+    Returns
+    -------
+    dict
+        student -> history, ready for grade_class().
+    """
+    import pandas as pd  # only needed for reading CSV files
+
+    frame = pd.read_csv(path, dtype={value_column: str})
+    if student_column not in frame.columns:
+        frame[student_column] = str(path)
+    frame = frame.sort_values([student_column, signal_column, time_column], kind="stable")
+    submissions: Dict[str, Dict[str, List[Tuple[Time, LogicValue]]]] = {}
+    for (student, signal), rows in frame.groupby([student_column, signal_column], sort=False):
+        times = rows[time_column].tolist()
+        values = [_parse_value(v) for v in rows[value_column]]
+        submissions.setdefault(str(student), {})[str(signal)] = list(zip(times, values))
+    return submissions
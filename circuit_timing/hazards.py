@@ -0,0 +1,99 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Find glitches (static / dynamic hazard pulses) in a simulation history.
+
+A glitch is any pulse on a gate or flip-flop output that is narrower than a
+chosen width. The input that caused it is found from the gate that drives
+the signal: it is the gate input that changed exactly one gate delay before
+the pulse started. This lets hazard worksheets like the ones in
+activity_makers/timing_diagrams/hazard_graphs.py be made straight from a
+netlist instead of typing the waveforms by hand.
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+# standard libraries
+from bisect import bisect_left
+from dataclasses import dataclass
+from math import isclose
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# local files
+from circuit_timing.circuit_timing import DFF, Gate, LogicValue, Time
+
+
+@dataclass
+class Glitch:
+    signal: str
+    start: Time              # time the pulse starts
+    end: Time                # time the pulse ends
+    level: LogicValue        # value of the signal during the pulse
+    cause: str | None        # input that started the pulse, if found
+
+    @property
+    def width(self) -> Time:
+        return self.end - self.start
+
+
+def find_glitches(history: Dict[str, List[Tuple[Time, LogicValue]]],
+                  gates: Sequence[Gate],
+                  max_width: Time,
+                  dffs: Sequence[DFF] = (),
+                  signals: Iterable[str] | None = None) -> List[Glitch]:
+    """
+    List every pulse narrower than max_width, sorted by start time.
+
+    Parameters
+    ----------
+    history : dict
+        signal_name -> list of (time, value) transitions, as returned by
+        simulate_circuit() or simulate_netlist().
+    gates : sequence of Gate
+        Gates of the simulated circuit, used to find the cause of a pulse.
+    max_width : int or float
+        Pulses strictly narrower than this are reported.
+    dffs : sequence of DFF, optional
+        Flip-flops of the circuit, their outputs are checked too.
+    signals : iterable of str, optional
+        Signals to check, defaults to every gate and flip-flop output.
+
+    Returns
+    -------
+    list of Glitch
+    """
+    drivers: Dict[str, List[Tuple[Sequence[str], Time]]] = {}
+    for g in gates:
+        drivers.setdefault(g.output, []).append((g.inputs, g.delay))
+    for ff in dffs:
+        drivers.setdefault(ff.q, []).append(((ff.clk,), ff.delay))
+    if signals is None:
+        signals = [name for name in history if name in drivers]
+
+    times = {name: [t for t, _ in points] for name, points in history.items()}
+
+    glitches = []
+    for name in signals:
+        points = history[name]
+        # points[0] is the starting value, the transitions come after it
+        for (t_start, level), (t_end, _) in zip(points[1:], points[2:]):
+            if t_end - t_start >= max_width:
+                continue
+            glitches.append(Glitch(name, t_start, t_end, level,
+                                   _find_cause(times, drivers.get(name, ()), t_start)))
+    glitches.sort(key=lambda glitch: (glitch.start, glitch.signal))
+    return glitches
+
+
+def _find_cause(times: Dict[str, List[Time]],
+                drivers: Iterable[Tuple[Sequence[str], Time]],
+                t_start: Time) -> str | None:
+    """ Return the driver input that changed one delay before t_start. """
+    for inputs, delay in drivers:
+        t_cause = t_start - delay
+        for name in inputs:
+            input_times = times.get(name, [])
+            i = bisect_left(input_times, t_cause - 1e-9, 1)
+            if i < len(input_times) and isclose(input_times[i], t_cause, abs_tol=1e-9):
+                return name
+    return None
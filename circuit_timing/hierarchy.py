@@ -0,0 +1,194 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Hierarchical circuits: define a subcircuit once and place it many times.
+
+A Module has input and output ports, its own gates and flip-flops and
+Instances of other modules, each connecting the ports of the child to nets
+of the parent. Module.flatten() returns the plain Gate / DFF lists the
+simulators take. Every module flattens itself once into a template whose
+nets are local names (a cached_property), so placing an instance is only a
+rename of the cached template: a 32-bit adder made of 32 full adder
+instances flattens the full adder once.
+
+Nets inside an instance are named "<instance>.<net>" (e.g. "FA3.P"), the
+ports of the top module keep their names. The module builders at the end
+(full_adder, mux4, register, ripple_adder_module) are cached per parameter
+set with lru_cache, so ripple_adder_module(32) and ripple_adder_module(32)
+are the same Module and share their flattened template. (The Gate list of
+the same adder without the hierarchy is generators.ripple_adder.)
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+# standard libraries
+from dataclasses import dataclass, replace
+from functools import cached_property, lru_cache
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# local files
+from circuit_timing.circuit_timing import DFF, Gate, Time
+
+
+@dataclass(frozen=True)
+class Instance:
+    name: str                   # instance name, prefix of its internal nets
+    module: "Module"
+    connections: Dict[str, str]  # child port -> parent net
+
+
+@dataclass(frozen=True, eq=False)
+class Module:
+    """
+    Gate level subcircuit with ports.
+
+    Parameters
+    ----------
+    name : str
+        Module name, e.g. "FullAdder".
+    inputs, outputs : sequence of str
+        Port names.
+    gates : sequence of Gate, optional
+    dffs : sequence of DFF, optional
+    instances : sequence of Instance, optional
+        Placed submodules. Every input port of a child must be connected,
+        unconnected output ports become internal nets of the instance.
+
+    Raises
+    ------
+    ValueError
+        If an instance connects a port the child does not have, leaves a
+        child input unconnected, a net has more than one driver, a module
+        input is driven inside the module or an output is not driven.
+    """
+    name: str
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+    gates: Tuple[Gate, ...] = ()
+    dffs: Tuple[DFF, ...] = ()
+    instances: Tuple[Instance, ...] = ()
+
+    def __post_init__(self):
+        for attr in ("inputs", "outputs", "gates", "dffs", "instances"):
+            object.__setattr__(self, attr, tuple(getattr(self, attr)))
+
+    def instance(self, name: str, **connections: str) -> Instance:
+        """ Place this module, connections are port=net keywords. """
+        return Instance(name, self, connections)
+
+    def flatten(self) -> Tuple[List[Gate], List[DFF]]:
+        """
+        Return the gates and flip-flops of the module with every instance
+        expanded. The lists are new but share the cached Gate / DFF objects,
+        so do not change those in place.
+        """
+        gates, dffs = self._template
+        return list(gates), list(dffs)
+
+    @cached_property
+    def _template(self) -> Tuple[Tuple[Gate, ...], Tuple[DFF, ...]]:
+        """ The flattened gates and flip-flops, built on first use. """
+        gates = list(self.gates)
+        dffs = list(self.dffs)
+        for inst in self.instances:
+            child = inst.module
+            unknown = set(inst.connections) - set(child.inputs) - set(child.outputs)
+            if unknown:
+                raise ValueError(f"{self.name}.{inst.name}: {child.name} has no "
+                                 f"ports {sorted(unknown)}")
+            missing = [port for port in child.inputs if port not in inst.connections]
+            if missing:
+                raise ValueError(f"{self.name}.{inst.name}: inputs {missing} of "
+                                 f"{child.name} are not connected")
+            child_gates, child_dffs = child.flatten()
+            nets = dict(inst.connections)
+
+            def rename(net: str, nets=nets, prefix=inst.name) -> str:
+                return nets[net] if net in nets else f"{prefix}.{net}"
+
+            gates += [replace(g, name=f"{inst.name}.{g.name}",
+                              inputs=[rename(net) for net in g.inputs],
+                              output=rename(g.output))
+                      for g in child_gates]
+            dffs += [replace(ff, name=f"{inst.name}.{ff.name}", d=rename(ff.d),
+                             clk=rename(ff.clk), q=rename(ff.q))
+                     for ff in child_dffs]
+        self._check_drivers(gates, dffs)
+        return tuple(gates), tuple(dffs)
+
+    def _check_drivers(self, gates: Sequence[Gate], dffs: Sequence[DFF]):
+        drivers: Dict[str, str] = {}
+        for name, net in [(g.name, g.output) for g in gates] + [(ff.name, ff.q) for ff in dffs]:
+            if net in drivers:
+                raise ValueError(f"{self.name}: net {net} is driven by both "
+                                 f"{drivers[net]} and {name}")
+            drivers[net] = name
+        driven_inputs = [net for net in self.inputs if net in drivers]
+        if driven_inputs:
+            raise ValueError(f"{self.name}: inputs {driven_inputs} are driven inside the module")
+        undriven = [net for net in self.outputs if net not in drivers and net not in self.inputs]
+        if undriven:
+            raise ValueError(f"{self.name}: outputs {undriven} are not driven")
+
+
+def flatten_instances(instances: Iterable[Instance]) -> Tuple[List[Gate], List[DFF]]:
+    """ Flatten top level instances whose connections name the top level nets. """
+    top = Module("top", (), (), instances=tuple(instances))
+    return top.flatten()
+
+
+# --- common modules, cached per parameter set
+@lru_cache(maxsize=None)
+def full_adder(xor_delay: Time = 3, and_delay: Time = 2, or_delay: Time = 2) -> Module:
+    """ Ports A, B, Cin -> Sum, Cout. """
+    return Module("FullAdder", ("A", "B", "Cin"), ("Sum", "Cout"), gates=(
+        Gate("X1", "XOR", ["A", "B"], "P", xor_delay),
+        Gate("X2", "XOR", ["P", "Cin"], "Sum", xor_delay),
+        Gate("A1", "AND", ["A", "B"], "G", and_delay),
+        Gate("A2", "AND", ["P", "Cin"], "T", and_delay),
+        Gate("O1", "OR", ["G", "T"], "Cout", or_delay),
+    ))
+
+
+@lru_cache(maxsize=None)
+def mux4(not_delay: Time = 1, and_delay: Time = 2, or_delay: Time = 2) -> Module:
+    """ Ports I0 - I3, S1, S0 -> Q, with Q = I[2 S1 + S0]. """
+    gates = [Gate("N1", "NOT", ["S1"], "S1'", not_delay),
+             Gate("N0", "NOT", ["S0"], "S0'", not_delay)]
+    for i in range(4):
+        s1 = "S1" if i & 2 else "S1'"
+        s0 = "S0" if i & 1 else "S0'"
+        gates.append(Gate(f"A{i}", "AND", [f"I{i}", s1, s0], f"T{i}", and_delay))
+    gates.append(Gate("O", "OR", [f"T{i}" for i in range(4)], "Q", or_delay))
+    return Module("Mux4", ("I0", "I1", "I2", "I3", "S1", "S0"), ("Q",), gates=gates)
+
+
+@lru_cache(maxsize=None)
+def register(n_bits: int, mux_delay: Time = 2, clk_to_q: Time = 3) -> Module:
+    """
+    Ports In0 - In{n-1}, EN, CLK -> Out0 - Out{n-1}. Loads In on the rising
+    edge of CLK when EN is 1, otherwise keeps its value.
+    """
+    gates, dffs = [], []
+    for i in range(n_bits):
+        gates.append(Gate(f"M{i}", "MUX", ["EN", f"Out{i}", f"In{i}"], f"D{i}", mux_delay))
+        dffs.append(DFF(f"FF{i}", f"D{i}", "CLK", f"Out{i}", clk_to_q))
+    return Module(f"Register{n_bits}",
+                  tuple(f"In{i}" for i in range(n_bits)) + ("EN", "CLK"),
+                  tuple(f"Out{i}" for i in range(n_bits)), gates=gates, dffs=dffs)
+
+
+@lru_cache(maxsize=None)
+def ripple_adder_module(n_bits: int, cell: Module | None = None) -> Module:
+    """
+    Ports A0.., B0.., C0 -> S0.., C{n}, built from n instances of cell
+    (default full_adder()) named FA0, FA1, ...
+    """
+    cell = cell or full_adder()
+    instances = [cell.instance(f"FA{i}", A=f"A{i}", B=f"B{i}", Cin=f"C{i}",
+                               Sum=f"S{i}", Cout=f"C{i + 1}")
+                 for i in range(n_bits)]
+    return Module(f"RippleAdder{n_bits}",
+                  tuple(f"{ab}{i}" for ab in "AB" for i in range(n_bits)) + ("C0",),
+                  tuple(f"S{i}" for i in range(n_bits)) + (f"C{n_bits}",),
+                  instances=instances)
@@ -0,0 +1,216 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Re-simulate a netlist after editing a few input transitions.
+
+Exam variants are made by nudging one input edge (e.g. moving the X edge of
+mealy_1 from 55 to 65 ps) and running the whole simulation again, even
+though everything before the edit is unchanged. IncrementalSimulator saves
+a Checkpoint of the event loop every checkpoint_interval time units. After
+an edit it restarts from the last checkpoint before the earliest changed
+transition and stops as soon as it reaches a checkpoint after the last
+edit where the signal values, pending events and memory contents match
+the previous run, reusing the previous transitions from there on.
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+# standard libraries
+from dataclasses import replace
+from typing import Dict, List, Tuple
+
+# local files
+from circuit_timing.circuit_timing import LogicValue, Time
+from circuit_timing.netlist import (Checkpoint, Netlist, _build_history,
+                                    _event_loop, _input_events, reset_state)
+from circuit_timing.schedulers import make_scheduler
+from circuit_timing.sources import materialize_all
+
+Transitions = Dict[str, List[Tuple[Time, LogicValue]]]
+
+
+def _edit_window(old: Transitions, new: Transitions,
+                 end_time: Time) -> Tuple[Time, Time] | None:
+    """
+    Return the (earliest, latest) time an input transition differs between
+    old and new, or None if they give the same input events.
+    """
+    first = last = None
+    for name in old.keys() | new.keys():
+        old_list = [tv for tv in old.get(name, ()) if tv[0] <= end_time]
+        new_list = [tv for tv in new.get(name, ()) if tv[0] <= end_time]
+        differ = [tv[0] for tv in set(old_list) ^ set(new_list)]
+        if not differ:
+            continue
+        first = min(differ) if first is None else min(first, min(differ))
+        last = max(differ) if last is None else max(last, max(differ))
+    return None if first is None else (first, last)
+
+
+class IncrementalSimulator:
+    """
+    Event driven simulator that keeps checkpoints of its last run.
+
+    Parameters
+    ----------
+    netlist : Netlist
+        Compiled circuit, see compile_netlist.
+    initial_signals : dict
+        Starting value of the signals, the same for every run.
+    end_time : int or float
+        Time to simulate until.
+    checkpoint_interval : int or float
+        Time between checkpoints. Smaller intervals restart closer to an
+        edit and stop sooner after it, at the cost of one copy of the
+        signal values and pending events per checkpoint.
+    scheduler : str, optional
+        "heap" or "wheel", see simulate_netlist.
+    inertial : bool, optional
+        Use inertial instead of transport delays, see simulate_netlist.
+
+    Attributes
+    ----------
+    resumed_from : int or float or None
+        Checkpoint time the last rerun() started from (None for a full run).
+    converged_at : int or float or None
+        Checkpoint time where the last run rejoined the previous one, None
+        if it ran to end_time.
+    """
+    def __init__(self, netlist: Netlist,
+                 initial_signals: Dict[str, LogicValue],
+                 end_time: Time,
+                 checkpoint_interval: Time,
+                 scheduler: str = "heap",
+                 inertial: bool = False):
+        if checkpoint_interval <= 0:
+            raise ValueError("checkpoint_interval must be positive")
+        self.netlist = netlist
+        self.initial_signals = dict(initial_signals)
+        self.end_time = end_time
+        self.checkpoint_interval = checkpoint_interval
+        self.scheduler = scheduler
+        self.inertial = inertial
+
+        self.input_transitions: Transitions = {}
+        self.checkpoints: List[Checkpoint] = []
+        self._changes: List[List[Tuple[Time, LogicValue]]] = []
+        self._memories: List = []   # memory contents at the end of the last run
+        self.resumed_from: Time | None = None
+        self.converged_at: Time | None = None
+
+    def _run_from(self, values: List[LogicValue],
+                  changes: List[List[Tuple[Time, LogicValue]]],
+                  generation: List[int],
+                  pending: List[LogicValue | None],
+                  gate_events, input_transitions: Transitions,
+                  start_time: Time, on_checkpoint) -> Checkpoint | None:
+        netlist = self.netlist
+        input_events = list(_input_events(netlist, input_transitions,
+                                          self.end_time, start_time))
+        event_queue = make_scheduler(self.scheduler,
+                                     netlist.gate_delays + netlist.dff_delays,
+                                     [event[0] for event in input_events] +
+                                     [event[0] for event in gate_events])
+        for event in gate_events:
+            event_queue.push(event)
+        for event in input_events:
+            event_queue.push(event)
+        return _event_loop(netlist, event_queue, values, changes, generation,
+                           pending, self.end_time, inertial=self.inertial,
+                           checkpoint_every=self.checkpoint_interval,
+                           first_checkpoint=start_time,
+                           on_checkpoint=on_checkpoint)
+
+    def run(self, input_transitions: Transitions) -> Dict[str, List[Tuple[Time, LogicValue]]]:
+        """
+        Simulate from t = 0, saving checkpoints. Returns the history. Lazy
+        sources are turned into lists up to end_time, so edits can be
+        compared with the previous run.
+        """
+        input_transitions = materialize_all(input_transitions, self.end_time)
+        n_signals = self.netlist.n_signals
+        values = [0] * n_signals
+        for name, val in self.initial_signals.items():
+            values[self.netlist.signal_ids[name]] = val
+        changes = [[] for _ in range(n_signals)]
+        checkpoints: List[Checkpoint] = []
+        reset_state(self.netlist)
+
+        self._run_from(values, changes, [1] * n_signals, [None] * n_signals, (),
+                       input_transitions, 0, checkpoints.append)
+
+        self.input_transitions = {name: list(trans)
+                                  for name, trans in input_transitions.items()}
+        self.checkpoints = checkpoints
+        self._changes = changes
+        self._memories = self._save_memories()
+        self.resumed_from = self.converged_at = None
+        return self.history()
+
+    def _save_memories(self) -> List:
+        evaluators = self.netlist.evaluators
+        return [evaluators[g].save() for g in self.netlist.stateful]
+
+    def rerun(self, input_transitions: Transitions) -> Dict[str, List[Tuple[Time, LogicValue]]]:
+        """
+        Simulate the edited input_transitions, re-using the previous run
+        up to the last checkpoint before the first edit and, if the state
+        converges again, after it. Returns the same history as a full run.
+        """
+        input_transitions = materialize_all(input_transitions, self.end_time)
+        window = _edit_window(self.input_transitions, input_transitions, self.end_time)
+        if window is None:
+            return self.history()
+        first_edit, last_edit = window
+        starts = [i for i, cp in enumerate(self.checkpoints) if cp.time <= first_edit]
+        if not starts:
+            return self.run(input_transitions)
+
+        i_start = starts[-1]
+        start = self.checkpoints[i_start]
+        old_changes = self._changes
+        old_by_time = {cp.time: cp for cp in self.checkpoints}
+        changes = [ch[:n] for ch, n in zip(old_changes, start.history_lengths)]
+        new_checkpoints: List[Checkpoint] = []
+
+        def on_checkpoint(checkpoint: Checkpoint) -> bool:
+            new_checkpoints.append(checkpoint)
+            old = old_by_time.get(checkpoint.time)
+            return (checkpoint.time > last_edit and old is not None and
+                    checkpoint.values == old.values and
+                    checkpoint.live_events() == old.live_events() and
+                    checkpoint.memories == old.memories)
+
+        start.restore_memories(self.netlist)
+        converged = self._run_from(start.values[:], changes, start.generation[:],
+                                   start.pending[:], start.gate_events,
+                                   input_transitions, start.time, on_checkpoint)
+
+        checkpoints = self.checkpoints[:i_start] + new_checkpoints
+        memories = self._save_memories()
+        if converged is not None:
+            # the rest of the run is the previous one, memory included
+            memories = self._memories
+            for g, saved in zip(self.netlist.stateful, memories):
+                self.netlist.evaluators[g].restore(saved)
+            old = old_by_time[converged.time]
+            shift = [new - prev for new, prev in
+                     zip(converged.history_lengths, old.history_lengths)]
+            for ch, prev, n in zip(changes, old_changes, old.history_lengths):
+                ch.extend(prev[n:])
+            checkpoints += [replace(cp, history_lengths=[n + d for n, d in
+                                                         zip(cp.history_lengths, shift)])
+                            for cp in self.checkpoints if cp.time > converged.time]
+
+        self.input_transitions = {name: list(trans)
+                                  for name, trans in input_transitions.items()}
+        self.checkpoints = checkpoints
+        self._changes = changes
+        self._memories = memories
+        self.resumed_from = start.time
+        self.converged_at = None if converged is None else converged.time
+        return self.history()
+
+    def history(self) -> Dict[str, List[Tuple[Time, LogicValue]]]:
+        """ History of the last run, in the simulate_netlist format. """
+        return _build_history(self.netlist, self.initial_signals, self._changes)
@@ -0,0 +1,244 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Four-state logic (0, 1, X, Z) in two bitplanes.
+
+Every four-state value is a pair of planes (a, b), one bit per signal bit
+(or per truth table row / vector lane):
+
+    value   a  b
+      0     0  0
+      1     1  0
+      Z     0  1    high impedance, nothing drives the net
+      X     1  1    unknown, or two drivers fighting
+
+so a gate is a handful of &, |, ^ on the planes instead of a Python object
+per value, and the same functions work on Python ints of any width and on
+NumPy uint64 words from bit_parallel (pass full=ALL_ONES). Gate inputs
+treat Z as X. TBUF / TBUFN are tri-state buffers (inputs D, EN, the N
+version enables on EN = 0, like OE#) and resolve() combines the drivers of
+a shared bus the way the RAM activities in draw_ram_io_table describe it:
+all drivers off gives Z, one driver gives its value, and 0 against 1 gives X.
+
+X and Z are the strings "X" and "Z", the same values read_vcd returns.
+
+On a bus (see buses) a word is either a known int or not known at all: a
+word gate whose input is X, Z or a partly known bit string such as "10XZ"
+from decode() outputs a whole word X, the pessimistic version of what the
+planes would give bit by bit. Memory blocks drive Z when they are not
+selected and read X from words that were never written.
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+# standard libraries
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# local files
+from circuit_timing.circuit_timing import Gate, LogicValue, X, Z
+from circuit_timing.netlist import compile_netlist, topological_order
+
+Planes = Tuple[int, int]
+PlaneOp = Callable[[List[Planes], int], Planes]
+
+
+def encode(value: LogicValue | str, width: int = 1) -> Planes:
+    """
+    Planes of a value: an int, X, Z, or a string of 0 / 1 / X / Z bits
+    with the MSB first (e.g. "10XZ"). A single X or Z fills every bit.
+    """
+    if isinstance(value, str):
+        value = value.upper()
+        if value in (X, Z) and width > 1:
+            value = value * width
+        a = b = 0
+        for char in value:
+            bit_a, bit_b = {"0": (0, 0), "1": (1, 0), "Z": (0, 1), "X": (1, 1)}[char]
+            a, b = (a << 1) | bit_a, (b << 1) | bit_b
+        return a, b
+    return int(value) & ((1 << width) - 1), 0
+
+
+def decode(planes: Planes, width: int = 1) -> LogicValue | str:
+    """
+    Back to a value: an int if every bit is known, X or Z if every bit is,
+    else the MSB first string of bits such as "10XZ".
+    """
+    a, b = planes
+    if not b:
+        return a
+    full = (1 << width) - 1
+    if b == full and a == full:
+        return X
+    if b == full and not a:
+        return Z
+    chars = []
+    for bit in range(width - 1, -1, -1):
+        chars.append("01ZX"[((a >> bit) & 1) | (((b >> bit) & 1) << 1)])
+    return "".join(chars)
+
+
+def _known(planes: Planes, full: int) -> Tuple[int, int]:
+    """ (bits known to be 1, bits known to be 0). """
+    a, b = planes
+    return a & ~b & full, ~a & ~b & full
+
+
+def _op_and(ins: List[Planes], full: int) -> Planes:
+    any_zero, all_one = 0, full
+    for planes in ins:
+        one, zero = _known(planes, full)
+        any_zero |= zero
+        all_one &= one
+    not_zero = ~any_zero & full
+    return not_zero, not_zero & ~all_one & full
+
+
+def _op_or(ins: List[Planes], full: int) -> Planes:
+    any_one, all_zero = 0, full
+    for planes in ins:
+        one, zero = _known(planes, full)
+        any_one |= one
+        all_zero &= zero
+    not_zero = ~all_zero & full
+    return not_zero, not_zero & ~any_one & full
+
+
+def _op_xor(ins: List[Planes], full: int) -> Planes:
+    parity, unknown = 0, 0
+    for a, b in ins:
+        parity ^= a
+        unknown |= b
+    return (parity | unknown) & full, unknown
+
+
+def _op_not(ins: List[Planes], full: int) -> Planes:
+    a, b = ins[0]
+    return (~a | b) & full, b
+
+
+def _op_buf(ins: List[Planes], full: int) -> Planes:
+    a, b = ins[0]
+    return a | b, b
+
+
+def _inverted(op: PlaneOp) -> PlaneOp:
+    return lambda ins, full: _op_not([op(ins, full)], full)
+
+
+def _tristate(active_low: bool) -> PlaneOp:
+    def op(ins: List[Planes], full: int) -> Planes:
+        (da, db), enable = ins
+        on, off = _known(enable, full)
+        if active_low:
+            on, off = off, on
+        unknown = ~on & ~off & full
+        # on: D with Z read as X, off: Z, unknown enable: X
+        return (on & (da | db)) | unknown, (on & db) | off | unknown
+    return op
+
+
+def _op_mux(ins: List[Planes], full: int) -> Planes:
+    (sa, sb), (d0a, d0b), (d1a, d1b) = ins
+    d0a, d1a = d0a | d0b, d1a | d1b  # Z in reads as X
+    s1, s0 = _known((sa, sb), full)
+    # unknown select: the data if both inputs agree, else X
+    agree = ~d0b & ~d1b & ~(d0a ^ d1a) & full
+    return ((s1 & d1a) | (s0 & d0a) | (sb & (d0a | ~agree))) & full, \
+        ((s1 & d1b) | (s0 & d0b) | (sb & ~agree)) & full
+
+
+# gate type -> operation on the input planes
+PLANE_OPS: Dict[str, PlaneOp] = {
+    "AND": _op_and,
+    "OR": _op_or,
+    "XOR": _op_xor,
+    "NOT": _op_not,
+    "BUF": _op_buf,
+    "NAND": _inverted(_op_and),
+    "NOR": _inverted(_op_or),
+    "XNOR": _inverted(_op_xor),
+    "TBUF": _tristate(active_low=False),
+    "TBUFN": _tristate(active_low=True),
+    "MUX": _op_mux,
+}
+
+
+def resolve(drivers: Sequence[Planes], full: int = 1) -> Planes:
+    """
+    Value of a net with several tri-state drivers: Z if all are Z, X if
+    any is X or a 0 and a 1 fight, else the value of the drivers that are on.
+    """
+    any_one = any_zero = any_x = 0
+    all_z = full
+    for a, b in drivers:
+        any_one |= a & ~b
+        any_zero |= ~a & ~b
+        any_x |= a & b
+        all_z &= ~a & b
+    x = (any_x | (any_one & any_zero)) & full
+    return (any_one | x) & full, (x | all_z) & full
+
+
+def evaluate_planes(gates: Iterable[Gate],
+                    inputs: Dict[str, Planes],
+                    full: int = 1) -> Dict[str, Planes]:
+    """
+    Zero delay four-state evaluation of a netlist on planes.
+
+    Parameters
+    ----------
+    gates : iterable of Gate
+        Gates of a PLANE_OPS type. A net driven by more than one gate (a
+        tri-state bus) gets the resolve() of its drivers.
+    inputs : dict
+        Input name -> (a, b) planes, Python ints or NumPy words.
+    full : int, optional
+        All ones mask of the planes, (1 << n) - 1 for n bit ints or
+        bit_parallel.ALL_ONES for uint64 words.
+
+    Returns
+    -------
+    dict
+        signal name -> planes, signals nothing drives are Z.
+
+    Raises
+    ------
+    ValueError
+        If a gate type has no plane operation or the gates form a loop.
+    """
+    gates = list(gates)
+    for g in gates:
+        if g.gate_type.upper() not in PLANE_OPS:
+            raise ValueError(f"No four-state operation for gate type: {g.gate_type}")
+    netlist = compile_netlist(gates, extra_signals=inputs)
+    names = netlist.signal_names
+    n_drivers = Counter(netlist.gate_outputs)
+    floating = (0, full)  # Z
+
+    values: Dict[int, Planes] = {netlist.signal_ids[name]: planes
+                                 for name, planes in inputs.items()}
+    driven: Dict[int, List[Planes]] = {}
+    for g in topological_order(netlist):
+        ins = [values.get(s, floating) for s in netlist.gate_inputs(g)]
+        out = netlist.gate_outputs[g]
+        driven.setdefault(out, []).append(PLANE_OPS[gates[g].gate_type.upper()](ins, full))
+        if len(driven[out]) == n_drivers[out]:
+            drivers = driven[out]
+            values[out] = drivers[0] if len(drivers) == 1 else resolve(drivers, full)
+    return {names[s]: values.get(s, floating) for s in range(netlist.n_signals)}
+
+
+def evaluate4(gates: Iterable[Gate],
+              inputs: Dict[str, LogicValue | str],
+              width: int = 1) -> Dict[str, LogicValue | str]:
+    """
+    evaluate_planes() on values: each input is 0, 1, X, Z (or, with width
+    > 1, an int or bit string giving `width` independent lanes, e.g. one
+    lane per vector) and every signal comes back decoded.
+    """
+    full = (1 << width) - 1
+    planes = evaluate_planes(gates, {name: encode(value, width)
+                                     for name, value in inputs.items()}, full)
+    return {name: decode(p, width) for name, p in planes.items()}
@@ -0,0 +1,288 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Behavioral RAM and ROM blocks for the event driven simulator.
+
+A MemoryGate is one gate in the netlist whose inputs are the pins of the
+RAM / RAMDown symbols in schematic_makers/ALU/base.py: Addr and Data In are
+bus signals (see buses), WE#, OE# and CE# are active low. The event loop
+re-evaluates it whenever a pin changes, like any word gate, and its output
+Data Out follows delay later:
+
+    CE#  WE#  OE#   Data Out            memory
+     1    -    -    Z                   unchanged
+     0    0    0    Data In (written)   mem[Addr] = Data In
+     0    0    1    Z                   mem[Addr] = Data In
+     0    1    0    mem[Addr]           unchanged
+     0    1    1    Z                   unchanged
+
+Writes are level sensitive, so a change of Addr or Data In while WE# is low
+writes again. A word that was never written reads as X, and an X or Z on a
+control or address pin gives X, as does an address wider than address_bits
+(which writes nothing). A ROM has only Addr, OE# and CE#.
+
+Memories with up to ARRAY_ADDRESS_BITS address bits are stored in a list,
+larger ones in pages of PAGE_SIZE words that are only made when written, so
+a 32-bit address space costs memory only for the words a program touches.
+
+ram_io_answers() runs the (addr, data_in, we) rows of draw_ram_io_table
+through the same block to fill in the Data Out column of an answer key.
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+# standard libraries
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Sequence, Tuple
+
+# local files
+from circuit_timing.circuit_timing import Gate, LogicValue, Time
+from circuit_timing.logic4 import X, Z
+
+ARRAY_ADDRESS_BITS = 16
+PAGE_BITS = 10
+PAGE_SIZE = 1 << PAGE_BITS
+
+# Data Out labels used in the draw_ram_io_table exercises
+IO_TABLE_LABELS = {X: "unknown", Z: "Hi-Z"}
+
+
+class ArrayStorage:
+    """ Every word in one list, for small memories. """
+    def __init__(self, address_bits: int):
+        self.size = 1 << address_bits
+        self._words: List[LogicValue] = [X] * self.size
+
+    def __getitem__(self, address: int) -> LogicValue:
+        return self._words[address]
+
+    def __setitem__(self, address: int, value: LogicValue):
+        self._words[address] = value
+
+    def written(self) -> Dict[int, LogicValue]:
+        """ address -> value of every word that is not X. """
+        return {a: v for a, v in enumerate(self._words) if v != X}
+
+    def copy(self) -> "ArrayStorage":
+        other = ArrayStorage.__new__(ArrayStorage)
+        other.size, other._words = self.size, self._words[:]
+        return other
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ArrayStorage) and self._words == other._words
+
+
+class PagedStorage:
+    """ Pages of PAGE_SIZE words made on first write, for large memories. """
+    def __init__(self, address_bits: int):
+        self.size = 1 << address_bits
+        self._pages: Dict[int, List[LogicValue]] = {}
+
+    def __getitem__(self, address: int) -> LogicValue:
+        page = self._pages.get(address >> PAGE_BITS)
+        return X if page is None else page[address & (PAGE_SIZE - 1)]
+
+    def __setitem__(self, address: int, value: LogicValue):
+        page = self._pages.get(address >> PAGE_BITS)
+        if page is None:
+            page = self._pages[address >> PAGE_BITS] = [X] * PAGE_SIZE
+        page[address & (PAGE_SIZE - 1)] = value
+
+    def written(self) -> Dict[int, LogicValue]:
+        return {(n << PAGE_BITS) + i: v for n, page in sorted(self._pages.items())
+                for i, v in enumerate(page) if v != X}
+
+    def copy(self) -> "PagedStorage":
+        other = PagedStorage.__new__(PagedStorage)
+        other.size = self.size
+        other._pages = {n: page[:] for n, page in self._pages.items()}
+        return other
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, PagedStorage) and self.written() == other.written()
+
+
+def make_storage(address_bits: int,
+                 contents: Sequence[LogicValue] | Mapping[int, LogicValue] = ()
+                 ) -> ArrayStorage | PagedStorage:
+    """
+    Storage for 2^address_bits words loaded with contents, a list of the
+    words from address 0 or an address -> word dict.
+
+    Raises
+    ------
+    ValueError
+        If an address of contents is outside the memory.
+    """
+    if address_bits <= ARRAY_ADDRESS_BITS:
+        storage = ArrayStorage(address_bits)
+    else:
+        storage = PagedStorage(address_bits)
+    items = contents.items() if isinstance(contents, Mapping) else enumerate(contents)
+    for address, value in items:
+        if not 0 <= address < storage.size:
+            raise ValueError(f"Address {address:#x} is outside a {address_bits} bit memory")
+        storage[address] = value
+    return storage
+
+
+def rom_image(entries: str | Iterable[str | int]) -> List[int]:
+    """
+    Words of a ROM image as made by embeded_scripts/rom_files.py: a list of
+    ints or of decimal / "0x.." strings, or one string of them separated by
+    spaces or commas (the CircuitVerse ROM load format).
+    """
+    if isinstance(entries, str):
+        entries = entries.replace(",", " ").split()
+    return [entry if isinstance(entry, int) else int(entry, 0) for entry in entries]
+
+
+@dataclass
+class MemoryGate(Gate):
+    """
+    RAM or ROM block, gate_type "RAM" with inputs (Addr, Data In, WE#, OE#,
+    CE#) or "ROM" with inputs (Addr, OE#, CE#), output Data Out and delay
+    the access time.
+
+    Every simulation starts from a new storage loaded with contents (see
+    MemoryEvaluator.reset), so a compiled netlist can be run again and
+    again. The storage of the last run is the storage attribute, so the
+    memory can be read back after a simulation.
+    """
+    width: int = 8          # bits per word
+    address_bits: int = 8
+    contents: Sequence[LogicValue] | Mapping[int, LogicValue] = ()
+    storage: ArrayStorage | PagedStorage | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        gate_type = self.gate_type.upper()
+        n_pins = {"RAM": 5, "ROM": 3}.get(gate_type)
+        if n_pins is None:
+            raise ValueError(f"Unknown memory type: {self.gate_type}")
+        if len(self.inputs) != n_pins:
+            raise ValueError(f"A {gate_type} has {n_pins} inputs, {self.name} has "
+                             f"{len(self.inputs)}")
+
+    def bus_widths(self) -> Dict[str, int]:
+        """ Widths of the address and data buses, for buses.signal_widths. """
+        widths = {self.inputs[0]: self.address_bits, self.output: self.width}
+        if self.gate_type.upper() == "RAM":
+            widths[self.inputs[1]] = self.width
+        return widths
+
+    def make_evaluator(self, ins: Tuple[int, ...]) -> "MemoryEvaluator":
+        """ Evaluator on the signal value list, given the input signal ids. """
+        return MemoryEvaluator(self, ins)
+
+
+def _in_range(address: LogicValue, storage: ArrayStorage | PagedStorage) -> bool:
+    """ True for an int address inside the storage. """
+    return isinstance(address, int) and 0 <= address < storage.size
+
+
+class MemoryEvaluator:
+    """
+    Evaluator of a MemoryGate that owns the memory contents.
+
+    The event loop calls it like any word evaluator. reset() loads a new
+    storage with the gate's contents at the start of a run, and save() /
+    restore() copy the contents in and out of a netlist.Checkpoint, so
+    netlist.reset_state and IncrementalSimulator treat the memory as part
+    of the state of the run.
+    """
+    def __init__(self, gate: MemoryGate, ins: Tuple[int, ...]):
+        self.gate = gate
+        self.ins = ins
+        self.mask = (1 << gate.width) - 1
+        self.read_only = gate.gate_type.upper() == "ROM"
+        self.reset()
+
+    def reset(self):
+        """ Start again from the gate's contents. """
+        self.storage = self.gate.storage = make_storage(self.gate.address_bits,
+                                                        self.gate.contents)
+
+    def save(self) -> ArrayStorage | PagedStorage:
+        return self.storage.copy()
+
+    def restore(self, saved: ArrayStorage | PagedStorage):
+        self.storage = self.gate.storage = saved.copy()
+
+    def __call__(self, v: List[LogicValue]) -> LogicValue:
+        storage = self.storage
+        if self.read_only:
+            addr, oe, ce = self.ins
+            if v[ce] == 1 or v[oe] == 1:
+                return Z if v[ce] in (0, 1) and v[oe] in (0, 1) else X
+            address = v[addr]
+            if v[ce] != 0 or v[oe] != 0 or not _in_range(address, storage):
+                return X
+            return storage[address]
+
+        addr, data_in, we, oe, ce = self.ins
+        chip, write, out = v[ce], v[we], v[oe]
+        if chip == 1:
+            return Z
+        address = v[addr]
+        if chip != 0 or write not in (0, 1) or not _in_range(address, storage):
+            return X
+        if write == 0:
+            data = v[data_in]
+            storage[address] = data & self.mask if isinstance(data, int) else X
+        result = storage[address]
+        if out == 1:
+            return Z
+        return result if out == 0 else X
+
+
+def ram(name: str, addr: str, data_in: str, we: str, oe: str, ce: str,
+        data_out: str, delay: Time, width: int = 8, address_bits: int = 8,
+        contents: Sequence[LogicValue] | Mapping[int, LogicValue] = ()) -> MemoryGate:
+    """ RAM block with the pins of the RAM symbol (WE#, OE#, CE# active low). """
+    return MemoryGate(name, "RAM", [addr, data_in, we, oe, ce], data_out, delay,
+                      width=width, address_bits=address_bits, contents=contents)
+
+
+def rom(name: str, addr: str, oe: str, ce: str, data_out: str, delay: Time,
+        image: Sequence[LogicValue] | Mapping[int, LogicValue],
+        width: int = 8, address_bits: int = 8) -> MemoryGate:
+    """ ROM block holding image, e.g. rom_image(make_bcd_hex6()). """
+    return MemoryGate(name, "ROM", [addr, oe, ce], data_out, delay,
+                      width=width, address_bits=address_bits, contents=image)
+
+
+def ram_io_answers(rows: Iterable[Tuple[int | str, int | str, int | str]],
+                   width: int = 8, address_bits: int = 8,
+                   contents: Sequence[LogicValue] | Mapping[int, LogicValue] = ()
+                   ) -> List[int | str]:
+    """
+    Data Out of every row of a draw_ram_io_table exercise.
+
+    Parameters
+    ----------
+    rows : iterable of (addr, data_in, we)
+        The inputs given to draw_ram_io_table, one access each with CE# and
+        OE# low. WE# = 0 writes data_in (Data Out shows the written word),
+        WE# = 1 reads. Rows without an int address or WE# (blank rows left
+        for students) are skipped and get "".
+    width, address_bits : int, optional
+    contents : list or dict, optional
+        Starting memory contents, every other word is unknown.
+
+    Returns
+    -------
+    list
+        One entry per row: the int word, "unknown" (X), "Hi-Z" or "".
+    """
+    gate = ram("RAM", "Addr", "Data In", "WE#", "OE#", "CE#", "Data Out", 0,
+               width=width, address_bits=address_bits, contents=contents)
+    evaluate = gate.make_evaluator((0, 1, 2, 3, 4))
+    answers: List[int | str] = []
+    for addr, data_in, we in rows:
+        if not isinstance(addr, int) or we not in (0, 1):
+            answers.append("")
+            continue
+        data = data_in if isinstance(data_in, int) else X
+        out = evaluate([addr, data, int(we), 0, 0])
+        answers.append(IO_TABLE_LABELS.get(out, out))
+    return answers
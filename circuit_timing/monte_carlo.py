@@ -0,0 +1,295 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Monte Carlo simulation of gate delay variation.
+
+Every trial draws a new delay for each gate and flip-flop, simulates the
+circuit and records which outputs glitched, when each output settled and
+whether a flip-flop input changed inside its setup or hold window (see
+check_timing). This shows why a hazard only turns up on some chips (or
+some runs).
+
+The trials are split over a ProcessPoolExecutor. The (n_trials, n_delays)
+matrix of sampled delays is put in a shared memory block that every worker
+maps once when it starts and reads its trials' rows from directly, and the
+integer arrays of the compiled netlist (and any memory blocks, which build
+their own evaluators) are sent once per worker with the initializer, so a
+task is only a (start, stop) range of trial numbers and the workers only
+send back their tallies.
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+# standard libraries
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from multiprocessing import shared_memory
+import os
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# installed libraries
+import numpy as np
+
+# local files
+from circuit_timing.circuit_timing import DFF, Gate, LogicValue, Time, check_timing
+from circuit_timing.netlist import (Netlist, compile_netlist, make_evaluator,
+                                    make_table, simulate_netlist)
+
+# a delay distribution gets the random generator and the number of trials
+# and returns that many delays
+DelayDistribution = Callable[[np.random.Generator, int], np.ndarray]
+
+# netlist fields that are sent to the workers to rebuild the netlist
+_INT_FIELDS = ("gate_outputs", "input_ptr", "input_idx", "fanout_ptr", "fanout_idx",
+               "dff_d", "dff_clk", "dff_q", "clock_ptr", "clock_idx")
+
+
+@dataclass
+class MonteCarloResult:
+    n_trials: int
+    glitch_probability: Dict[str, float]   # fraction of trials with a glitch
+    settle_times: Dict[str, np.ndarray]    # time of the last transition, per trial
+    violation_fraction: float              # fraction of trials with a setup / hold violation
+
+    def settle_percentiles(self, q: Sequence[float] = (50, 95, 99)
+                           ) -> Dict[str, np.ndarray]:
+        """ Percentiles q (0 - 100) of the settle time of every signal. """
+        return {name: np.percentile(times, q) for name, times in self.settle_times.items()}
+
+
+def sample_delays(gates: Sequence[Gate],
+                  dffs: Sequence[DFF],
+                  n_trials: int,
+                  distributions: Dict[str, DelayDistribution | float] | None = None,
+                  sigma: float = 0.1,
+                  seed: int | None = None) -> np.ndarray:
+    """
+    Draw the delays of every trial.
+
+    Parameters
+    ----------
+    gates, dffs : sequence of Gate and DFF
+        The circuit, their delay is the nominal delay.
+    n_trials : int
+        Number of trials.
+    distributions : dict, optional
+        Gate or flip-flop name -> distribution function, or a relative
+        standard deviation to use instead of sigma for that element.
+    sigma : float, optional
+        Relative standard deviation of the normal distribution used for
+        elements not in distributions, default 10 % of the nominal delay.
+    seed : int, optional
+        Seed for numpy.random.default_rng.
+
+    Returns
+    -------
+    numpy.ndarray
+        shape (n_trials, len(gates) + len(dffs)), gate delays first. Normal
+        draws are clipped to 1 % of the nominal delay so no delay is <= 0.
+    """
+    rng = np.random.default_rng(seed)
+    distributions = distributions or {}
+    delays = np.empty((n_trials, len(gates) + len(dffs)))
+    for col, element in enumerate(list(gates) + list(dffs)):
+        dist = distributions.get(element.name, sigma)
+        if callable(dist):
+            delays[:, col] = dist(rng, n_trials)
+        else:
+            draw = rng.normal(element.delay, dist * element.delay, n_trials)
+            delays[:, col] = np.maximum(draw, 0.01 * element.delay)
+    return delays
+
+
+class _TrialRunner:
+    """ Runs a range of trials and tallies the statistics. """
+    def __init__(self, netlist: Netlist,
+                 delays: np.ndarray,
+                 initial_signals: Dict[str, LogicValue],
+                 input_transitions: Dict[str, List[Tuple[Time, LogicValue]]],
+                 end_time: Time,
+                 watch: Sequence[str],
+                 glitch_width: Time,
+                 dffs: Sequence[DFF],
+                 inertial: bool):
+        self.netlist = netlist
+        self.delays = delays
+        self.initial_signals = initial_signals
+        self.input_transitions = input_transitions
+        self.end_time = end_time
+        self.watch = watch
+        self.glitch_width = glitch_width
+        # only the flip-flops with a setup or hold window can be violated
+        self.dffs = [ff for ff in dffs if ff.setup or ff.hold]
+        self.inertial = inertial
+
+    def run(self, start: int, stop: int) -> Tuple[np.ndarray, np.ndarray, int]:
+        """
+        Returns the number of trials each watched signal glitched in, the
+        (stop - start, n_watch) settle times and the number of trials with
+        a setup or hold violation.
+        """
+        netlist = self.netlist
+        n_gates = netlist.n_gates
+        glitched = np.zeros(len(self.watch), dtype=np.int64)
+        settle = np.zeros((stop - start, len(self.watch)))
+        n_violations = 0
+        for row, trial in enumerate(range(start, stop)):
+            delays = self.delays[trial].tolist()
+            variant = replace(netlist, gate_delays=tuple(delays[:n_gates]),
+                              dff_delays=tuple(delays[n_gates:]))
+            history = simulate_netlist(variant, self.initial_signals,
+                                       self.input_transitions, self.end_time,
+                                       inertial=self.inertial)
+            for col, name in enumerate(self.watch):
+                points = history.get(name, ((0, 0),))
+                settle[row, col] = points[-1][0]
+                if any(t_end - t_start < self.glitch_width
+                       for (t_start, _), (t_end, _) in zip(points[1:], points[2:])):
+                    glitched[col] += 1
+            if self.dffs and check_timing(history, self.dffs):
+                n_violations += 1
+        return glitched, settle, n_violations
+
+
+# --- worker process side
+_runner: _TrialRunner | None = None
+_shm: shared_memory.SharedMemory | None = None
+
+
+def _init_worker(shm_name: str,
+                 layout: Dict[str, Tuple[int, Tuple[int, ...], str]],
+                 spec: dict):
+    """ Map the shared delays and rebuild the netlist once per worker. """
+    global _runner, _shm
+    _shm = shared_memory.SharedMemory(name=shm_name)
+    arrays = {key: np.ndarray(shape, dtype=dtype, buffer=_shm.buf, offset=offset)
+              for key, (offset, shape, dtype) in layout.items()}
+    ints = spec["ints"]
+    input_ptr, input_idx = ints["input_ptr"], ints["input_idx"]
+    gate_inputs = [input_idx[input_ptr[g]:input_ptr[g + 1]]
+                   for g in range(len(spec["gate_types"]))]
+    # memory blocks build their own evaluator, as in compile_netlist
+    blocks = spec["blocks"]
+    evaluators = tuple(blocks[g].make_evaluator(ins) if g in blocks
+                       else make_evaluator(gate_type, ins)
+                       for g, (gate_type, ins) in enumerate(zip(spec["gate_types"],
+                                                                gate_inputs)))
+    tables = tuple(make_table(gate_type, len(ins))
+                   for gate_type, ins in zip(spec["gate_types"], gate_inputs))
+    netlist = Netlist(signal_names=spec["signal_names"],
+                      signal_ids={name: i for i, name in enumerate(spec["signal_names"])},
+                      gate_names=spec["gate_names"], gate_types=spec["gate_types"],
+                      gate_delays=(), evaluators=evaluators, gate_tables=tables,
+                      dff_names=spec["dff_names"], dff_delays=(),
+                      stateful=tuple(blocks), **ints)
+    _runner = _TrialRunner(netlist, arrays["delays"], **spec["run"])
+
+
+def _run_chunk(start: int, stop: int) -> Tuple[np.ndarray, np.ndarray, int]:
+    return _runner.run(start, stop)
+
+
+def _share_arrays(arrays: Dict[str, np.ndarray]
+                  ) -> Tuple[shared_memory.SharedMemory,
+                             Dict[str, Tuple[int, Tuple[int, ...], str]]]:
+    """ Copy the arrays into one shared memory block, 8 byte aligned. """
+    layout = {}
+    offset = 0
+    for key, array in arrays.items():
+        layout[key] = (offset, array.shape, array.dtype.str)
+        offset += -(-array.nbytes // 8) * 8
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 8))
+    for key, array in arrays.items():
+        start, shape, dtype = layout[key]
+        np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=start)[...] = array
+    return shm, layout
+
+
+def monte_carlo(gates: Sequence[Gate],
+                initial_signals: Dict[str, LogicValue],
+                input_transitions: Dict[str, List[Tuple[Time, LogicValue]]],
+                end_time: Time,
+                n_trials: int,
+                dffs: Sequence[DFF] = (),
+                distributions: Dict[str, DelayDistribution | float] | None = None,
+                sigma: float = 0.1,
+                glitch_width: Time | None = None,
+                signals: Iterable[str] | None = None,
+                inertial: bool = False,
+                max_workers: int | None = None,
+                seed: int | None = None) -> MonteCarloResult:
+    """
+    Simulate n_trials copies of the circuit with randomly varied delays.
+
+    Parameters
+    ----------
+    gates, initial_signals, input_transitions, end_time :
+        As for simulate_circuit.
+    n_trials : int
+        Number of trials.
+    dffs : sequence of DFF, optional
+        Flip-flops of the circuit. A trial has a violation when check_timing
+        finds a D change inside the setup or hold window of one of them.
+    distributions, sigma, seed :
+        How the delays are drawn, see sample_delays.
+    glitch_width : int or float, optional
+        Pulses narrower than this count as glitches, default the largest
+        nominal gate delay.
+    signals : iterable of str, optional
+        Signals to report, default every gate and flip-flop output.
+    inertial : bool, optional
+        Use inertial delays, see simulate_netlist.
+    max_workers : int, optional
+        Worker processes, default os.cpu_count(). With 1 the trials run in
+        this process.
+
+    Returns
+    -------
+    MonteCarloResult
+    """
+    gates, dffs = list(gates), list(dffs)
+    netlist = compile_netlist(gates, dffs,
+                              extra_signals=list(initial_signals) + list(input_transitions))
+    delays = sample_delays(gates, dffs, n_trials, distributions, sigma, seed)
+    if glitch_width is None:
+        glitch_width = max((g.delay for g in gates), default=0)
+    if signals is None:
+        signals = dict.fromkeys([g.output for g in gates] + [ff.q for ff in dffs])
+    watch = list(signals)
+    run_args = dict(initial_signals=dict(initial_signals),
+                    input_transitions={name: list(trans)
+                                       for name, trans in input_transitions.items()},
+                    end_time=end_time, watch=watch, glitch_width=glitch_width,
+                    dffs=dffs, inertial=inertial)
+
+    max_workers = max_workers or os.cpu_count() or 1
+    max_workers = min(max_workers, max(n_trials, 1))
+    if max_workers == 1:
+        results = [_TrialRunner(netlist, delays, **run_args).run(0, n_trials)]
+    else:
+        shm, layout = _share_arrays({"delays": delays})
+        spec = dict(signal_names=netlist.signal_names, gate_names=netlist.gate_names,
+                    gate_types=netlist.gate_types, dff_names=netlist.dff_names,
+                    ints={key: getattr(netlist, key) for key in _INT_FIELDS},
+                    blocks={g: gates[g] for g in netlist.stateful},
+                    run=run_args)
+        # a few chunks per worker evens out slow trials without much overhead
+        bounds = np.linspace(0, n_trials, 4 * max_workers + 1).astype(int)
+        try:
+            with ProcessPoolExecutor(max_workers, initializer=_init_worker,
+                                     initargs=(shm.name, layout, spec)) as pool:
+                results = list(pool.map(_run_chunk, bounds[:-1].tolist(),
+                                        bounds[1:].tolist()))
+        finally:
+            shm.close()
+            shm.unlink()
+
+    glitched = sum(r[0] for r in results)
+    settle = np.concatenate([r[1] for r in results])
+    n_violations = sum(r[2] for r in results)
+    return MonteCarloResult(
+        n_trials=n_trials,
+        glitch_probability={name: glitched[col] / n_trials for col, name in enumerate(watch)},
+        settle_times={name: settle[:, col] for col, name in enumerate(watch)},
+        violation_fraction=n_violations / n_trials if n_trials else 0.0,
+    )
@@ -0,0 +1,713 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Compile a list of Gate / DFF objects into a frozen, integer indexed netlist
+and run the event driven simulation on that netlist.
+
+Every signal name is given an integer id once at compile time, the gate
+inputs and the signal fanout are stored as flat CSR arrays and every gate
+gets a precomputed evaluator, so the event loop never hashes a string,
+builds an input list or looks up a gate type by name. Gates with up to
+cells.MAX_LUT_INPUTS inputs are evaluated from a lookup table indexed by a
+mask of their input bits that is kept up to date as the inputs toggle.
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+# standard libraries
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import count
+from operator import itemgetter
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Set, Tuple
+
+# local files
+from circuit_timing.buses import make_word_evaluator, parse_word_type, word_type
+from circuit_timing.cells import CELL_FUNCTIONS, MAX_LUT_INPUTS, truth_table
+from circuit_timing.circuit_timing import DFF, Gate, LogicValue, SimStats, Time, eval_unknown
+from circuit_timing.schedulers import (CountingQueue, Event, HeapQueue, TimingWheel,
+                                       make_scheduler)
+from circuit_timing.sources import Source, Transitions, is_lazy
+
+Evaluator = Callable[[List[LogicValue]], LogicValue]
+
+# generation of the events of lazy input sources, see _event_loop
+LAZY_INPUT = -2
+
+
+def _make_and(ins: Tuple[int, ...]) -> Evaluator:
+    if len(ins) == 1:
+        a, = ins
+        return lambda v: v[a]
+    if len(ins) == 2:
+        a, b = ins
+        return lambda v: v[a] & v[b]
+    get = itemgetter(*ins)
+    return lambda v: int(0 not in get(v))
+
+
+def _make_or(ins: Tuple[int, ...]) -> Evaluator:
+    if len(ins) == 1:
+        a, = ins
+        return lambda v: v[a]
+    if len(ins) == 2:
+        a, b = ins
+        return lambda v: v[a] | v[b]
+    get = itemgetter(*ins)
+    return lambda v: int(1 in get(v))
+
+
+def _make_not(ins: Tuple[int, ...]) -> Evaluator:
+    a = ins[0]
+    return lambda v: v[a] ^ 1
+
+
+def _make_nand(ins: Tuple[int, ...]) -> Evaluator:
+    and_ = _make_and(ins)
+    return lambda v: and_(v) ^ 1
+
+
+def _make_nor(ins: Tuple[int, ...]) -> Evaluator:
+    or_ = _make_or(ins)
+    return lambda v: or_(v) ^ 1
+
+
+def _make_xor(ins: Tuple[int, ...]) -> Evaluator:
+    if len(ins) == 1:
+        a, = ins
+        return lambda v: v[a]
+    if len(ins) == 2:
+        a, b = ins
+        return lambda v: v[a] ^ v[b]
+    get = itemgetter(*ins)
+    return lambda v: sum(get(v)) & 1
+
+
+# gate type -> factory that builds an evaluator from the input signal ids
+EVALUATOR_FACTORIES: Dict[str, Callable[[Tuple[int, ...]], Evaluator]] = {
+    "AND": _make_and,
+    "OR": _make_or,
+    "NOT": _make_not,
+    "NAND": _make_nand,
+    "NOR": _make_nor,
+    "XOR": _make_xor,
+}
+
+
+def make_evaluator(gate_type: str, ins: Tuple[int, ...]) -> Evaluator:
+    """
+    Build the evaluator of a gate from its type and input signal ids, from
+    buses.WORD_FACTORIES for "TYPE[width]" word gates, EVALUATOR_FACTORIES
+    or else from the cell function.
+
+    Raises
+    ------
+    ValueError
+        If the gate type is not a known cell.
+    """
+    word = parse_word_type(gate_type)
+    if word is not None:
+        return make_word_evaluator(word[0], word[1], ins)
+    factory = EVALUATOR_FACTORIES.get(gate_type)
+    if factory is not None:
+        return factory(ins)
+    function = CELL_FUNCTIONS.get(gate_type)
+    if function is None:
+        raise ValueError(f"Unknown gate type: {gate_type}")
+    get = itemgetter(*ins)
+    if len(ins) == 1:
+        return lambda v: function((get(v),))
+    return lambda v: function(get(v))
+
+
+def make_table(gate_type: str, n_inputs: int) -> bytes | None:
+    """ Lookup table of a gate, None for word gates and gates too wide for one. """
+    if n_inputs > MAX_LUT_INPUTS or parse_word_type(gate_type) is not None:
+        return None
+    return truth_table(gate_type, n_inputs)
+
+
+def _csr(rows: Sequence[Sequence[int]]) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """ Flatten a list of index lists into (pointer, index) CSR arrays. """
+    ptr = [0]
+    idx = []
+    for row in rows:
+        idx.extend(row)
+        ptr.append(len(idx))
+    return tuple(ptr), tuple(idx)
+
+
+@dataclass(frozen=True)
+class Netlist:
+    """
+    Frozen, integer indexed form of a Gate / DFF circuit.
+
+    Signal ids are assigned in sorted name order, so ordering events by
+    (time, signal id, push order) gives the same tie-breaking as the string
+    keyed (time, signal name, push order) heap used by simulate_circuit.
+
+    The inputs of gate g are input_idx[input_ptr[g]:input_ptr[g + 1]],
+    the gates driven by signal s are fanout_idx[fanout_ptr[s]:fanout_ptr[s + 1]]
+    and the flip-flops clocked by signal s are
+    clock_idx[clock_ptr[s]:clock_ptr[s + 1]].
+
+    gate_tables[g] is the output of gate g for each mask of its input bits
+    (see cells.truth_table), or None for gates that are too wide for a table.
+
+    stateful lists the gates whose evaluator keeps state between calls
+    (memory blocks), see reset_state.
+    """
+    signal_names: Tuple[str, ...]
+    signal_ids: Dict[str, int]
+    # gates
+    gate_names: Tuple[str, ...]
+    gate_types: Tuple[str, ...]
+    gate_outputs: Tuple[int, ...]
+    gate_delays: Tuple[Time, ...]
+    input_ptr: Tuple[int, ...]
+    input_idx: Tuple[int, ...]
+    fanout_ptr: Tuple[int, ...]
+    fanout_idx: Tuple[int, ...]
+    evaluators: Tuple[Evaluator, ...]
+    gate_tables: Tuple[bytes | None, ...]
+    # flip-flops
+    dff_names: Tuple[str, ...]
+    dff_d: Tuple[int, ...]
+    dff_clk: Tuple[int, ...]
+    dff_q: Tuple[int, ...]
+    dff_delays: Tuple[Time, ...]
+    clock_ptr: Tuple[int, ...]
+    clock_idx: Tuple[int, ...]
+    stateful: Tuple[int, ...] = ()
+
+    @property
+    def n_signals(self) -> int:
+        return len(self.signal_names)
+
+    @property
+    def n_gates(self) -> int:
+        return len(self.gate_names)
+
+    def gate_inputs(self, g: int) -> Tuple[int, ...]:
+        """ Return the input signal ids of gate g. """
+        return self.input_idx[self.input_ptr[g]:self.input_ptr[g + 1]]
+
+    def fanout(self, s: int) -> Tuple[int, ...]:
+        """ Return the ids of the gates that read signal s. """
+        return self.fanout_idx[self.fanout_ptr[s]:self.fanout_ptr[s + 1]]
+
+    def clocked_by(self, s: int) -> Tuple[int, ...]:
+        """ Return the ids of the flip-flops clocked by signal s. """
+        return self.clock_idx[self.clock_ptr[s]:self.clock_ptr[s + 1]]
+
+
+def compile_netlist(gates: Iterable[Gate],
+                    dffs: Iterable[DFF] = (),
+                    extra_signals: Iterable[str] = ()) -> Netlist:
+    """
+    Compile Gate and DFF objects into a Netlist.
+
+    Parameters
+    ----------
+    gates : iterable of Gate
+        Combinational gates of the circuit.
+    dffs : iterable of DFF, optional
+        Rising edge flip-flops of the circuit.
+    extra_signals : iterable of str, optional
+        Names of signals that are not connected to any gate or flip-flop
+        but should still get an id (e.g. plotted-only inputs).
+
+    Returns
+    -------
+    Netlist
+        The frozen netlist.
+
+    Raises
+    ------
+    ValueError
+        If a gate type is not a known cell (see cells.register_cell).
+    """
+    gates = list(gates)
+    dffs = list(dffs)
+
+    names = set(extra_signals)
+    for g in gates:
+        names.update(g.inputs)
+        names.add(g.output)
+    for ff in dffs:
+        names.update((ff.d, ff.clk, ff.q))
+    signal_names = tuple(sorted(names))
+    ids = {name: i for i, name in enumerate(signal_names)}
+    n_signals = len(signal_names)
+
+    gate_inputs = [[ids[name] for name in g.inputs] for g in gates]
+    input_ptr, input_idx = _csr(gate_inputs)
+
+    gate_types = tuple(word_type(g.gate_type, g.width) if hasattr(g, "width")
+                       else g.gate_type.upper() for g in gates)
+    # behavioral blocks (memory.MemoryGate) build their own evaluator
+    evaluators = tuple(g.make_evaluator(tuple(ins)) if hasattr(g, "make_evaluator")
+                       else make_evaluator(gate_type, tuple(ins))
+                       for g, gate_type, ins in zip(gates, gate_types, gate_inputs))
+    gate_tables = tuple(make_table(gate_type, len(ins))
+                        for gate_type, ins in zip(gate_types, gate_inputs))
+
+    # a gate that reads the same signal twice only has to be re-evaluated once
+    fanout_rows: List[List[int]] = [[] for _ in range(n_signals)]
+    for gate_id, ins in enumerate(gate_inputs):
+        for sid in dict.fromkeys(ins):
+            fanout_rows[sid].append(gate_id)
+    fanout_ptr, fanout_idx = _csr(fanout_rows)
+
+    clock_rows: List[List[int]] = [[] for _ in range(n_signals)]
+    for dff_id, ff in enumerate(dffs):
+        clock_rows[ids[ff.clk]].append(dff_id)
+    clock_ptr, clock_idx = _csr(clock_rows)
+
+    return Netlist(
+        signal_names=signal_names,
+        signal_ids=ids,
+        gate_names=tuple(g.name for g in gates),
+        gate_types=gate_types,
+        gate_outputs=tuple(ids[g.output] for g in gates),
+        gate_delays=tuple(g.delay for g in gates),
+        input_ptr=input_ptr,
+        input_idx=input_idx,
+        fanout_ptr=fanout_ptr,
+        fanout_idx=fanout_idx,
+        evaluators=evaluators,
+        gate_tables=gate_tables,
+        dff_names=tuple(ff.name for ff in dffs),
+        dff_d=tuple(ids[ff.d] for ff in dffs),
+        dff_clk=tuple(ids[ff.clk] for ff in dffs),
+        dff_q=tuple(ids[ff.q] for ff in dffs),
+        dff_delays=tuple(ff.delay for ff in dffs),
+        clock_ptr=clock_ptr,
+        clock_idx=clock_idx,
+        stateful=tuple(g for g, gate in enumerate(gates) if hasattr(gate, "make_evaluator")),
+    )
+
+
+def reset_state(netlist: Netlist):
+    """
+    Put the evaluators that keep state (the contents of memory blocks)
+    back to their start, so every run of a netlist begins the same way.
+    """
+    for g in netlist.stateful:
+        netlist.evaluators[g].reset()
+
+
+def topological_order(netlist: Netlist) -> Tuple[int, ...]:
+    """
+    Order the gates so every gate comes after the gates that drive its inputs.
+
+    Primary inputs and flip-flop outputs are treated as sources, so loops
+    through a DFF are fine.
+
+    Raises
+    ------
+    ValueError
+        If the gates form a combinational loop.
+    """
+    n_gates = netlist.n_gates
+    outputs = netlist.gate_outputs
+    n_drivers = Counter(outputs)
+    waiting = [sum(n_drivers[s] for s in set(netlist.gate_inputs(g)))
+               for g in range(n_gates)]
+    ready = [g for g in range(n_gates) if waiting[g] == 0]
+    order = []
+    while ready:
+        g = ready.pop()
+        order.append(g)
+        for reader in netlist.fanout(outputs[g]):
+            waiting[reader] -= 1
+            if waiting[reader] == 0:
+                ready.append(reader)
+    if len(order) != n_gates:
+        stuck = [netlist.gate_names[g] for g in range(n_gates) if waiting[g] > 0]
+        raise ValueError(f"Combinational loop through gates: {stuck}")
+    return tuple(order)
+
+
+def check_driven(netlist: Netlist, inputs: Iterable[str]):
+    """
+    Check every signal a gate reads is one of inputs or a gate output, for
+    the zero delay evaluators (bit_parallel, faults, symbolic) that have no
+    starting values to fall back on.
+
+    Raises
+    ------
+    ValueError
+        Naming the signals that are neither.
+    """
+    ids = netlist.signal_ids
+    driven = set(netlist.gate_outputs) | {ids[name] for name in inputs}
+    undriven = [netlist.signal_names[s] for s in netlist.input_idx if s not in driven]
+    if undriven:
+        raise ValueError(f"Signals {sorted(set(undriven))} are not inputs "
+                         f"and are not driven by a gate")
+
+
+def simulate_netlist(
+    netlist: Netlist,
+    initial_signals: Dict[str, LogicValue],
+    input_transitions: Dict[str, Transitions],
+    end_time: Time,
+    scheduler: str = "heap",
+    inertial: bool = False,
+    on_change: Callable[[Time, str, LogicValue], None] | None = None,
+    keep_history: bool = True,
+    stats: SimStats | None = None,
+) -> Dict[str, List[Tuple[Time, LogicValue]]]:
+    """
+    Event driven simulation of a compiled netlist.
+
+    Gives the same transitions as simulate_circuit (transport delays,
+    flip-flops sample D on the rising edge of their clock) but the queue
+    holds (time, signal id, order, value, generation) tuples and the signal
+    values live in a flat list indexed by signal id.
+
+    scheduler picks the event queue: "heap" or "wheel" for a timing wheel,
+    which falls back to the heap if a delay or input time is not a whole
+    number (see schedulers.make_scheduler).
+
+    With inertial=True a gate or flip-flop output only keeps its latest
+    scheduled change: a pulse on the inputs shorter than the delay is
+    swallowed instead of coming out the other side. Every output signal has
+    a generation counter that is bumped when its pending event is replaced,
+    so the stale event is dropped in O(1) when it is popped instead of being
+    searched for in the queue. Input transitions are never cancelled.
+
+    on_change(time, signal_name, value) is called for every committed
+    transition, in time order, e.g. VCDWriter.change to stream the run to
+    a file. With keep_history=False the transitions are not stored at all
+    and only the starting values are returned, so long runs that stream
+    to on_change use constant memory.
+
+    An input can be given a lazy Source (e.g. sources.Clock(50)) instead
+    of a transition list; its next transition is only queued when the
+    previous one is popped, so endless clocks and data streams take no
+    memory up front.
+
+    Give a SimStats as stats to count queue events, queue depth, gate
+    evaluations and toggles as simulate_circuit does (discarded is filled
+    in at the end of the run). The queue is then wrapped in a
+    schedulers.CountingQueue, so leave it out of timed runs.
+
+    returns: dict signal_name -> list of (time, value) transitions
+    suitable for your draw_signals() function
+    """
+    ids = netlist.signal_ids
+    n_signals = netlist.n_signals
+
+    values: List[LogicValue] = [0] * n_signals
+    for name, val in initial_signals.items():
+        values[ids[name]] = val
+    changes: List[List[Tuple[Time, LogicValue]]] = [[] for _ in range(n_signals)]
+    reset_state(netlist)
+
+    lists = {name: trans for name, trans in input_transitions.items() if not is_lazy(trans)}
+    sources = {ids[name]: iter(trans) for name, trans in input_transitions.items()
+               if is_lazy(trans)}
+    order = count()
+    input_events = list(_input_events(netlist, lists, end_time, order=order))
+    # one event per lazy source, the next one is pulled when it is popped
+    for sid, source in sources.items():
+        first = next(source, None)
+        if first is not None and first[0] <= end_time:
+            input_events.append((first[0], sid, next(order), first[1], LAZY_INPUT))
+    # the wheel needs whole times, which only a Source can promise ahead
+    if not all(isinstance(trans, Source) and trans.times_are_whole()
+               for trans in input_transitions.values() if is_lazy(trans)):
+        scheduler = "heap"
+    event_queue = make_scheduler(scheduler, netlist.gate_delays + netlist.dff_delays,
+                                 (event[0] for event in input_events))
+    if stats is not None:
+        event_queue = CountingQueue(event_queue, stats)
+        on_change = _counting_on_change(netlist, stats, on_change)
+    for event in input_events:
+        event_queue.push(event)
+
+    _event_loop(netlist, event_queue, values, changes, [1] * n_signals,
+                [None] * n_signals, end_time, inertial=inertial,
+                on_change=on_change, keep_history=keep_history, sources=sources)
+    if stats is not None:
+        stats.discarded = stats.popped - sum(stats.toggles.values())
+    return _build_history(netlist, initial_signals, changes)
+
+
+def _counting_on_change(netlist: Netlist,
+                        stats: SimStats,
+                        on_change: Callable[[Time, str, LogicValue], None] | None
+                        ) -> Callable[[Time, str, LogicValue], None]:
+    """ on_change that counts toggles and gate evaluations into stats first. """
+    ids, gate_names = netlist.signal_ids, netlist.gate_names
+    stats.toggles = toggles = dict.fromkeys(netlist.signal_names, 0)
+    stats.gate_evals = gate_evals = dict.fromkeys(gate_names, 0)
+
+    def count_change(time: Time, name: str, value: LogicValue):
+        toggles[name] += 1
+        for g in netlist.fanout(ids[name]):
+            gate_evals[gate_names[g]] += 1
+        if on_change is not None:
+            on_change(time, name, value)
+    return count_change
+
+
+@dataclass
+class Checkpoint:
+    """
+    State of an event driven run just before the first event at `time`.
+
+    The flip-flops keep no state of their own (the last clock value is the
+    value of the clock signal), so this and the contents of the memory
+    blocks are enough to resume the run.
+    """
+    time: Time
+    values: List[LogicValue]
+    gate_events: List[Event]        # pending gate and flip-flop events
+    generation: List[int]
+    pending: List[LogicValue | None]
+    history_lengths: List[int]      # len(changes[s]) at this point
+    memories: List = field(default_factory=list)  # save() of each stateful gate
+
+    def restore_memories(self, netlist: Netlist):
+        """ Load the saved memory contents back into the netlist's evaluators. """
+        for g, saved in zip(netlist.stateful, self.memories):
+            netlist.evaluators[g].restore(saved)
+
+    def live_events(self) -> List[Tuple[Time, int, LogicValue]]:
+        """
+        (time, signal id, value) of the pending events that have not been
+        cancelled, so checkpoints of different runs can be compared.
+        """
+        return sorted((event[0], event[1], event[3]) for event in self.gate_events
+                      if event[4] < 0 or event[4] == self.generation[event[1]])
+
+
+def _input_events(netlist: Netlist,
+                  input_transitions: Dict[str, List[Tuple[Time, LogicValue]]],
+                  end_time: Time,
+                  start_time: Time | None = None,
+                  order: Iterator[int] | None = None) -> Iterator[Event]:
+    """
+    Input transitions as queue events, generation 0 marks an input. order
+    numbers them (default from 0), so two transitions of an input at the
+    same time are applied in the order they are listed.
+    """
+    ids = netlist.signal_ids
+    order = count() if order is None else order
+    for name, trans_list in input_transitions.items():
+        sid = ids[name]
+        for t, v in trans_list:
+            if t <= end_time and (start_time is None or t >= start_time):
+                yield t, sid, next(order), v, 0
+
+
+def _event_loop(netlist: Netlist,
+                event_queue: HeapQueue | TimingWheel,
+                values: List[LogicValue],
+                changes: List[List[Tuple[Time, LogicValue]]],
+                generation: List[int],
+                pending: List[LogicValue | None],
+                end_time: Time,
+                inertial: bool = False,
+                on_change: Callable[[Time, str, LogicValue], None] | None = None,
+                keep_history: bool = True,
+                checkpoint_every: Time | None = None,
+                first_checkpoint: Time = 0,
+                on_checkpoint: Callable[[Checkpoint], bool] | None = None,
+                sources: Dict[int, Iterator[Tuple[Time, LogicValue]]] | None = None,
+                ) -> Checkpoint | None:
+    """
+    Run the queued events of a netlist until end_time, updating values and
+    changes in place.
+
+    Queue events are (time, signal id, order, value, generation): order
+    counts the pushes, so events of one signal at the same time are applied
+    in the order they were queued, as in simulate_circuit. Generation 0 is
+    an input transition, LAZY_INPUT one from sources[signal id] (popping it
+    queues the next transition of that source), -1 a transport delay gate
+    or flip-flop event and a positive number an inertial one, which is only
+    live while it matches generation[signal id].
+
+    If checkpoint_every is given, on_checkpoint is called with a Checkpoint
+    at first_checkpoint and then every checkpoint_every time units (only
+    while there are events left). If it returns True the run stops there
+    and that Checkpoint is returned.
+    """
+    names = netlist.signal_names
+    n_signals = len(names)
+
+    # expand the CSR fanout once per run into (gate, pin bits, table,
+    # evaluator, output, delay) tuples so the event loop does a single index
+    # per fanout gate. The pin bits are the bits of the gate input mask the
+    # signal sits on, so a toggle is one XOR into masks[gate]
+    outs, delays, evals = netlist.gate_outputs, netlist.gate_delays, netlist.evaluators
+    tables = netlist.gate_tables
+    masks = [0] * netlist.n_gates
+    pin_bits: List[Dict[int, int]] = [{} for _ in range(n_signals)]
+    # table gates with an input that is not 0 / 1 (X, Z): their mask only
+    # has the known bits and their output comes from eval_unknown
+    uncertain: Set[int] = set()
+
+    def rebuild_mask(g: int) -> int:
+        mask = 0
+        uncertain.discard(g)
+        for pin, s in enumerate(netlist.gate_inputs(g)):
+            if values[s] == 1:
+                mask |= 1 << pin
+            elif values[s] != 0:
+                uncertain.add(g)
+        masks[g] = mask
+        return mask
+
+    def unknown_output(g: int) -> LogicValue:
+        return eval_unknown(netlist.gate_types[g], [values[s] for s in netlist.gate_inputs(g)])
+
+    for g in range(netlist.n_gates):
+        if tables[g] is None:
+            continue
+        rebuild_mask(g)
+        for pin, s in enumerate(netlist.gate_inputs(g)):
+            pin_bits[s][g] = pin_bits[s].get(g, 0) | 1 << pin
+    fanout = [tuple((g, pin_bits[s].get(g, 0), tables[g], evals[g], outs[g], delays[g])
+                    for g in netlist.fanout(s))
+              for s in range(n_signals)]
+    clocked = [tuple((netlist.dff_d[f], netlist.dff_q[f], netlist.dff_delays[f])
+                     for f in netlist.clocked_by(s))
+               for s in range(n_signals)]
+    push = event_queue.push
+    queued = event_queue.events()
+    # carry on after the orders of the events already queued
+    order = count(max((e[2] for e in queued), default=-1) + 1)
+    # transport delays: the value each output will have once its queued
+    # events are done, so a new evaluation that undoes a pending change
+    # (a glitch shorter than the delay) still queues the recovery
+    projected = values[:]
+    for _, sid, _, value, _ in sorted(e for e in queued if e[4] == -1):
+        projected[sid] = value
+    # the transport events of one output are queued in time order, so one at
+    # the same time as the last queued replaces its value instead of being
+    # queued too: the last evaluation at a time wins, not the smaller value
+    last_queued: List[Time | None] = [None] * n_signals
+    replaced: Dict[Tuple[Time, int], LogicValue] = {}
+
+    def schedule_transport(event_time: Time, out: int, new_out: LogicValue):
+        if last_queued[out] == event_time:
+            replaced[event_time, out] = new_out
+        else:
+            push((event_time, out, next(order), new_out, -1))
+            last_queued[out] = event_time
+        projected[out] = new_out
+    next_checkpoint = first_checkpoint if checkpoint_every else float("inf")
+
+    # inertial bookkeeping: generation of the live pending event per signal
+    # and the value it will set (None if nothing is pending)
+    def schedule_inertial(event_time: Time, out: int, new_out: LogicValue):
+        if new_out == pending[out]:
+            return  # already on its way, keep the earlier event
+        generation[out] += 1  # cancels whatever was pending
+        if new_out != values[out] and event_time <= end_time:
+            pending[out] = new_out
+            push((event_time, out, next(order), new_out, generation[out]))
+        else:
+            pending[out] = None
+
+    for event in event_queue.drain(end_time):
+        time, sid, _, new_val, gen = event
+        while time >= next_checkpoint:
+            queued = event_queue.events() + [event]
+            checkpoint = Checkpoint(
+                time=next_checkpoint,
+                values=values[:],
+                gate_events=[(e[0], e[1], e[2], replaced.get(e[:2], e[3]), -1)
+                             if e[4] == -1 else e
+                             for e in queued if e[4] == -1 or e[4] > 0],
+                generation=generation[:],
+                pending=pending[:],
+                history_lengths=[len(ch) for ch in changes],
+                memories=[evals[g].save() for g in netlist.stateful],
+            )
+            if on_checkpoint(checkpoint):
+                return checkpoint
+            next_checkpoint += checkpoint_every
+
+        if gen > 0:
+            if gen != generation[sid]:
+                continue  # superseded by a later evaluation
+            pending[sid] = None
+        elif gen == -1:
+            if replaced:
+                new_val = replaced.pop((time, sid), new_val)
+        elif gen == LAZY_INPUT:
+            following = next(sources[sid], None)
+            if following is not None and following[0] <= end_time:
+                push((following[0], sid, next(order), following[1], LAZY_INPUT))
+        old_val = values[sid]
+        if old_val == new_val:
+            continue
+        values[sid] = new_val
+        if keep_history:
+            changes[sid].append((time, new_val))
+        if on_change is not None:
+            on_change(time, names[sid], new_val)
+
+        # an X or Z (either way) leaves the incremental masks out of step
+        bits_only = (old_val == 0 or old_val == 1) and (new_val == 0 or new_val == 1)
+        for g, bits, table, evaluate, out, delay in fanout[sid]:
+            if table is None:
+                new_out = evaluate(values)
+            else:
+                if bits_only:
+                    mask = masks[g] ^ bits
+                    masks[g] = mask
+                else:
+                    mask = rebuild_mask(g)
+                if uncertain and g in uncertain:
+                    new_out = unknown_output(g)
+                else:
+                    new_out = table[mask]
+            if inertial:
+                schedule_inertial(time + delay, out, new_out)
+            elif new_out != projected[out]:
+                event_time = time + delay
+                if event_time <= end_time:
+                    schedule_transport(event_time, out, new_out)
+
+        # rising edge: 0 -> 1, sample D at clock edge
+        if old_val == 0 and new_val == 1:
+            for d, q, delay in clocked[sid]:
+                d_val = values[d]
+                if inertial:
+                    schedule_inertial(time + delay, q, d_val)
+                elif d_val != projected[q]:
+                    event_time = time + delay
+                    if event_time <= end_time:
+                        schedule_transport(event_time, q, d_val)
+    return None
+
+
+def _build_history(netlist: Netlist,
+                   initial_signals: Dict[str, LogicValue],
+                   changes: List[List[Tuple[Time, LogicValue]]]
+                   ) -> Dict[str, List[Tuple[Time, LogicValue]]]:
+    """
+    Turn the per signal id transition lists back into the name keyed
+    history, in the same key order simulate_circuit produces: initial
+    signals, gate outputs, flip-flop outputs, then any other signal in the
+    order it first changed.
+    """
+    names = netlist.signal_names
+    order = dict.fromkeys(netlist.signal_ids[name] for name in initial_signals)
+    order.update(dict.fromkeys(netlist.gate_outputs))
+    order.update(dict.fromkeys(netlist.dff_q))
+    changed = sorted((sid for sid, ch in enumerate(changes) if ch and sid not in order),
+                     key=lambda sid: changes[sid][0][0])
+    order.update(dict.fromkeys(changed))
+
+    history: Dict[str, List[Tuple[Time, LogicValue]]] = {}
+    for sid in order:
+        name = names[sid]
+        history[name] = [(0, initial_signals.get(name, 0))] + changes[sid]
+    return history
@@ -0,0 +1,213 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Event queues for the compiled event driven simulator.
+
+HeapQueue is the binary heap simulate_circuit has always used. TimingWheel
+is a calendar queue for the usual case of small whole number gate delays:
+events are dropped into the slot for their time in O(1), and a slot is only
+sorted once when the simulation reaches it. Events further away than the
+largest delay (e.g. input transitions far in the future) wait in an
+overflow heap until they come into range.
+
+Both queues take event tuples that start with (time, signal id, push
+order) through push(event) and hand them back through drain(), in the same
+order the heap would pop them. CountingQueue wraps either one to fill in
+the queue counters of a SimStats.
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+# standard libraries
+from bisect import insort
+from functools import partial
+import heapq
+from typing import Iterable, Iterator, List, Tuple
+
+# local files
+from circuit_timing.circuit_timing import LogicValue, SimStats, Time
+
+# (time, signal id, push order, value, generation), see netlist._event_loop
+Event = Tuple[Time, int, int, LogicValue, int]
+
+
+class HeapQueue:
+    """ Binary heap of events. """
+    def __init__(self):
+        self.heap: List[Event] = []
+        # push(event) goes straight to the C heappush
+        self.push = partial(heapq.heappush, self.heap)
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def events(self) -> List[Event]:
+        """ Copy of every queued event, in no particular order. """
+        return list(self.heap)
+
+    def drain(self, end_time: Time) -> Iterator[Event]:
+        """ Pop events in time order until the queue is empty or past end_time. """
+        heap = self.heap
+        heappop = heapq.heappop
+        while heap:
+            event = heappop(heap)
+            if event[0] > end_time:
+                return
+            yield event
+
+
+class TimingWheel:
+    """
+    Calendar queue for whole number event times.
+
+    Parameters
+    ----------
+    max_delay : int
+        Largest delay any event will be scheduled with. The wheel gets a
+        power of two number of slots larger than this, so every slot in
+        the window [now, now + size) holds a single time.
+    """
+    def __init__(self, max_delay: int):
+        self.size = 1 << max(1, int(max_delay)).bit_length()
+        self.mask = self.size - 1
+        self.slots: List[List[Event]] = [[] for _ in range(self.size)]
+        self.now = 0
+        self.in_wheel = 0
+        self.overflow: List[Event] = []
+        # slot being drained and how far drain() has got through it
+        self._bucket: List[Event] = []
+        self._next = 0
+
+    def __len__(self) -> int:
+        return self.in_wheel + len(self.overflow) + len(self._bucket) - self._next
+
+    def events(self) -> List[Event]:
+        """ Copy of every queued event, in no particular order. """
+        events = self._bucket[self._next:] + self.overflow
+        for bucket in self.slots:
+            events.extend(bucket)
+        return events
+
+    def push(self, event: Event):
+        slot_time = int(event[0])
+        if slot_time == self.now and self._bucket:
+            # pushed while its slot is being drained (e.g. a lazy source
+            # with two transitions at the same time): the slot has already
+            # been emptied, so it joins the rest of the bucket in order
+            insort(self._bucket, event, lo=self._next)
+        elif slot_time - self.now < self.size:
+            self.slots[slot_time & self.mask].append(event)
+            self.in_wheel += 1
+        else:
+            heapq.heappush(self.overflow, event)
+
+    def _pull_overflow(self, now: int):
+        """ Move overflow events that are inside the window into their slots. """
+        overflow = self.overflow
+        limit = now + self.size
+        while overflow and overflow[0][0] < limit:
+            event = heapq.heappop(overflow)
+            self.slots[int(event[0]) & self.mask].append(event)
+            self.in_wheel += 1
+
+    def drain(self, end_time: Time) -> Iterator[Event]:
+        """ Pop events in time order until the queue is empty or past end_time. """
+        slots, mask = self.slots, self.mask
+        now = self.now
+        while True:
+            self._pull_overflow(now)
+            if not self.in_wheel:
+                if not self.overflow:
+                    return
+                now = int(self.overflow[0][0])
+                continue
+            if now > end_time:
+                return
+            slot = now & mask
+            bucket = slots[slot]
+            if bucket:
+                slots[slot] = []
+                self.in_wheel -= len(bucket)
+                # every event in the bucket has the same time, so this
+                # gives the heap's (signal id, push order) tie-breaking
+                bucket.sort()
+                self.now = now
+                self._bucket = bucket
+                for self._next, event in enumerate(bucket, 1):
+                    yield event
+                self._bucket, self._next = [], 0
+            now += 1
+
+
+class CountingQueue:
+    """
+    HeapQueue or TimingWheel that counts pushes, pops (up to end_time) and
+    the queue depth into stats as the run goes, the queue part of what
+    simulate_circuit(..., stats=...) counts.
+    """
+    def __init__(self, queue: HeapQueue | TimingWheel, stats: SimStats):
+        self.queue = queue
+        self.stats = stats
+
+    def __len__(self) -> int:
+        return len(self.queue)
+
+    def events(self) -> List[Event]:
+        return self.queue.events()
+
+    def push(self, event: Event):
+        self.queue.push(event)
+        stats = self.stats
+        stats.pushed += 1
+        depth = len(self.queue)
+        if depth > stats.peak_depth:
+            stats.peak_depth = depth
+
+    def drain(self, end_time: Time) -> Iterator[Event]:
+        stats = self.stats
+        for event in self.queue.drain(end_time):
+            stats.popped += 1
+            if stats.popped % stats.sample_every == 0:
+                stats.depth_samples.append((event[0], len(self.queue)))
+            yield event
+
+
+def _is_whole(t: Time) -> bool:
+    return float(t).is_integer()
+
+
+def make_scheduler(kind: str,
+                   delays: Iterable[Time],
+                   event_times: Iterable[Time]) -> HeapQueue | TimingWheel:
+    """
+    Pick the event queue for a simulation.
+
+    Parameters
+    ----------
+    kind : str
+        "heap" or "wheel".
+    delays : iterable of int or float
+        Every gate and flip-flop delay of the netlist.
+    event_times : iterable of int or float
+        Times of the input transitions.
+
+    Returns
+    -------
+    HeapQueue or TimingWheel
+        A TimingWheel only if one is asked for and every delay is a whole
+        number >= 1 and every input time is whole, otherwise a HeapQueue.
+
+    Raises
+    ------
+    ValueError
+        If kind is not a known scheduler.
+    """
+    if kind == "heap":
+        return HeapQueue()
+    if kind != "wheel":
+        raise ValueError(f"Unknown scheduler: {kind}, use 'heap' or 'wheel'")
+    delays = list(delays)
+    if all(_is_whole(d) and d >= 1 for d in delays) and \
+            all(_is_whole(t) and t >= 0 for t in event_times):
+        return TimingWheel(max(delays, default=1))
+    return HeapQueue()
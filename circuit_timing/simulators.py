@@ -0,0 +1,216 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+One interface to every simulation engine.
+
+Each engine takes the same Gate / DFF lists, starting values and input
+transitions and returns a history in the simulate_circuit format, so a
+caller picks the engine per call with simulate(..., engine="compiled"):
+
+    reference      simulate_circuit, the plain heap and dict simulator
+    compiled       simulate_netlist on a compiled Netlist (scheduler and
+                   inertial options), same transitions as the reference
+    cycle          cycle_sim, settled values once per clock period
+    bit_parallel   zero-delay values after every input change, all of them
+                   in one bit-parallel pass with one time point per bit
+
+The first two are exact. The last two have no gate delays (exact_timing is
+False): their histories hold the values the exact engines settle to, which
+is what the conformance test in tests/test_simulators.py checks.
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+# standard libraries
+from abc import ABC, abstractmethod
+from typing import Dict, List, Sequence, Tuple, Type
+
+# installed libraries
+import numpy as np
+
+# local files
+from circuit_timing.bit_parallel import WORD_BITS, gate_word_ops
+from circuit_timing.circuit_timing import DFF, Gate, LogicValue, Time, simulate_circuit
+from circuit_timing.cycle_sim import sample_inputs, simulate_cycles
+from circuit_timing.netlist import compile_netlist, simulate_netlist, topological_order
+from circuit_timing.sources import Transitions, materialize_all
+
+History = Dict[str, List[Tuple[Time, LogicValue]]]
+
+
+class Simulator(ABC):
+    """
+    Base class of the engines, subclasses define simulate().
+
+    Attributes
+    ----------
+    exact_timing : bool
+        True if the history has every transition at its exact time, False
+        for engines that only give settled values.
+    """
+    exact_timing = True
+
+    @abstractmethod
+    def simulate(self, gates: Sequence[Gate],
+                 initial_signals: Dict[str, LogicValue],
+                 input_transitions: Dict[str, Transitions],
+                 end_time: Time,
+                 dffs: Sequence[DFF] = ()) -> History:
+        """ History of the run in the simulate_circuit format. """
+
+
+class ReferenceSimulator(Simulator):
+    """ simulate_circuit, lazy sources are turned into lists first. """
+    def simulate(self, gates, initial_signals, input_transitions, end_time, dffs=()):
+        return simulate_circuit(list(gates), initial_signals,
+                                materialize_all(input_transitions, end_time),
+                                end_time, dffs=dffs)
+
+
+class CompiledSimulator(Simulator):
+    """
+    simulate_netlist on the compiled circuit.
+
+    Parameters
+    ----------
+    scheduler : str, optional
+        "heap" or "wheel".
+    inertial : bool, optional
+        Inertial instead of transport delays, the reference only has
+        transport delays.
+    """
+    def __init__(self, scheduler: str = "heap", inertial: bool = False):
+        self.scheduler = scheduler
+        self.inertial = inertial
+
+    def simulate(self, gates, initial_signals, input_transitions, end_time, dffs=()):
+        netlist = compile_netlist(gates, dffs,
+                                  extra_signals=list(initial_signals) + list(input_transitions))
+        return simulate_netlist(netlist, initial_signals, input_transitions, end_time,
+                                scheduler=self.scheduler, inertial=self.inertial)
+
+
+class CycleSimulator(Simulator):
+    """
+    cycle_sim for single clock synchronous circuits. The clock input is
+    replaced by a clock of the given period, the other inputs are sampled
+    just before each rising edge and the history holds the clock and every
+    signal's value for each cycle from the start of that cycle (see
+    CycleTrace.to_history).
+
+    Parameters
+    ----------
+    period : int or float
+        Clock period, rising edges at every whole period.
+    """
+    exact_timing = False
+
+    def __init__(self, period: Time):
+        self.period = period
+
+    def simulate(self, gates, initial_signals, input_transitions, end_time, dffs=()):
+        clocks = {ff.clk for ff in dffs}
+        if len(clocks) != 1:
+            raise ValueError(f"Cycle based simulation needs one clock, got {sorted(clocks)}")
+        clock, = clocks
+        n_cycles = int(end_time // self.period)
+        data = {name: trans for name, trans in
+                materialize_all(input_transitions, end_time).items() if name != clock}
+        inputs = sample_inputs(data, self.period, n_cycles, initial_signals)
+        state = {name: val for name, val in initial_signals.items() if name != clock}
+        trace = simulate_cycles(gates, dffs, state, inputs, n_cycles)
+        return trace.to_history(self.period, clock=clock)
+
+
+class BitParallelSimulator(Simulator):
+    """
+    Zero-delay values of a combinational circuit after every input change.
+    Every time point where an input changes is one bit of the packed
+    words, so the whole run is a single topological pass of NumPy word
+    operations however many transitions there are.
+    """
+    exact_timing = False
+
+    def simulate(self, gates, initial_signals, input_transitions, end_time, dffs=()):
+        if dffs:
+            raise ValueError("The bit-parallel engine only simulates combinational circuits")
+        transitions = materialize_all(input_transitions, end_time)
+        netlist = compile_netlist(gates, extra_signals=list(initial_signals) + list(transitions))
+        ids, names = netlist.signal_ids, netlist.signal_names
+        driven = set(netlist.gate_outputs)
+        inputs = [name for name in names if ids[name] not in driven]
+        word_ops = gate_word_ops(netlist)
+
+        times = np.unique(np.array([0.0] + [t for trans in transitions.values()
+                                            for t, _ in trans if t <= end_time]))
+        n_points = times.size
+        n_words = -(-n_points // WORD_BITS)
+
+        def pack(bits: np.ndarray) -> np.ndarray:
+            padded = np.zeros(n_words * WORD_BITS, dtype=np.uint8)
+            padded[:n_points] = bits
+            return np.packbits(padded, bitorder="little").view(np.uint64)
+
+        values = {}
+        for name in inputs:
+            points = sorted((tv for tv in transitions.get(name, ()) if tv[0] <= end_time),
+                            key=lambda tv: tv[0])
+            point_times = np.array([t for t, _ in points], dtype=float)
+            levels = np.array([initial_signals.get(name, 0)] + [v for _, v in points],
+                              dtype=np.uint8)
+            values[ids[name]] = pack(levels[np.searchsorted(point_times, times, side="right")])
+        for g in topological_order(netlist):
+            values[netlist.gate_outputs[g]] = word_ops[g](
+                [values[s] for s in netlist.gate_inputs(g)])
+
+        order = list(dict.fromkeys(list(initial_signals) +
+                                   [names[s] for s in netlist.gate_outputs] + inputs))
+        history: History = {}
+        for name in order:
+            bits = np.unpackbits(values[ids[name]].view(np.uint8),
+                                 bitorder="little")[:n_points]
+            changed = np.flatnonzero(bits[1:] != bits[:-1]) + 1
+            history[name] = [(0, int(bits[0]))] + list(
+                zip(times[changed].tolist(), bits[changed].tolist()))
+        return history
+
+
+ENGINES: Dict[str, Type[Simulator]] = {
+    "reference": ReferenceSimulator,
+    "compiled": CompiledSimulator,
+    "cycle": CycleSimulator,
+    "bit_parallel": BitParallelSimulator,
+}
+
+
+def get_simulator(engine: str = "compiled", **options) -> Simulator:
+    """
+    Engine by name, options go to its constructor (e.g. scheduler="wheel"
+    for "compiled", period=50 for "cycle").
+
+    Raises
+    ------
+    ValueError
+        If there is no engine of that name.
+    """
+    engine_class = ENGINES.get(engine)
+    if engine_class is None:
+        raise ValueError(f"Unknown engine: {engine}, use one of {sorted(ENGINES)}")
+    return engine_class(**options)
+
+
+def simulate(gates: Sequence[Gate],
+             initial_signals: Dict[str, LogicValue],
+             input_transitions: Dict[str, Transitions],
+             end_time: Time,
+             dffs: Sequence[DFF] = (),
+             engine: str = "compiled",
+             **options) -> History:
+    """
+    Simulate a circuit with the engine of the given name, see ENGINES.
+
+    returns: dict signal_name -> list of (time, value) transitions
+    suitable for your draw_signals() function
+    """
+    return get_simulator(engine, **options).simulate(
+        gates, initial_signals, input_transitions, end_time, dffs)
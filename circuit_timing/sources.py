@@ -0,0 +1,209 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Lazy stimulus sources.
+
+make_clock(period, n_cycles) builds every clock edge as a tuple before the
+simulation starts, and the simulator then pushes all of them into the
+queue. A Source instead yields its (time, value) transitions one at a time
+and can run forever. simulate_netlist takes a Source anywhere it takes a
+transition list and only pulls the next transition of a source when the
+previous one is popped, so the queue holds one input event per source
+however long the run is.
+
+Every Source can be iterated more than once (each iteration starts again
+at t = 0) and its times never decrease. materialize(end_time) gives
+the plain list for draw_signals() or for code that needs one.
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+# standard libraries
+from abc import ABC, abstractmethod
+from itertools import count, takewhile
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+# local files
+from circuit_timing.circuit_timing import LogicValue, Time
+
+Transitions = Sequence[Tuple[Time, LogicValue]] | Iterable[Tuple[Time, LogicValue]]
+
+
+def _is_whole(t: Time) -> bool:
+    return float(t).is_integer()
+
+
+class Source(ABC):
+    """ Base class, subclasses define _transitions(). """
+    def __iter__(self) -> Iterator[Tuple[Time, LogicValue]]:
+        return self._transitions()
+
+    @abstractmethod
+    def _transitions(self) -> Iterator[Tuple[Time, LogicValue]]:
+        """ Generator of the (time, value) transitions from t = 0. """
+
+    def times_are_whole(self) -> bool:
+        """ True if every transition time is a whole number (for the timing wheel). """
+        return False
+
+    def materialize(self, end_time: Time) -> List[Tuple[Time, LogicValue]]:
+        """ List of the transitions up to and including end_time. """
+        return list(takewhile(lambda point: point[0] <= end_time, self))
+
+
+class Clock(Source):
+    """
+    Square wave with the same edges as make_clock: start_level at t = 0,
+    the other level from period / 2 and back at every whole period.
+
+    Parameters
+    ----------
+    period : int or float
+    start_level : int, optional
+        Level at t = 0, default 1.
+    n_cycles : int, optional
+        Stop after this many cycles, default run forever.
+    """
+    def __init__(self, period: Time, start_level: LogicValue = 1,
+                 n_cycles: int | None = None):
+        self.period = period
+        self.start_level = start_level
+        self.n_cycles = n_cycles
+
+    def _transitions(self) -> Iterator[Tuple[Time, LogicValue]]:
+        period, level = self.period, self.start_level
+        half = period / 2
+        yield 0, level
+        cycles = count() if self.n_cycles is None else range(self.n_cycles)
+        for i in cycles:
+            yield i * period + half, 1 - level
+            yield (i + 1) * period, level
+
+    def times_are_whole(self) -> bool:
+        return _is_whole(self.period / 2)
+
+
+class Periodic(Source):
+    """
+    Base for sources that give one value per period, only yielding changes.
+    The first value holds from t = 0 and the next ones start at start_time
+    (default one period) and then every period.
+    """
+    def __init__(self, period: Time, start_time: Time | None = None):
+        self.period = period
+        self.start_time = period if start_time is None else start_time
+
+    @abstractmethod
+    def _values(self) -> Iterator[LogicValue]:
+        """ Generator of the value of each period. """
+
+    def _transitions(self) -> Iterator[Tuple[Time, LogicValue]]:
+        period, start = self.period, self.start_time
+        last = None
+        for k, value in enumerate(self._values()):
+            if value != last:
+                yield (start + (k - 1) * period if k else 0), value
+                last = value
+
+    def times_are_whole(self) -> bool:
+        return _is_whole(self.period) and _is_whole(self.start_time)
+
+
+class LFSR(Periodic):
+    """
+    Pseudo random bit sequence from a Fibonacci linear feedback shift
+    register, one bit per period.
+
+    Parameters
+    ----------
+    period : int or float
+    taps : tuple of int, optional
+        Feedback taps, 1 indexed, the first being the register length.
+        Default (7, 6), the PRBS7 polynomial x^7 + x^6 + 1.
+    seed : int, optional
+        Starting register contents, must not be 0.
+    """
+    def __init__(self, period: Time, taps: Tuple[int, ...] = (7, 6), seed: int = 1,
+                 start_time: Time | None = None):
+        super().__init__(period, start_time)
+        self.taps = taps
+        self.n_bits = max(taps)
+        self.seed = seed & ((1 << self.n_bits) - 1)
+        if not self.seed:
+            raise ValueError("An LFSR seed must have at least one bit set")
+
+    def _values(self) -> Iterator[LogicValue]:
+        state, n = self.seed, self.n_bits
+        while True:
+            yield state & 1
+            feedback = 0
+            for tap in self.taps:
+                feedback ^= (state >> (n - tap)) & 1
+            state = (state >> 1) | (feedback << (n - 1))
+
+
+class Counter(Periodic):
+    """
+    One bit of a binary counter that counts up once per period.
+
+    Parameters
+    ----------
+    period : int or float
+    bit : int
+        Bit of the count to output, 0 for the LSB.
+    start : int, optional
+        Count at t = 0.
+    """
+    def __init__(self, period: Time, bit: int, start: int = 0,
+                 start_time: Time | None = None):
+        super().__init__(period, start_time)
+        self.bit = bit
+        self.start = start
+
+    def _values(self) -> Iterator[LogicValue]:
+        for k in count(self.start):
+            yield (k >> self.bit) & 1
+
+
+def counter_sources(names: Sequence[str], period: Time, start: int = 0) -> Dict[str, Counter]:
+    """ Sources for every bit of a counter, names given LSB first. """
+    return {name: Counter(period, bit, start) for bit, name in enumerate(names)}
+
+
+class Pattern(Periodic):
+    """
+    Step through a list of values, one per period.
+
+    Parameters
+    ----------
+    values : sequence of int
+    period : int or float
+    repeat : bool, optional
+        Start again at the first value after the last one (default), else
+        hold the last value.
+    """
+    def __init__(self, values: Sequence[LogicValue], period: Time, repeat: bool = True,
+                 start_time: Time | None = None):
+        super().__init__(period, start_time)
+        self.values = list(values)
+        self.repeat = repeat
+
+    def _values(self) -> Iterator[LogicValue]:
+        if self.repeat:
+            while self.values:
+                yield from self.values
+        else:
+            yield from self.values
+
+
+def is_lazy(transitions: Transitions) -> bool:
+    """ True for a Source or other iterator, False for a list, tuple or Waveform. """
+    return not isinstance(transitions, Sequence)
+
+
+def materialize_all(input_transitions: Dict[str, Transitions],
+                    end_time: Time) -> Dict[str, List[Tuple[Time, LogicValue]]]:
+    """ Replace every lazy source by its list of transitions up to end_time. """
+    return {name: (list(takewhile(lambda point: point[0] <= end_time, trans))
+                   if is_lazy(trans) else trans)
+            for name, trans in input_transitions.items()}
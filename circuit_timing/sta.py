@@ -0,0 +1,256 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Static timing analysis of Gate / DFF netlists.
+
+One pass over the gates in topological order gives the earliest and latest
+arrival time of every signal. Paths start at the primary inputs (arrival
+set by input_arrival) and at the flip-flop outputs (arrival = clk->Q delay)
+and end at the flip-flop D inputs and at the primary outputs. The longest
+of these paths sets the minimum clock period, so "what is the maximum clock
+frequency" questions can be answered without picking input transitions and
+reading a simulate_circuit waveform.
+
+period_sweep() checks the same question by simulation: it runs the circuit
+with random data for many cycles at each clock period on the compiled
+engine and counts the setup / hold violations check_timing finds in the
+history, the ones simulate_circuit reports, giving the failure rate against
+the clock period.
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+# standard libraries
+from dataclasses import dataclass, field
+import random
+from typing import Dict, List, Sequence, Tuple
+
+# local files
+from circuit_timing.circuit_timing import (DFF, Gate, LogicValue, Time, TimingViolation,
+                                           check_timing)
+from circuit_timing.netlist import compile_netlist, simulate_netlist, topological_order
+
+
+@dataclass
+class TimingReport:
+    earliest: Dict[str, Time]              # shortest path arrival per signal
+    latest: Dict[str, Time]                # longest path arrival per signal
+    endpoints: Dict[str, Time]             # latest arrival at each path end point
+    critical_path: List[Tuple[str, Time]]  # (signal, arrival) from start to end
+    clock_period: Time | None = None
+    setup: Dict[str, Time] = field(default_factory=dict)  # D end point -> setup time
+    hold: Dict[str, Time] = field(default_factory=dict)   # D end point -> hold time
+
+    @property
+    def critical_delay(self) -> Time:
+        return self.critical_path[-1][1] if self.critical_path else 0
+
+    @property
+    def min_period(self) -> Time:
+        """ Shortest clock period that meets every setup time. """
+        return max((t + self.setup.get(name, 0) for name, t in self.endpoints.items()),
+                   default=0)
+
+    @property
+    def max_frequency(self) -> float:
+        """ 1 / min_period, in 1 / (time unit), e.g. THz for ps. """
+        return 1 / self.min_period if self.min_period else float("inf")
+
+    @property
+    def slack(self) -> Dict[str, Time]:
+        """ Clock period minus the latest arrival and the setup time at each end point. """
+        if self.clock_period is None:
+            raise ValueError("Slack needs a clock_period")
+        return {name: self.clock_period - t - self.setup.get(name, 0)
+                for name, t in self.endpoints.items()}
+
+    @property
+    def hold_slack(self) -> Dict[str, Time]:
+        """ Earliest arrival minus the hold time at each flip-flop D input. """
+        return {name: self.earliest[name] - hold for name, hold in self.hold.items()}
+
+    @property
+    def worst_slack(self) -> Time:
+        return min(self.slack.values(), default=self.clock_period)
+
+
+def static_timing(gates: Sequence[Gate],
+                  dffs: Sequence[DFF] = (),
+                  clock_period: Time | None = None,
+                  input_arrival: Dict[str, Time] | None = None) -> TimingReport:
+    """
+    Compute arrival times, the critical path and slack of a netlist.
+
+    Parameters
+    ----------
+    gates : sequence of Gate
+        Combinational gates with their propagation delays.
+    dffs : sequence of DFF, optional
+        Flip-flops; their Q outputs launch paths at their clk->Q delay and
+        their D inputs end paths, which need their setup time before the
+        next edge and their hold time after this one.
+    clock_period : int or float, optional
+        Clock period used for the slack.
+    input_arrival : dict, optional
+        Arrival time of primary inputs, default 0 for every input.
+
+    Returns
+    -------
+    TimingReport
+
+    Raises
+    ------
+    ValueError
+        If the gates form a combinational loop.
+    """
+    netlist = compile_netlist(gates, dffs)
+    names = netlist.signal_names
+    n_signals = netlist.n_signals
+    input_arrival = input_arrival or {}
+
+    driven = set(netlist.gate_outputs)
+    latest: List[Time | None] = [None] * n_signals
+    earliest: List[Time | None] = [None] * n_signals
+    for s in range(n_signals):
+        if s not in driven:
+            latest[s] = earliest[s] = input_arrival.get(names[s], 0)
+    for q, delay in zip(netlist.dff_q, netlist.dff_delays):
+        latest[q] = earliest[q] = delay
+
+    # the input on the longest path into each signal, to trace it back
+    critical_input: List[int | None] = [None] * n_signals
+    for g in topological_order(netlist):
+        ins = netlist.gate_inputs(g)
+        out = netlist.gate_outputs[g]
+        delay = netlist.gate_delays[g]
+        worst = max(ins, key=lambda s: latest[s])
+        late = latest[worst] + delay
+        early = min(earliest[s] for s in ins) + delay
+        if latest[out] is None or late > latest[out]:
+            latest[out] = late
+            critical_input[out] = worst
+        if earliest[out] is None or early < earliest[out]:
+            earliest[out] = early
+
+    end_ids = list(dict.fromkeys(netlist.dff_d))
+    end_ids += [s for s in dict.fromkeys(netlist.gate_outputs)
+                if not netlist.fanout(s) and s not in end_ids]
+    endpoints = {names[s]: latest[s] for s in end_ids}
+    # a D input shared by several flip-flops needs the largest window
+    setup: Dict[str, Time] = {}
+    hold: Dict[str, Time] = {}
+    for ff in dffs:
+        if ff.setup:
+            setup[ff.d] = max(setup.get(ff.d, 0), ff.setup)
+        if ff.hold:
+            hold[ff.d] = max(hold.get(ff.d, 0), ff.hold)
+
+    critical_path = []
+    if end_ids:
+        s = max(end_ids, key=lambda s: latest[s] + setup.get(names[s], 0))
+        while s is not None:
+            critical_path.append((names[s], latest[s]))
+            s = critical_input[s]
+        critical_path.reverse()
+
+    return TimingReport(
+        earliest={names[s]: t for s, t in enumerate(earliest) if t is not None},
+        latest={names[s]: t for s, t in enumerate(latest) if t is not None},
+        endpoints=endpoints,
+        critical_path=critical_path,
+        clock_period=clock_period,
+        setup=setup,
+        hold=hold,
+    )
+
+
+@dataclass
+class SweepPoint:
+    """ Result of period_sweep() for one clock period. """
+    period: Time
+    n_cycles: int
+    violations: List[TimingViolation]
+    failed_cycles: int        # cycles with at least one violation
+
+    @property
+    def failure_rate(self) -> float:
+        return self.failed_cycles / self.n_cycles
+
+
+def _random_data(names: Sequence[str], period: Time, n_cycles: int,
+                 input_delay: Time | None, rng: random.Random,
+                 initial: Dict[str, LogicValue]) -> Dict[str, List[Tuple[Time, LogicValue]]]:
+    """ Every input toggles in a cycle with probability 1/2. """
+    transitions = {}
+    for name in names:
+        level = initial.get(name, 0)
+        points = []
+        for k in range(n_cycles):
+            if rng.random() < 0.5:
+                offset = rng.uniform(0, period) if input_delay is None else input_delay
+                level ^= 1
+                points.append((k * period + offset, level))
+        transitions[name] = points
+    return transitions
+
+
+def period_sweep(gates: Sequence[Gate],
+                 dffs: Sequence[DFF],
+                 periods: Sequence[Time],
+                 data_inputs: Sequence[str],
+                 n_cycles: int = 1000,
+                 initial_signals: Dict[str, LogicValue] | None = None,
+                 input_delay: Time | None = 0,
+                 seed: int = 0) -> List[SweepPoint]:
+    """
+    Simulate n_cycles of random data at each clock period and count the
+    setup / hold violations.
+
+    Parameters
+    ----------
+    gates, dffs : sequence of Gate / DFF
+        The circuit, every flip-flop on the same clock. Give the flip-flops
+        setup and hold times, a window of 0 is never violated.
+    periods : sequence of int or float
+        Clock periods to try, the clock starts high and rises at every whole
+        period.
+    data_inputs : sequence of str
+        Primary inputs that get random data, each toggling in a cycle with
+        probability 1/2.
+    n_cycles : int, optional
+    initial_signals : dict, optional
+        Starting values, the clock is set to 1.
+    input_delay : int, float or None, optional
+        Time after the rising edge the inputs change, as if they came from
+        flip-flops on the same clock (default 0). None changes them at a
+        random time in the cycle, like an asynchronous input.
+    seed : int, optional
+        Seed of the data, the same for every period.
+
+    Returns
+    -------
+    list of SweepPoint, one per period
+
+    Raises
+    ------
+    ValueError
+        If the flip-flops are not all on one clock.
+    """
+    clocks = {ff.clk for ff in dffs}
+    if len(clocks) != 1:
+        raise ValueError(f"period_sweep needs one clock, got {sorted(clocks)}")
+    clock, = clocks
+    initial = dict(initial_signals or {}, **{clock: 1})
+    netlist = compile_netlist(gates, dffs,
+                              extra_signals=list(initial) + list(data_inputs) + [clock])
+    points = []
+    for period in periods:
+        transitions = _random_data(data_inputs, period, n_cycles, input_delay,
+                                   random.Random(seed), initial)
+        transitions[clock] = [(t, v) for k in range(n_cycles)
+                              for t, v in ((k * period + period / 2, 0), ((k + 1) * period, 1))]
+        history = simulate_netlist(netlist, initial, transitions, n_cycles * period)
+        violations = check_timing(history, dffs)
+        failed = {round(v.edge_time / period) for v in violations}
+        points.append(SweepPoint(period, n_cycles, violations, len(failed)))
+    return points
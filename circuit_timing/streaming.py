@@ -0,0 +1,131 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Consume a simulation while it runs instead of after it.
+
+stream() yields every committed (time, signal_name, value) transition in
+time order as the reference simulator gets to it (see
+circuit_timing.iter_circuit). It is pull based: the simulation only moves
+on when the consumer asks for the next transition, so a slow consumer is
+its own backpressure and no history is built up. The helpers reshape the
+stream for the usual consumers:
+
+    for t, name, value in stream(...):          # e.g. to a VCD file
+        vcd.change(t, name, value)
+
+    for t, changes in iter_steps(stream(...)):  # one animation frame per time
+        ...
+
+    q = (s["Q"] for s in sample_stream(stream(...), ["Q"], period=10))
+    DigitalSignal(period=1).draw_stream(q, scene)   # manim, drawn as it comes
+
+    async for t, name, value in astream(..., time_scale=0.01):
+        ...                                     # 10 ms of wall time per ps
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+# standard libraries
+import asyncio
+from typing import AsyncIterator, Dict, Iterable, Iterator, Sequence, Tuple
+
+# local files
+from circuit_timing.circuit_timing import DFF, Gate, LogicValue, Time, iter_circuit
+from circuit_timing.sources import Transitions
+
+Transition = Tuple[Time, str, LogicValue]
+
+
+def stream(gates: Sequence[Gate],
+           initial_signals: Dict[str, LogicValue],
+           input_transitions: Dict[str, Transitions],
+           end_time: Time,
+           dffs: Sequence[DFF] = ()) -> Iterator[Transition]:
+    """
+    Committed transitions of a run, in time order, one at a time. Inputs
+    can be transition lists or lazy sources (sources.Clock etc.), which are
+    only read as far as the run gets.
+    """
+    return iter_circuit(list(gates), initial_signals, input_transitions, end_time, dffs=dffs)
+
+
+def iter_steps(transitions: Iterable[Transition]) -> Iterator[Tuple[Time, Dict[str, LogicValue]]]:
+    """
+    Group a transition stream by time: (time, {signal_name: value}) for
+    every time something changed. A signal that changes twice at the same
+    time keeps its last value.
+    """
+    step_time = None
+    changes: Dict[str, LogicValue] = {}
+    for time, name, value in transitions:
+        if time != step_time and changes:
+            yield step_time, changes
+            changes = {}
+        step_time = time
+        changes[name] = value
+    if changes:
+        yield step_time, changes
+
+
+def sample_stream(transitions: Iterable[Transition],
+                  signals: Sequence[str],
+                  period: Time,
+                  initial_signals: Dict[str, LogicValue] | None = None,
+                  end_time: Time | None = None) -> Iterator[Dict[str, LogicValue]]:
+    """
+    Values of signals at t = 0, period, 2 * period, ... as a stream of
+    {signal_name: value} dicts, each one given out as soon as the stream has
+    passed its time (a transition at the sample time counts). This is the
+    list of levels DigitalSignal.draw takes, one sample per step.
+
+    Without end_time the samples stop at the last transition.
+    """
+    if period <= 0:
+        raise ValueError("period must be positive")
+    wanted = set(signals)
+    values = {name: (initial_signals or {}).get(name, 0) for name in signals}
+    k = 0
+    for time, name, value in transitions:
+        while k * period < time:
+            yield dict(values)
+            k += 1
+        if name in wanted:
+            values[name] = value
+    while end_time is not None and k * period <= end_time:
+        yield dict(values)
+        k += 1
+
+
+async def astream(gates: Sequence[Gate],
+                  initial_signals: Dict[str, LogicValue],
+                  input_transitions: Dict[str, Transitions],
+                  end_time: Time,
+                  dffs: Sequence[DFF] = (),
+                  time_scale: float | None = None,
+                  yield_every: int = 64) -> AsyncIterator[Transition]:
+    """
+    Async version of stream() for asyncio programs (live plots, servers).
+
+    Parameters
+    ----------
+    time_scale : float, optional
+        Wall clock seconds per simulation time unit. If given, each
+        transition is held back until its time comes, so the run plays out
+        in (scaled) real time.
+    yield_every : int, optional
+        Without time_scale, hand control back to the event loop after this
+        many transitions so other tasks keep running.
+
+    The simulation only advances while the consumer awaits the next
+    transition, so it never runs ahead of a slow consumer.
+    """
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for k, (time, name, value) in enumerate(
+            stream(gates, initial_signals, input_transitions, end_time, dffs)):
+        if time_scale is not None:
+            delay = start + time * time_scale - loop.time()
+            await asyncio.sleep(max(delay, 0))
+        elif k % yield_every == yield_every - 1:
+            await asyncio.sleep(0)
+        yield time, name, value
@@ -0,0 +1,185 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Propagate whole Boolean functions through a Gate netlist.
+
+Every signal is a Python int of 2^n bits over the n primary inputs, bit r
+being the value of the signal in truth table row r (first input as the MSB,
+the minterm numbering TruthTable, KarnaughMap and make_data_set use). One
+topological pass gives the function of every internal node and output, so
+the minterms for make_data_set(minterms=...) or TruthTable(minterms=...)
+come straight from a circuit without going through sympy, and two
+netlists are equivalent when the XOR of their output functions is 0.
+
+bit_parallel.exhaustive_truth_table does the same with NumPy words and is
+the better choice for many inputs; Python ints are simpler to hash, compare
+and pass around for the small circuits used in class.
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+# standard libraries
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# local files
+from circuit_timing.cells import table_op
+from circuit_timing.circuit_timing import Gate
+from circuit_timing.netlist import check_driven, compile_netlist, topological_order
+
+
+def input_function(n_inputs: int, position: int) -> int:
+    """
+    Function of one input as a 2^n_inputs bit int.
+
+    Parameters
+    ----------
+    n_inputs : int
+        Number of inputs.
+    position : int
+        Index of the input, 0 being the MSB (first column of the table).
+    """
+    half = 1 << (n_inputs - 1 - position)  # rows per run of 0s or 1s
+    ones = ((1 << half) - 1) << half
+    period = 2 * half
+    # repeat the 0...01...1 block every `period` rows
+    repeat = ((1 << (1 << n_inputs)) - 1) // ((1 << period) - 1)
+    return ones * repeat
+
+
+def _int_op(gate_type: str, table: bytes | None, full: int) -> Callable[[List[int]], int]:
+    """ Function of the input ints for one gate type. """
+    if gate_type in ("AND", "NAND"):
+        def op(ins):
+            out = full
+            for x in ins:
+                out &= x
+            return out
+    elif gate_type in ("OR", "NOR"):
+        def op(ins):
+            out = 0
+            for x in ins:
+                out |= x
+            return out
+    elif gate_type in ("XOR", "XNOR"):
+        def op(ins):
+            out = 0
+            for x in ins:
+                out ^= x
+            return out
+    elif gate_type == "NOT":
+        return lambda ins: ins[0] ^ full
+    elif gate_type == "BUF":
+        return lambda ins: ins[0]
+    elif table is not None:
+        return table_op(table, full)
+    else:
+        raise ValueError(f"No symbolic operation for gate type: {gate_type}")
+    if gate_type in ("NAND", "NOR", "XNOR"):
+        return lambda ins: op(ins) ^ full
+    return op
+
+
+def _bits(function: int) -> List[int]:
+    """ Indexes of the set bits of function, lowest first. """
+    return [i for i, c in enumerate(reversed(bin(function)[2:])) if c == "1"]
+
+
+@dataclass
+class SymbolicTable:
+    """
+    Function of every signal of a circuit over its primary inputs.
+
+    functions[name] has bit r set where `name` is 1 in truth table row r.
+    """
+    inputs: Tuple[str, ...]
+    functions: Dict[str, int]
+
+    @property
+    def n_rows(self) -> int:
+        return 1 << len(self.inputs)
+
+    def minterms(self, signal: str) -> List[int]:
+        """ Rows where signal is 1, for make_data_set or TruthTable. """
+        return _bits(self.functions[signal])
+
+    def maxterms(self, signal: str) -> List[int]:
+        """ Rows where signal is 0. """
+        return _bits(self.functions[signal] ^ ((1 << self.n_rows) - 1))
+
+    def minterm_lists(self, signals: Sequence[str]) -> List[List[int]]:
+        """ Minterms of several outputs, for a multi-output TruthTable. """
+        return [self.minterms(name) for name in signals]
+
+    def column(self, signal: str) -> List[int]:
+        """ Value of signal in every row, 0 or 1. """
+        function = self.functions[signal]
+        return [(function >> r) & 1 for r in range(self.n_rows)]
+
+
+def symbolic_functions(gates: Iterable[Gate], inputs: Sequence[str]) -> SymbolicTable:
+    """
+    Compute the function of every signal of a combinational netlist.
+
+    Parameters
+    ----------
+    gates : iterable of Gate
+        The combinational gates, delays are ignored.
+    inputs : sequence of str
+        Primary inputs in MSB..LSB order.
+
+    Returns
+    -------
+    SymbolicTable
+
+    Raises
+    ------
+    ValueError
+        If a gate reads a signal that is neither an input nor driven by a
+        gate, the gates form a loop, or a gate type has no operation.
+    """
+    netlist = compile_netlist(gates, extra_signals=inputs)
+    check_driven(netlist, inputs)
+    n_inputs = len(inputs)
+    full = (1 << (1 << n_inputs)) - 1
+    ops = [_int_op(gate_type, table, full)
+           for gate_type, table in zip(netlist.gate_types, netlist.gate_tables)]
+
+    names = netlist.signal_names
+    values: Dict[int, int] = {netlist.signal_ids[name]: input_function(n_inputs, i)
+                              for i, name in enumerate(inputs)}
+    for g in topological_order(netlist):
+        values[netlist.gate_outputs[g]] = ops[g]([values[s] for s in netlist.gate_inputs(g)])
+    return SymbolicTable(inputs=tuple(inputs),
+                         functions={names[s]: f for s, f in values.items()})
+
+
+def find_differences(gates: Iterable[Gate],
+                     reference: Iterable[Gate],
+                     inputs: Sequence[str],
+                     outputs: Sequence[str]) -> Dict[str, List[int]]:
+    """
+    Compare a netlist (e.g. a student's) with a reference one.
+
+    Returns
+    -------
+    dict
+        output name -> rows where the two circuits give different values,
+        only for outputs that differ (empty if the circuits are equivalent).
+    """
+    ours = symbolic_functions(gates, inputs).functions
+    theirs = symbolic_functions(reference, inputs).functions
+    differences = {}
+    for name in outputs:
+        diff = ours[name] ^ theirs[name]
+        if diff:
+            differences[name] = _bits(diff)
+    return differences
+
+
+def equivalent(gates: Iterable[Gate],
+               reference: Iterable[Gate],
+               inputs: Sequence[str],
+               outputs: Sequence[str]) -> bool:
+    """ True if both netlists compute the same outputs for every input. """
+    return not find_differences(gates, reference, inputs, outputs)
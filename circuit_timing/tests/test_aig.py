@@ -0,0 +1,142 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Check the expression to AIG compiler shares, folds and simulates correctly
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+
+from dataclasses import dataclass
+from itertools import product
+import random
+import unittest
+
+from circuit_timing.aig import AIG, compile_expressions
+from circuit_timing.circuit_timing import simulate_circuit
+from circuit_timing.simulators import simulate
+from circuit_timing.symbolic import symbolic_functions
+
+try:
+    from schematic_makers.schem_from_eqn_generator import parse_expr, random_expr
+except ImportError:  # schemdraw is not installed
+    parse_expr = random_expr = None
+
+
+# stand ins with the same attributes as the schem_from_eqn_generator nodes
+@dataclass
+class Var:
+    name: str
+    inv: bool = False
+
+
+@dataclass
+class Unary:
+    op: str
+    child: object
+
+
+@dataclass
+class Binary:
+    op: str
+    left: object
+    right: object
+
+
+A, B, C = Var("A"), Var("B"), Var("C")
+
+
+def python_value(expr, values):
+    if isinstance(expr, Var):
+        return values[expr.name] ^ int(expr.inv)
+    if isinstance(expr, Unary):
+        return python_value(expr.child, values) ^ 1
+    left, right = python_value(expr.left, values), python_value(expr.right, values)
+    return {"AND": left & right, "OR": left | right, "XOR": left ^ right}[expr.op]
+
+
+def random_tree(rng, depth):
+    if depth == 0 or rng.random() < 0.2:
+        return Var(rng.choice("ABCD"))
+    if rng.random() < 0.25:
+        return Unary("NOT", random_tree(rng, depth - 1))
+    return Binary(rng.choice(["AND", "OR", "XOR"]), random_tree(rng, depth - 1),
+                  random_tree(rng, depth - 1))
+
+
+class TestAIG(unittest.TestCase):
+    def test_structural_hashing(self):
+        aig = AIG()
+        ab = Binary("AND", A, B)
+        aig.add_output("F", Binary("OR", ab, Binary("AND", B, A)))
+        aig.add_output("G", Binary("AND", Binary("AND", A, B), C))
+        # A & B once, shared by both outputs, plus (A & B) & C
+        self.assertEqual(aig.n_gates, 2)
+        self.assertEqual(aig.outputs["F"], aig.and_(aig.input("A"), aig.input("B")))
+
+    def test_constant_folding(self):
+        gates, constants = compile_expressions({
+            "ZERO": Binary("AND", A, Unary("NOT", A)),
+            "ONE": Binary("OR", Var("A", inv=True), A),
+            "SAME": Binary("XOR", Binary("AND", A, 1), 0),
+            "K": Binary("AND", 1, Binary("OR", 0, C)),
+        })
+        self.assertEqual(constants, {"ZERO": 0, "ONE": 1})
+        self.assertEqual([(g.gate_type, g.inputs, g.output) for g in gates],
+                         [("BUF", ["A"], "SAME"), ("BUF", ["C"], "K")])
+
+    def test_cell_mapping(self):
+        gates, _ = compile_expressions({"F": Binary("OR", A, B), "G": Unary("NOT", A)},
+                                       delays={"OR": 5})
+        self.assertEqual([(g.gate_type, g.inputs, g.output, g.delay) for g in gates],
+                         [("NOT", ["A"], "G", 1), ("OR", ["A", "B"], "F", 5)])
+
+    def test_random_expressions_simulate(self):
+        rng = random.Random(5)
+        for keep_xor in (False, True):
+            exprs = {f"F{k}": random_tree(rng, 4) for k in range(6)}
+            aig = AIG(keep_xor=keep_xor)
+            for name, expr in exprs.items():
+                aig.add_output(name, expr)
+            gates, constants = aig.to_gates()
+            inputs = list("ABCD")
+            outputs = [name for name in exprs if name not in constants]
+            table = symbolic_functions(gates, inputs) if gates else None
+            for row, bits in enumerate(product((0, 1), repeat=4)):
+                values = dict(zip(inputs, bits))
+                expected = {name: python_value(expr, values) for name, expr in exprs.items()}
+                self.assertEqual(aig.evaluate(values), expected)
+                for name in outputs:
+                    self.assertEqual(table.column(name)[row], expected[name], (name, row))
+                for name, value in constants.items():
+                    self.assertEqual(expected[name], value)
+
+    def test_gates_run_in_simulate_circuit(self):
+        gates, _ = compile_expressions({"F": Binary("OR", Binary("AND", A, B), Unary("NOT", C))})
+        # start from the settled state, the NOT of C is 1
+        settled = {name: points[0][1] for name, points in
+                   simulate(gates, {"A": 0, "B": 0, "C": 0}, {}, 0, engine="bit_parallel").items()}
+        self.assertEqual(settled["F"], 1)
+        history = simulate_circuit(gates, settled,
+                                   {"C": [(5, 1)], "A": [(10, 1)], "B": [(20, 1)]}, 60)
+        self.assertEqual([v for _, v in history["F"]], [1, 0, 1])
+
+    def test_bad_node(self):
+        with self.assertRaises(ValueError):
+            AIG().add_expr(Binary("NAND", A, B))
+        with self.assertRaises(ValueError):
+            AIG().add_expr(2)
+
+    @unittest.skipIf(parse_expr is None, "schemdraw is not installed")
+    def test_schematic_expressions(self):
+        aig = AIG()
+        lit = aig.add_output("F", parse_expr("A & (B | C') ^ ~D"))
+        self.assertEqual(aig.add_expr(parse_expr("(A*(B+!C)) ^ !D")), lit)
+        random.seed(7)
+        before = aig.n_gates
+        aig.add_output("R", random_expr(variables=("A", "B", "C", "D"), max_depth=4))
+        self.assertGreaterEqual(aig.n_gates, before)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Check the bit-parallel truth tables against plain integer arithmetic
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+
+import unittest
+
+from circuit_timing.bit_parallel import exhaustive_truth_table
+from circuit_timing.circuit_timing import Gate
+from circuit_timing.generators import ripple_adder
+
+
+class TestExhaustiveTruthTable(unittest.TestCase):
+    def test_small_table(self):
+        gates = [Gate("G1", "AND", ["A", "B"], "X", 1),
+                 Gate("G2", "NOR", ["X", "C"], "F", 1)]
+        table = exhaustive_truth_table(gates, ["A", "B", "C"])
+        self.assertEqual(table.outputs, ("F",))
+        # F = (AB + C)'
+        self.assertEqual(table.minterms(), [0, 2, 4])
+
+    def test_adder_columns(self):
+        n = 4
+        inputs = [f"A{i}" for i in reversed(range(n))] + \
+                 [f"B{i}" for i in reversed(range(n))] + ["C0"]
+        outputs = [f"S{i}" for i in range(n)] + [f"C{n}"]
+        table = exhaustive_truth_table(ripple_adder(n), inputs, outputs)
+        columns = {name: table.column(name) for name in outputs}
+        for row in range(table.n_rows):
+            a, b, c = row >> (n + 1), (row >> 1) & (2 ** n - 1), row & 1
+            total = a + b + c
+            for i in range(n):
+                self.assertEqual(columns[f"S{i}"][row], (total >> i) & 1)
+            self.assertEqual(columns[f"C{n}"][row], total >> n)
+
+    def test_undriven_signal(self):
+        with self.assertRaises(ValueError):
+            exhaustive_truth_table([Gate("G1", "AND", ["A", "B"], "X", 1)], ["A"])
+
+    def test_cell_from_table(self):
+        # Y = D1 if S else D0, S is the MSB of the row number
+        table = exhaustive_truth_table([Gate("M", "MUX", ["S", "D0", "D1"], "Y", 1)],
+                                       ["S", "D0", "D1"])
+        self.assertEqual(table.minterms(), [2, 3, 5, 7])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Check word gates and bus registers in the event driven simulator
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+
+import unittest
+
+from circuit_timing.buses import WordGate, signal_widths
+from circuit_timing.circuit_timing import DFF
+from circuit_timing.logic4 import X, Z
+from circuit_timing.memory import ram
+from circuit_timing.netlist import compile_netlist, simulate_netlist
+from circuit_timing.simulators import simulate
+from circuit_timing.sources import Clock
+
+
+class TestBuses(unittest.TestCase):
+    # 8-bit accumulator: ACC <= ACC + IN, or IN when LOAD is 1
+    GATES = [
+        WordGate("ADD", "ADD", ["ACC", "IN"], "SUM", 4, width=8),
+        WordGate("MUX", "MUX", ["LOAD", "SUM", "IN"], "D", 2, width=8),
+    ]
+    DFFS = [DFF("REG", "D", "CLK", "ACC", 1)]
+
+    def test_accumulator(self):
+        netlist = compile_netlist(self.GATES, self.DFFS)
+        self.assertEqual(netlist.gate_types, ("ADD[8]", "MUX[8]"))
+        self.assertEqual(netlist.gate_tables, (None, None))
+        initial = {"CLK": 1, "LOAD": 1, "IN": 0x90, "D": 0x90}
+        transitions = {"CLK": Clock(20), "LOAD": [(25, 0)]}
+        hist = simulate_netlist(netlist, initial, transitions, 75)
+        # loads 0x90 at 20, then adds 0x90 at 40 and 60, wrapping at 8 bits
+        self.assertEqual(hist["ACC"], [(0, 0), (21, 0x90), (41, 0x20), (61, 0xB0)])
+        self.assertEqual(signal_widths(self.GATES, self.DFFS),
+                         {"ACC": 8, "IN": 8, "SUM": 8, "D": 8})
+
+    def test_word_ops(self):
+        gates = [WordGate("S", "SUB", ["A", "B"], "DIFF", 1, width=4),
+                 WordGate("N", "NOT", ["A"], "NA", 1, width=4),
+                 WordGate("X", "XOR", ["A", "B", "C"], "X", 1, width=4),
+                 WordGate("E", "EQ", ["A", "B"], "SAME", 1, width=4),
+                 WordGate("I", "INC", ["B"], "B1", 1, width=4),
+                 WordGate("C", "ADD", ["A", "B", "CIN"], "SUM", 1, width=4)]
+        initial = {"A": 0, "B": 0, "C": 0, "CIN": 0}
+        transitions = {"A": [(5, 3)], "B": [(5, 5)], "C": [(5, 1)], "CIN": [(5, 1)]}
+        hist = simulate_netlist(compile_netlist(gates), initial, transitions, 10)
+        final = {name: points[-1][1] for name, points in hist.items()}
+        self.assertEqual((final["DIFF"], final["NA"], final["X"], final["SAME"],
+                          final["B1"], final["SUM"]),
+                         ((3 - 5) & 0xF, 0xC, 3 ^ 5 ^ 1, 0, 6, 9))
+
+    def test_unknown_words(self):
+        # RAM -> INC: Z while CE# is high, X for the unwritten word, then
+        # the written word + 1
+        gates = [ram("RAM", "Addr", "Din", "WE#", "OE#", "CE#", "Dout", 2),
+                 WordGate("I", "INC", ["Dout"], "NEXT", 1, width=8),
+                 WordGate("E", "EQ", ["Dout", "Dout"], "SAME", 1, width=8)]
+        initial = {"Addr": 3, "Din": 0x41, "WE#": 1, "OE#": 0, "CE#": 1,
+                   "Dout": Z, "NEXT": X, "SAME": X}
+        transitions = {"CE#": [(10, 0)], "WE#": [(20, 0), (30, 1)]}
+        hist = simulate_netlist(compile_netlist(gates), initial, transitions, 40)
+        self.assertEqual(hist["Dout"], [(0, Z), (12, X), (22, 0x41)])
+        self.assertEqual(hist["NEXT"], [(0, X), (23, 0x42)])
+        self.assertEqual(hist["SAME"], [(0, X), (23, 1)])
+        # an X on an input of each word gate type (the MUX selects it, as
+        # with logic4 an X on the input a MUX does not select is ignored)
+        inputs = {"ADD": ["A", "B"], "SUB": ["A", "B"], "MUX": ["S", "A", "B"],
+                  "AND": ["A", "B"], "OR": ["A", "B"], "XOR": ["A", "B"], "NOT": ["A"]}
+        gates = [WordGate(gate_type, gate_type, ins, gate_type.lower(), 1, width=4)
+                 for gate_type, ins in inputs.items()]
+        hist = simulate_netlist(compile_netlist(gates), {"S": 0, "A": 5, "B": 6},
+                                {"A": [(5, X)]}, 10)
+        for gate_type in inputs:
+            self.assertEqual(hist[gate_type.lower()][-1], (6, X), gate_type)
+        hist = simulate_netlist(compile_netlist(gates), {"S": 0, "A": 5, "B": 6},
+                                {"S": [(5, Z)]}, 10)
+        self.assertEqual(hist["mux"][-1], (6, X))
+
+    def test_mux_select_past_the_data(self):
+        # a 2 bit select on 3 data inputs: S = 3 has nothing to select
+        gates = [WordGate("M", "MUX", ["S", "A", "B", "C"], "Y", 1, width=4)]
+        hist = simulate_netlist(compile_netlist(gates), {"S": 0, "A": 1, "B": 2, "C": 3, "Y": 1},
+                                {"S": [(5, 2), (10, 3), (15, 1)]}, 20)
+        self.assertEqual(hist["Y"], [(0, 1), (6, 3), (11, X), (16, 2)])
+
+    def test_reference_engine(self):
+        # the reference simulator works on whole words like the compiled one
+        gates = [WordGate("A", "AND", ["A", "B"], "AB", 1, width=8),
+                 WordGate("N", "NOT", ["A"], "NA", 1, width=8),
+                 WordGate("S", "SUB", ["A", "B"], "DIFF", 2, width=8),
+                 WordGate("I", "INC", ["AB"], "AB1", 1, width=8),
+                 WordGate("M", "MUX", ["S", "A", "B", "DIFF"], "Y", 1, width=8),
+                 ram("RAM", "A", "B", "WE#", "OE#", "CE#", "Dout", 2)]
+        initial = {"A": 0xF0, "B": 0x0F, "S": 0, "WE#": 1, "OE#": 0, "CE#": 0}
+        transitions = {"A": [(5, 0x3C), (20, 0xF0)], "B": [(8, X)],
+                       "S": [(10, 1), (12, 2), (15, 3)], "WE#": [(25, 0), (30, 1)]}
+        compiled = simulate(gates, initial, transitions, 40)
+        self.assertEqual(compiled["AB"], [(0, 0), (6, 0x0C), (9, X)])
+        self.assertEqual(compiled["NA"], [(0, 0), (6, 0xC3), (21, 0x0F)])
+        self.assertEqual(simulate(gates, initial, transitions, 40, engine="reference"),
+                         compiled)
+        hist = simulate(self.GATES, {"CLK": 1, "LOAD": 1, "IN": 0x90, "D": 0x90},
+                        {"CLK": Clock(20), "LOAD": [(25, 0)]}, 75, self.DFFS,
+                        engine="reference")
+        self.assertEqual(hist["ACC"], [(0, 0), (21, 0x90), (41, 0x20), (61, 0xB0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
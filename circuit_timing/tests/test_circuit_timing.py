@@ -0,0 +1,172 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Check the simulate_circuit instrumentation counts what it says it does and
+the transport delay and setup / hold timing of the reference simulator
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+
+from dataclasses import replace
+import random
+import unittest
+
+from circuit_timing.circuit_timing import (DFF, METASTABLE, Gate, SimStats, TimingViolation,
+                                           check_timing, simulate_circuit)
+from circuit_timing.generators import ripple_adder
+from circuit_timing.netlist import compile_netlist, simulate_netlist
+from circuit_timing.simulators import simulate
+from circuit_timing.tests import test_cycle_sim as mealy
+
+GATES = [Gate("G1", "AND", ["A", "B"], "X", 3),
+         Gate("G2", "NOT", ["X"], "Y", 2)]
+INITIAL = {"A": 0, "B": 0}
+TRANSITIONS = {"A": [(5, 1), (20, 0)], "B": [(10, 1), (30, 1)]}
+
+
+class TestSimStats(unittest.TestCase):
+    def test_counts(self):
+        stats = SimStats()
+        history = simulate_circuit(GATES, INITIAL, TRANSITIONS, 40, stats=stats)
+        self.assertEqual(history, simulate_circuit(GATES, INITIAL, TRANSITIONS, 40))
+        # 4 inputs, X rises at 13 and falls at 23, Y (starting at 0, not
+        # NOT X) only has to rise at 25
+        self.assertEqual(stats.pushed, 7)
+        self.assertEqual(stats.popped, 7)
+        self.assertEqual(stats.discarded, 1)  # B -> 1 again at 30
+        self.assertEqual(stats.toggles, {"A": 2, "B": 1, "X": 2, "Y": 1})
+        self.assertEqual(stats.gate_evals, {"G1": 3, "G2": 2})
+        self.assertEqual(stats.hottest(1), [("G1", 3)])
+        self.assertEqual(len(stats.depth_samples), 7)
+        self.assertEqual(stats.activity(40)["A"], 2 / 40)
+
+    def test_on_pop_and_sampling(self):
+        popped = []
+        stats = SimStats(sample_every=4)
+        simulate_circuit(ripple_adder(4), dict.fromkeys(["A0", "B0", "C0"], 0),
+                         {"A0": [(1, 1)], "C0": [(2, 1)]}, 100, stats=stats,
+                         on_pop=lambda *event: popped.append(event))
+        self.assertEqual(len(popped), stats.popped)
+        self.assertEqual(len(stats.depth_samples), stats.popped // 4)
+        self.assertEqual([t for t, *_ in popped], sorted(t for t, *_ in popped))
+        self.assertGreaterEqual(stats.peak_depth, max(depth for *_, depth in popped))
+        self.assertEqual(stats.pushed, stats.popped)
+
+    def test_events_past_end_time_are_not_popped(self):
+        stats = SimStats()
+        simulate_circuit(GATES, INITIAL, TRANSITIONS, 12, stats=stats)
+        # A at 5, B at 10 popped, X at 13 never pushed
+        self.assertEqual((stats.pushed, stats.popped), (2, 2))
+
+
+class TestTransportDelay(unittest.TestCase):
+    # a 2 ps pulse on A into a 5 ps inverter and a flip-flop clocked twice,
+    # 2 ps apart, inside its 10 ps clock to Q delay
+    GATES = [Gate("G1", "NOT", ["A"], "Y", 5)]
+    DFFS = [DFF("FF", "D", "CLK", "Q", 10)]
+    INITIAL = {"A": 0, "Y": 1, "D": 1, "CLK": 0}
+    TRANSITIONS = {"A": [(10, 1), (12, 0)],
+                   "CLK": [(10, 1), (11, 0), (12, 1)], "D": [(11, 0)]}
+
+    def test_pulse_shorter_than_the_delay(self):
+        # the evaluation at 12 has to be compared with the queued 0, not the
+        # current 1, or the recovery is dropped and Y / Q settle wrong
+        for engine in ("reference", "compiled"):
+            with self.subTest(engine=engine):
+                history = simulate(self.GATES, self.INITIAL, self.TRANSITIONS, 40,
+                                   self.DFFS, engine=engine)
+                self.assertEqual(history["Y"], [(0, 1), (15, 0), (17, 1)])
+                self.assertEqual(history["Q"], [(0, 0), (20, 1), (22, 0)])
+
+    def test_inputs_changing_together(self):
+        # A and B rise together, the XOR is queued 1 then 0 for the same
+        # time and has to end at the last one, not the larger
+        gates = [Gate("G1", "XOR", ["A", "B"], "Y", 2)]
+        transitions = {"A": [(10, 1)], "B": [(10, 1)]}
+        for engine, options in [("reference", {}), ("compiled", {}),
+                                ("compiled", {"scheduler": "wheel"})]:
+            with self.subTest(engine=engine, **options):
+                history = simulate(gates, {"A": 0, "B": 0}, transitions, 40,
+                                   engine=engine, **options)
+                self.assertEqual(history["Y"], [(0, 0)])
+
+
+class TestSetupHold(unittest.TestCase):
+    # D -> Q through a flip-flop with a 4 ps setup and 2 ps hold, then a buffer
+    DFFS = [DFF("FF", "D", "CLK", "Q", 3, setup=4, hold=2)]
+    GATES = [Gate("G1", "BUF", ["Q"], "Y", 1)]
+    INITIAL = {"D": 0, "CLK": 0}
+    CLK = [(10, 1), (20, 0), (30, 1), (40, 0), (50, 1)]
+
+    def simulate(self, d, metastable=False):
+        violations = []
+        history = simulate_circuit(self.GATES, self.INITIAL, {"CLK": self.CLK, "D": d}, 60,
+                                   dffs=self.DFFS, violations=violations,
+                                   metastable=metastable)
+        # found again from the finished history
+        self.assertEqual(check_timing(history, self.DFFS), violations)
+        return history, violations
+
+    def test_clean_data(self):
+        history, violations = self.simulate([(5, 1), (32, 0)])
+        self.assertEqual(violations, [])
+        self.assertEqual(history["Q"], [(0, 0), (13, 1), (53, 0)])
+
+    def test_setup_violation(self):
+        history, violations = self.simulate([(28, 1)])
+        self.assertEqual(violations, [TimingViolation("FF", "setup", 30, 28, 4)])
+        self.assertEqual(violations[0].margin, 2)
+        # without metastable the sampled value still comes out
+        self.assertEqual(history["Q"], [(0, 0), (33, 1)])
+
+    def test_hold_violation_goes_to_x(self):
+        history, violations = self.simulate([(5, 1), (11, 0)], metastable=True)
+        self.assertEqual(violations, [TimingViolation("FF", "hold", 10, 11, 2)])
+        # X replaces the 1 the edge queued for the same time
+        self.assertEqual(history["Q"], [(0, 0), (13, "X"), (33, 0)])
+        # X passes through the buffer, then clears at the next clean edge
+        self.assertEqual(history["Y"], [(0, 0), (14, "X"), (34, 0)])
+        self.assertEqual(history["Q"][1][1], METASTABLE)
+
+    def test_edge_and_data_at_the_same_time(self):
+        _, violations = self.simulate([(30, 1)])
+        self.assertEqual(len(violations), 1)
+
+    def test_compiled_history(self):
+        # what period_sweep does: the violations of a simulate_netlist run
+        # are the ones the reference simulator reports
+        dffs = [replace(ff, setup=12, hold=8) for ff in mealy.DFFS]
+        netlist = compile_netlist(mealy.GATES, dffs, extra_signals=list(mealy.INITIAL))
+        found = 0
+        for seed in range(5):
+            rng = random.Random(seed)
+            x = [(t, k % 2 ^ 1) for k, t in enumerate(sorted(rng.sample(range(400), 12)))]
+            transitions = {"CLK": mealy.clock(8), "X": x}
+            violations = []
+            simulate_circuit(mealy.GATES, mealy.INITIAL, transitions, 400, dffs=dffs,
+                             violations=violations)
+            history = simulate_netlist(netlist, mealy.INITIAL, transitions, 400)
+            self.assertEqual(check_timing(history, dffs), violations)
+            found += len(violations)
+        self.assertGreater(found, 0)
+
+    def test_data_named_before_the_clock(self):
+        # "A" sorts before "CLK", so a change at the edge is before it
+        dffs = [DFF("FF", "A", "CLK", "Q", 3, setup=4, hold=2)]
+        violations = []
+        history = simulate_circuit([], {"A": 0, "CLK": 0}, {"CLK": self.CLK, "A": [(30, 1)]},
+                                   60, dffs=dffs, violations=violations)
+        self.assertEqual(violations, [TimingViolation("FF", "setup", 30, 30, 4)])
+        self.assertEqual(check_timing(history, dffs), violations)
+
+    def test_unknown_and_level_at_the_same_time(self):
+        # events of one signal at one time pop in the order they were
+        # given, an X and a 1 are never compared with each other
+        history, _ = self.simulate([(20, METASTABLE), (20, 1)], metastable=True)
+        self.assertEqual(history["D"], [(0, 0), (20, "X"), (20, 1)])
+        self.assertEqual(history["Q"], [(0, 0), (33, 1)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Check the cycle based simulator against the event driven one
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+
+import unittest
+
+from circuit_timing.circuit_timing import DFF, Gate
+from circuit_timing.cycle_sim import sample_inputs, simulate_cycles
+from circuit_timing.netlist import compile_netlist, simulate_netlist
+
+PERIOD = 50
+GATES = [
+    Gate(name="G1", gate_type="NOT", inputs=["X"], output="X_bar", delay=10),
+    Gate(name="G2", gate_type="OR", inputs=["X_bar", "B"], output="A+", delay=15),
+    Gate(name="G3", gate_type="AND", inputs=["X", "A"], output="B+", delay=15),
+]
+DFFS = [
+    DFF(name="DFF A", d="A+", clk="CLK", q="A", delay=20),
+    DFF(name="DFF B", d="B+", clk="CLK", q="B", delay=20),
+]
+INITIAL = {"CLK": 1, "X": 0, "X_bar": 1, "A": 1, "A+": 1}
+
+
+def clock(n_cycles):
+    clk = [(0, 1)]
+    for i in range(n_cycles):
+        clk += [(i * PERIOD + PERIOD // 2, 0), ((i + 1) * PERIOD, 1)]
+    return clk
+
+
+class TestCycleSim(unittest.TestCase):
+    def test_matches_event_simulation(self):
+        # X changes 5 ps after each edge so it has settled by the next one
+        x = [(0, 0), (55, 1), (105, 0), (155, 1), (205, 0), (305, 1), (355, 0)]
+        n_cycles = 8
+        events = simulate_netlist(compile_netlist(GATES, DFFS), INITIAL,
+                                  {"CLK": clock(n_cycles), "X": x},
+                                  n_cycles * PERIOD + 30)
+        trace = simulate_cycles(GATES, DFFS, INITIAL,
+                                sample_inputs({"X": x}, PERIOD, n_cycles, INITIAL))
+        self.assertEqual(trace.n_cycles, n_cycles)
+        for name in ("A", "B"):
+            # state after the clk->Q delay of each cycle
+            times = [t for t, _ in events[name]]
+            for c in range(n_cycles):
+                t_mid = c * PERIOD + PERIOD // 2
+                idx = sum(1 for t in times if t <= t_mid) - 1
+                self.assertEqual(trace[name][c], events[name][idx][1], (name, c))
+
+    def test_to_history(self):
+        trace = simulate_cycles(GATES, DFFS, INITIAL, {"X": [0, 1, 1, 0]})
+        hist = trace.to_history(PERIOD, signals=["X", "A"])
+        self.assertEqual(hist["CLK"], clock(4))
+        self.assertEqual(hist["X"], [(0, 0), (50, 1), (150, 0)])
+        self.assertEqual(hist["A"], [(0, 1), (100, 0), (150, 1)])
+
+
+if __name__ == "__main__":
+    unittest.main()
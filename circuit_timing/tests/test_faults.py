@@ -0,0 +1,71 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Check the parallel-fault simulator against simulating each fault on its own
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+
+import unittest
+
+from circuit_timing.cells import CELL_FUNCTIONS
+from circuit_timing.circuit_timing import Gate
+from circuit_timing.faults import Fault, enumerate_faults, fault_simulate
+from circuit_timing.generators import ripple_adder
+
+
+def evaluate_with_fault(gates, inputs, row, fault=None):
+    """ Zero delay evaluation of gates listed in topological order. """
+    def force(name, value):
+        return fault.stuck_at if fault is not None and fault.signal == name else value
+    n = len(inputs)
+    values = {name: force(name, (row >> (n - 1 - i)) & 1) for i, name in enumerate(inputs)}
+    for g in gates:
+        out = CELL_FUNCTIONS[g.gate_type]([values[name] for name in g.inputs])
+        values[g.output] = force(g.output, out)
+    return values
+
+
+class TestFaults(unittest.TestCase):
+    def test_and_or(self):
+        # F = AB + C
+        gates = [Gate("G1", "AND", ["A", "B"], "X", 1),
+                 Gate("G2", "OR", ["X", "C"], "F", 1)]
+        report = fault_simulate(gates, ["A", "B", "C"])
+        # A s-a-0 shows when A = B = 1 and C = 0, minterm 6
+        self.assertEqual(report.detections[Fault("A", 0)], [6])
+        self.assertEqual(report.detecting_vectors(Fault("A", 0)),
+                         [{"A": 1, "B": 1, "C": 0}])
+        # X s-a-1 shows whenever AB = 0 and C = 0
+        self.assertEqual(report.detections[Fault("X", 1)], [0, 2, 4])
+        self.assertEqual(report.coverage, 1.0)
+
+    def test_matches_serial_faults(self):
+        gates = ripple_adder(4)
+        inputs = [f"{ab}{i}" for i in range(4) for ab in "AB"] + ["C0"]
+        outputs = [f"S{i}" for i in range(4)] + ["C4"]
+        faults = enumerate_faults(gates, inputs)
+        self.assertGreater(len(faults), 63)  # more than one word of faults
+        report = fault_simulate(gates, inputs, outputs)
+        for row in range(0, 1 << len(inputs), 7):
+            good = evaluate_with_fault(gates, inputs, row)
+            for fault in faults:
+                bad = evaluate_with_fault(gates, inputs, row, fault)
+                detected = any(good[name] != bad[name] for name in outputs)
+                self.assertEqual(row in report.detections[fault], detected, (fault, row))
+
+    def test_redundant_fault(self):
+        # F = AB + AB', the B fault can never be seen
+        gates = [Gate("N", "NOT", ["B"], "B'", 1),
+                 Gate("G1", "AND", ["A", "B"], "X", 1),
+                 Gate("G2", "AND", ["A", "B'"], "Y", 1),
+                 Gate("G3", "OR", ["X", "Y"], "F", 1)]
+        report = fault_simulate(gates, ["A", "B"], vectors=[[1, 0], [1, 1]])
+        self.assertIn(Fault("B", 0), report.undetected)
+        self.assertIn(Fault("B", 1), report.undetected)
+        self.assertEqual(report.detections[Fault("F", 0)], [0, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Check the generated benchmark circuits compute what they say they do
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+
+import unittest
+
+from circuit_timing.bit_parallel import exhaustive_truth_table
+from circuit_timing.circuit_timing import simulate_circuit
+from circuit_timing.cycle_sim import simulate_cycles
+from circuit_timing.generators import (array_multiplier, counter, lfsr, random_dag,
+                                       random_stimulus)
+from circuit_timing.netlist import compile_netlist, simulate_netlist, topological_order
+
+
+class TestGenerators(unittest.TestCase):
+    def test_array_multiplier(self):
+        n = 3
+        inputs = [f"A{i}" for i in reversed(range(n))] + [f"B{i}" for i in reversed(range(n))]
+        outputs = [f"P{k}" for k in range(2 * n)]
+        table = exhaustive_truth_table(array_multiplier(n), inputs, outputs)
+        columns = {name: table.column(name) for name in outputs}
+        for row in range(table.n_rows):
+            product = (row >> n) * (row & (2 ** n - 1))
+            for k in range(2 * n):
+                self.assertEqual(columns[f"P{k}"][row], (product >> k) & 1, (row, k))
+
+    def test_counter_counts(self):
+        n = 4
+        gates, dffs = counter(n)
+        trace = simulate_cycles(gates, dffs, {"EN": 1}, {"EN": [1] * 20})
+        for c in range(20):
+            value = sum(int(trace[f"Q{i}"][c]) << i for i in range(n))
+            self.assertEqual(value, c % 2 ** n)
+
+    def test_lfsr_maximal_length(self):
+        n = 5
+        gates, dffs = lfsr(n)
+        n_cycles = 2 ** n
+        trace = simulate_cycles(gates, dffs, {"Q0": 1}, {}, n_cycles)
+        states = [tuple(int(trace[f"Q{i}"][c]) for i in range(n)) for c in range(n_cycles)]
+        self.assertEqual(len(set(states[:-1])), 2 ** n - 1)
+        self.assertEqual(states[-1], states[0])
+        with self.assertRaises(ValueError):
+            lfsr(11)
+
+    def test_random_dag_is_acyclic_and_repeatable(self):
+        gates = random_dag(8, 300, seed=3)
+        self.assertEqual(len(topological_order(compile_netlist(gates))), 300)
+        self.assertEqual(gates, random_dag(8, 300, seed=3))
+        self.assertNotEqual(gates, random_dag(8, 300, seed=4))
+
+    def test_dag_matches_reference(self):
+        gates = random_dag(6, 120, seed=1)
+        inputs = [f"I{i}" for i in range(6)]
+        initial = dict.fromkeys(inputs, 0)
+        transitions = random_stimulus(inputs, 300, 10, seed=2)
+        for points in transitions.values():
+            self.assertEqual(len(points), 10)
+        expected = simulate_circuit(gates, initial, transitions, 400)
+        self.assertEqual(simulate_netlist(compile_netlist(gates), initial, transitions, 400),
+                         expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
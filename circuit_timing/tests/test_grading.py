@@ -0,0 +1,78 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Check the waveform diff and class grading against hand worked examples
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from circuit_timing.grading import diff_waveforms, grade_class, read_class_csv
+
+KEY = {"A": [(0, 0), (10, 1), (30, 0)],
+       "F": [(0, 1), (15, 0), (35, 1)]}
+
+
+class TestGrading(unittest.TestCase):
+    def test_diff(self):
+        student = {"A": [(0, 0), (10, 1), (30, 0)],
+                   "F": [(0, 1), (17, 0), (35, 1), (40, 0), (42, 1)]}
+        diff = diff_waveforms(KEY, student, 50)
+        self.assertEqual(diff["A"].wrong_time, 0)
+        self.assertIsNone(diff["A"].first_divergence)
+        self.assertEqual(diff["F"].intervals, [(15.0, 17.0), (40.0, 42.0)])
+        self.assertEqual(diff["F"].wrong_time, 4)
+        self.assertEqual(diff["F"].first_divergence, 15)
+
+    def test_tolerance(self):
+        student = {"A": KEY["A"], "F": [(0, 1), (17, 0), (35, 1), (40, 0), (42, 1)]}
+        diff = diff_waveforms(KEY, student, 50, tolerance=3)
+        # the late edge is forgiven, the glitch is not
+        self.assertEqual(diff["F"].intervals, [(40.0, 42.0)])
+        self.assertEqual(diff["F"].wrong_time, 2)
+
+    def test_class(self):
+        submissions = {
+            "perfect": KEY,
+            "inverted": {"A": [(0, 1), (10, 0), (30, 1)], "F": KEY["F"]},
+            "missing": {"A": KEY["A"]},
+            "unknown": {"A": [(0, "X"), (10, 1), (30, 0)], "F": KEY["F"]},
+        }
+        grades = grade_class(KEY, submissions, 50)
+        np.testing.assert_array_equal(grades.wrong_time,
+                                      [[0, 0], [50, 0], [0, 50], [10, 0]])
+        np.testing.assert_array_equal(grades.first_divergence[:, 0],
+                                      [np.nan, 0, np.nan, 0])
+        np.testing.assert_allclose(grades.scores(), [1, 0.5, 0.5, 0.9])
+        self.assertEqual(grades.intervals["unknown", "A"], [(0.0, 10.0)])
+
+    def test_large_class(self):
+        rng = np.random.default_rng(0)
+        shifts = rng.integers(-2, 3, size=300)
+        submissions = {f"s{i}": {"F": [(0, 1), (15 + int(d), 0), (35, 1)]}
+                       for i, d in enumerate(shifts)}
+        grades = grade_class(KEY, submissions, 50, signals=["F"])
+        np.testing.assert_array_equal(grades.wrong_time[:, 0], np.abs(shifts))
+
+    def test_read_csv(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "class.csv")
+            with open(path, "w") as file:
+                file.write("student,signal,time,value\n"
+                           "ann,F,15,0\nann,F,0,1\nann,F,35,1\n"
+                           "bob,F,0,X\nbob,F,20,0\n")
+            submissions = read_class_csv(path)
+        self.assertEqual(submissions["ann"]["F"], [(0, 1), (15, 0), (35, 1)])
+        self.assertEqual(submissions["bob"]["F"], [(0, "X"), (20, 0)])
+        grades = grade_class(KEY, submissions, 50, signals=["F"])
+        np.testing.assert_array_equal(grades.wrong_time[:, 0], [0, 15 + 5 + 15])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Check flattening of hierarchical modules
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+
+import unittest
+
+from circuit_timing.circuit_timing import Gate
+from circuit_timing.hierarchy import (Module, flatten_instances, full_adder, mux4,
+                                      register, ripple_adder_module)
+from circuit_timing.netlist import compile_netlist, simulate_netlist
+from circuit_timing.symbolic import symbolic_functions
+
+
+class TestHierarchy(unittest.TestCase):
+    def test_ripple_adder_adds(self):
+        n_bits = 3
+        gates, dffs = ripple_adder_module(n_bits).flatten()
+        self.assertEqual((len(gates), dffs), (5 * n_bits, []))
+        self.assertIn("FA1.P", {g.output for g in gates})
+        inputs = ["C0"] + [f"A{i}" for i in range(n_bits)] + [f"B{i}" for i in range(n_bits)]
+        table = symbolic_functions(gates, inputs)
+        outputs = [f"S{i}" for i in range(n_bits)] + [f"C{n_bits}"]
+        columns = [table.column(name) for name in outputs]
+        n = len(inputs)
+        for row in range(1 << n):
+            bits = {name: (row >> (n - 1 - i)) & 1 for i, name in enumerate(inputs)}
+            a = sum(bits[f"A{i}"] << i for i in range(n_bits))
+            b = sum(bits[f"B{i}"] << i for i in range(n_bits))
+            total = sum(columns[i][row] << i for i in range(n_bits + 1))
+            self.assertEqual(total, a + b + bits["C0"], row)
+
+    def test_template_is_cached(self):
+        self.assertIs(ripple_adder_module(16), ripple_adder_module(16))
+        cell_gates, _ = full_adder().flatten()
+        gates, _ = ripple_adder_module(16).flatten()
+        # every instance is a renamed copy of the same full adder template
+        self.assertIs(full_adder().flatten()[0][0], cell_gates[0])
+        self.assertEqual(gates[5 * 7].name, "FA7." + cell_gates[0].name)
+        self.assertIsNot(ripple_adder_module(16).flatten()[0], gates)
+
+    def test_nested_mux4(self):
+        # a mux4 inside a module inside the top level
+        wrapper = Module("Wrap", ("D0", "D1", "D2", "D3", "S1", "S0"), ("Y",),
+                         instances=[mux4().instance("M", I0="D0", I1="D1", I2="D2",
+                                                    I3="D3", S1="S1", S0="S0", Q="Y")])
+        gates, _ = flatten_instances([wrapper.instance(
+            "U1", D0="a", D1="b", D2="c", D3="d", S1="s1", S0="s0", Y="y")])
+        self.assertIn("U1.M.S1'", {g.output for g in gates})
+        table = symbolic_functions(gates, ["s1", "s0", "a", "b", "c", "d"])
+        for row, y in enumerate(table.column("y")):
+            sel = row >> 4
+            self.assertEqual(y, (row >> (3 - sel)) & 1, row)
+
+    def test_register_loads_when_enabled(self):
+        gates, dffs = register(2).flatten()
+        clk = [(0, 0)] + [(t, (t // 10) % 2) for t in range(10, 80, 10)]
+        transitions = {"CLK": clk, "EN": [(0, 1), (25, 0), (55, 1)],
+                       "In0": [(0, 1), (30, 0)], "In1": [(0, 0), (15, 1)]}
+        initial = {"CLK": 0, "EN": 1, "In0": 1, "In1": 0, "D0": 1}
+        hist = simulate_netlist(compile_netlist(gates, dffs), initial, transitions, 80)
+        # loads at 10 and 70, holds at the 30 and 50 edges with EN = 0
+        self.assertEqual(hist["Out0"], [(0, 0), (13, 1), (73, 0)])
+        self.assertEqual(hist["Out1"], [(0, 0), (73, 1)])
+
+    def test_errors(self):
+        fa = full_adder()
+        with self.assertRaises(ValueError):
+            Module("Bad", ("A",), (), instances=[fa.instance("U", A="A", B="A")]).flatten()
+        with self.assertRaises(ValueError):
+            Module("Bad", ("A", "B", "C"), ("X",),
+                   gates=[Gate("G", "NOT", ["A"], "X", 1)],
+                   instances=[fa.instance("U", A="A", B="B", Cin="C", Sum="X")]).flatten()
+        with self.assertRaises(ValueError):
+            Module("Bad", ("A",), ("X",), instances=[fa.instance(
+                "U", A="A", B="A", Cin="A", Carry="X")]).flatten()
+
+
+if __name__ == '__main__':
+    unittest.main()
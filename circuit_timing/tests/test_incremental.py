@@ -0,0 +1,63 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Check that re-simulating from a checkpoint gives the same result as a full run
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+
+import random
+import unittest
+
+from circuit_timing.incremental import IncrementalSimulator
+from circuit_timing.netlist import compile_netlist, simulate_netlist
+from circuit_timing.tests.test_cycle_sim import DFFS, GATES, INITIAL, PERIOD, clock
+from circuit_timing.generators import ripple_adder
+
+
+class TestIncremental(unittest.TestCase):
+    def test_mealy_moved_edge(self):
+        netlist = compile_netlist(GATES, DFFS)
+        end_time = 8 * PERIOD + 30
+        x = [(0, 0), (55, 1), (105, 0), (155, 1), (205, 0), (305, 1), (355, 0)]
+        for scheduler in ("heap", "wheel"):
+            sim = IncrementalSimulator(netlist, INITIAL, end_time, 20, scheduler=scheduler)
+            sim.run({"CLK": clock(8), "X": x})
+            for moved in ([(0, 0), (65, 1)] + x[2:],
+                          x[:4] + [(215, 0)] + x[5:],
+                          x[:-1]):
+                edited = {"CLK": clock(8), "X": moved}
+                self.assertEqual(sim.rerun(edited),
+                                 simulate_netlist(netlist, INITIAL, edited, end_time),
+                                 (scheduler, moved))
+                self.assertGreater(sim.resumed_from, 0)
+
+    def test_adder_converges(self):
+        n_bits = 8
+        gates = ripple_adder(n_bits)
+        netlist = compile_netlist(gates)
+        rng = random.Random(3)
+        initial = {f"{ab}{i}": 0 for ab in "AB" for i in range(n_bits)}
+        initial["C0"] = 0
+        inputs = {name: [(t, rng.randint(0, 1)) for t in range(100, 1000, 100)]
+                  for name in initial}
+        sim = IncrementalSimulator(netlist, initial, 1000, 25, inertial=True)
+        self.assertEqual(sim.run(inputs),
+                         simulate_netlist(netlist, initial, inputs, 1000, inertial=True))
+
+        inputs["A3"] = inputs["A3"][:4] + [(410, 1 - inputs["A3"][4][1])] + inputs["A3"][5:]
+        history = sim.rerun(inputs)
+        self.assertEqual(history,
+                         simulate_netlist(netlist, initial, inputs, 1000, inertial=True))
+        self.assertEqual(sim.resumed_from, 400)
+        self.assertIsNotNone(sim.converged_at)
+        self.assertLess(sim.converged_at, 700)
+        # the spliced checkpoints are good for another edit
+        inputs["B5"] = inputs["B5"][:7] + [(720, 1)] + inputs["B5"][7:]
+        self.assertEqual(sim.rerun(inputs),
+                         simulate_netlist(netlist, initial, inputs, 1000, inertial=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Test the four-state bitplane logic and tri-state bus resolution
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+
+import unittest
+
+import numpy as np
+
+from circuit_timing.bit_parallel import ALL_ONES, input_words
+from circuit_timing.buses import WordGate
+from circuit_timing.circuit_timing import Gate
+from circuit_timing.logic4 import (X, Z, decode, encode, evaluate4,
+                                   evaluate_planes, resolve)
+from circuit_timing.netlist import compile_netlist, simulate_netlist
+
+VALUES = (0, 1, X, Z)
+
+# reference tables: Z on a gate input reads as X
+AND = {(a, b): 0 if 0 in (a, b) else 1 if (a, b) == (1, 1) else X
+       for a in VALUES for b in VALUES}
+OR = {(a, b): 1 if 1 in (a, b) else 0 if (a, b) == (0, 0) else X
+      for a in VALUES for b in VALUES}
+
+# two RAM chips sharing a data line, as in the draw_ram_io_table exercises
+SHARED_BUS = [
+    Gate("B1", "TBUFN", ["D1", "OE1"], "DATA", 1),
+    Gate("B2", "TBUFN", ["D2", "OE2"], "DATA", 1),
+    Gate("N", "NOT", ["DATA"], "DATA'", 1),
+]
+
+
+class TestLogic4(unittest.TestCase):
+    def test_encode_decode(self):
+        for value in VALUES:
+            self.assertEqual(decode(encode(value)), value)
+        self.assertEqual(encode("10XZ"), (0b1010, 0b0011))
+        self.assertEqual(decode(encode("10XZ", 4), 4), "10XZ")
+        self.assertEqual(decode(encode(X, 8), 8), X)
+        self.assertEqual(decode(encode(0xA5, 8), 8), 0xA5)
+
+    def test_gate_tables(self):
+        for (a, b), expected in AND.items():
+            out = evaluate4([Gate("G", "AND", ["A", "B"], "F", 1),
+                             Gate("H", "OR", ["A", "B"], "O", 1),
+                             Gate("N", "NAND", ["A", "B"], "NF", 1)], {"A": a, "B": b})
+            self.assertEqual(out["F"], expected, (a, b))
+            self.assertEqual(out["O"], OR[(a, b)], (a, b))
+            self.assertEqual(out["NF"], X if expected == X else 1 - expected, (a, b))
+
+    def test_mux_unknown_select(self):
+        mux = [Gate("M", "MUX", ["S", "D0", "D1"], "Y", 1)]
+        self.assertEqual(evaluate4(mux, {"S": X, "D0": 1, "D1": 1})["Y"], 1)
+        self.assertEqual(evaluate4(mux, {"S": X, "D0": 0, "D1": 1})["Y"], X)
+        self.assertEqual(evaluate4(mux, {"S": 1, "D0": X, "D1": 0})["Y"], 0)
+
+    def test_resolve(self):
+        self.assertEqual(decode(resolve([encode(Z), encode(Z)])), Z)
+        self.assertEqual(decode(resolve([encode(Z), encode(1)])), 1)
+        self.assertEqual(decode(resolve([encode(0), encode(1)])), X)
+        self.assertEqual(decode(resolve([encode(X), encode(Z)])), X)
+        self.assertEqual(decode(resolve([encode("01Z", 3), encode("ZZ0", 3)], 0b111), 3), 0b010)
+        self.assertEqual(decode(resolve([encode("01Z", 3), encode("1ZZ", 3)], 0b111), 3), "X1Z")
+
+    def test_shared_bus(self):
+        both_off = evaluate4(SHARED_BUS, {"D1": 1, "OE1": 1, "D2": 0, "OE2": 1})
+        self.assertEqual(both_off["DATA"], Z)
+        self.assertEqual(both_off["DATA'"], X)
+        one_on = evaluate4(SHARED_BUS, {"D1": 1, "OE1": 0, "D2": 0, "OE2": 1})
+        self.assertEqual(one_on["DATA"], 1)
+        self.assertEqual(one_on["DATA'"], 0)
+        fight = evaluate4(SHARED_BUS, {"D1": 1, "OE1": 0, "D2": 0, "OE2": 0})
+        self.assertEqual(fight["DATA"], X)
+        # four lanes at once, one per OE1 / OE2 combination
+        lanes = evaluate4(SHARED_BUS, {"D1": "1111", "D2": "0000",
+                                       "OE1": "0011", "OE2": "0101"}, width=4)
+        self.assertEqual(lanes["DATA"], "X10Z")
+
+    def test_numpy_words(self):
+        # every row of a 2 input truth table with A = X in the odd rows
+        a_plane = input_words(2, 0)
+        x_plane = input_words(2, 1)
+        planes = evaluate_planes([Gate("G", "AND", ["A", "B"], "F", 1)],
+                                 {"A": (a_plane | x_plane, x_plane),
+                                  "B": (input_words(2, 1) ^ ALL_ONES, np.zeros_like(a_plane))},
+                                 full=ALL_ONES)
+        a, b = planes["F"]
+        # row bits: A then B (MSB first), B = not x_plane
+        for row in range(4):
+            value = decode((int(a[0] >> np.uint64(row)) & 1, int(b[0] >> np.uint64(row)) & 1))
+            a_in = X if (row & 1) else (row >> 1) & 1
+            b_in = (row & 1) ^ 1
+            self.assertEqual(value, AND[(a_in, b_in)], row)
+
+    def test_unknown_gate(self):
+        with self.assertRaises(ValueError):
+            evaluate4([Gate("G", "MAJ", ["A", "B", "C"], "F", 1)], {"A": 0, "B": 0, "C": 0})
+
+    def test_words_on_a_bus(self):
+        # a partly known word from the planes is a whole unknown word to a
+        # word gate, and so are X and Z
+        gates = [WordGate("ADD", "ADD", ["A", "B"], "SUM", 1, width=4)]
+        partly = decode(encode("10XZ", 4), 4)
+        for value in (partly, X, Z):
+            hist = simulate_netlist(compile_netlist(gates), {"A": 1, "B": 2, "SUM": 3},
+                                    {"B": [(5, value), (10, 3)]}, 20)
+            self.assertEqual(hist["SUM"], [(0, 3), (6, X), (11, 4)], value)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Check the RAM / ROM blocks in the event driven simulator and the RAM I/O
+table answer keys
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+
+import unittest
+
+from circuit_timing.buses import WordGate, signal_widths
+from circuit_timing.incremental import IncrementalSimulator
+from circuit_timing.logic4 import X, Z
+from circuit_timing.memory import (ArrayStorage, MemoryGate, PagedStorage, make_storage,
+                                   ram, ram_io_answers, rom, rom_image)
+from circuit_timing.monte_carlo import monte_carlo
+from circuit_timing.netlist import compile_netlist, simulate_netlist
+from circuit_timing.sources import Pattern
+from embeded_scripts.rom_files import make_bcd_hex6
+
+
+class TestMemory(unittest.TestCase):
+    def test_storage(self):
+        small = make_storage(8, [5, 6])
+        self.assertIsInstance(small, ArrayStorage)
+        self.assertEqual((small[0], small[1], small[2]), (5, 6, X))
+        large = make_storage(32, {0xFFFF_0000: 7})
+        self.assertIsInstance(large, PagedStorage)
+        large[0x1234_5678] = 9
+        self.assertEqual(large.written(), {0x1234_5678: 9, 0xFFFF_0000: 7})
+        self.assertEqual(large[0x1234_5679], X)
+        with self.assertRaises(ValueError):
+            make_storage(4, {16: 1})
+
+    def test_rom_bcd_image(self):
+        image = rom_image(make_bcd_hex6())
+        self.assertEqual(image[255], 0x255)
+        block = rom("ROM", "Addr", "OE#", "CE#", "Data", 3, image, width=12)
+        netlist = compile_netlist([block])
+        initial = {"Addr": 0, "OE#": 1, "CE#": 0, "Data": Z}
+        transitions = {"Addr": Pattern([0, 42, 199], 10, repeat=False),
+                       "OE#": [(5, 0), (35, 1)]}
+        hist = simulate_netlist(netlist, initial, transitions, 50)
+        self.assertEqual(hist["Data"], [(0, Z), (8, 0x000), (13, 0x042),
+                                        (23, 0x199), (38, Z)])
+
+    def test_ram_read_write(self):
+        block = ram("RAM", "Addr", "Din", "WE#", "OE#", "CE#", "Dout", 2,
+                    address_bits=20)
+        netlist = compile_netlist([block])
+        initial = {"Addr": 0x12345, "Din": 0xAB, "WE#": 1, "OE#": 0, "CE#": 1, "Dout": Z}
+        transitions = {"CE#": [(10, 0)],
+                       "WE#": [(20, 0), (30, 1)],
+                       "Addr": [(40, 0x12346), (50, 0x12345)]}
+        hist = simulate_netlist(netlist, initial, transitions, 60)
+        # unknown until written, write through, unwritten neighbour, read back
+        self.assertEqual(hist["Dout"], [(0, Z), (12, X), (22, 0xAB), (42, X), (52, 0xAB)])
+        self.assertEqual(block.storage.written(), {0x12345: 0xAB})
+        self.assertEqual(signal_widths([block]), {"Addr": 20, "Din": 8, "Dout": 8})
+
+    # reads address 5 at 12, writes 0xAB to it at 20 - 30 and reads address
+    # 6 and 5 after it; Dout + 1 so a word gate sees the RAM output too
+    RAM_GATES = [ram("RAM", "Addr", "Din", "WE#", "OE#", "CE#", "Dout", 2),
+                 WordGate("I", "INC", ["Dout"], "NEXT", 1, width=8)]
+    RAM_INITIAL = {"Addr": 5, "Din": 0xAB, "WE#": 1, "OE#": 0, "CE#": 0, "Dout": X,
+                   "NEXT": X}
+    RAM_INPUTS = {"OE#": [(10, 1), (12, 0)], "WE#": [(20, 0), (30, 1)],
+                  "Addr": [(40, 6), (50, 5)]}
+
+    def test_every_run_starts_empty(self):
+        netlist = compile_netlist(self.RAM_GATES)
+        first = simulate_netlist(netlist, self.RAM_INITIAL, self.RAM_INPUTS, 60)
+        # the write of an earlier run must not show up in the read at 12
+        self.assertEqual(first["Dout"], [(0, X), (12, Z), (14, X), (22, 0xAB),
+                                         (42, X), (52, 0xAB)])
+        for _ in range(2):
+            self.assertEqual(simulate_netlist(netlist, self.RAM_INITIAL,
+                                              self.RAM_INPUTS, 60), first)
+
+    def test_incremental_restores_memory(self):
+        netlist = compile_netlist(self.RAM_GATES)
+        sim = IncrementalSimulator(netlist, self.RAM_INITIAL, 60, 10)
+        sim.run(self.RAM_INPUTS)
+        # the write now goes to address 6, so address 5 reads X again
+        edited = dict(self.RAM_INPUTS, Addr=[(15, 6), (40, 5), (50, 6)])
+        expected = simulate_netlist(netlist, self.RAM_INITIAL, edited, 60)
+        self.assertEqual(sim.rerun(edited), expected)
+        self.assertEqual(sim.resumed_from, 10)
+        self.assertEqual(self.RAM_GATES[0].storage.written(), {6: 0xAB})
+        self.assertEqual(sim.rerun(self.RAM_INPUTS),
+                         simulate_netlist(netlist, self.RAM_INITIAL, self.RAM_INPUTS, 60))
+
+    def test_monte_carlo_with_memory(self):
+        kwargs = dict(n_trials=8, signals=["Dout", "NEXT"], seed=3)
+        serial = monte_carlo(self.RAM_GATES, self.RAM_INITIAL, self.RAM_INPUTS, 60,
+                             max_workers=1, **kwargs)
+        parallel = monte_carlo(self.RAM_GATES, self.RAM_INITIAL, self.RAM_INPUTS, 60,
+                               max_workers=2, **kwargs)
+        for name, times in serial.settle_times.items():
+            self.assertEqual(parallel.settle_times[name].tolist(), times.tolist())
+
+    def test_ram_io_answers(self):
+        rows = [(0xA0, 0x12, 0), (0xA1, "unknown", 1), ("", "", ""),
+                (0xA2, 0x34, 1), (0xA4, 0x56, 0), (0xA4, 0xA3, 1), (0xA4, 0xFF, 0),
+                (0xA0, 0x00, 1)]
+        self.assertEqual(ram_io_answers(rows),
+                         [0x12, "unknown", "", "unknown", 0x56, 0x56, 0xFF, 0x12])
+        self.assertEqual(ram_io_answers([(0xA2, 0, 1)], contents={0xA2: 0x34}), [0x34])
+
+    def test_long_sequence(self):
+        # 512 writes then reads
+        rows = [(i % 512, i & 0xFF, int(i >= 512)) for i in range(4096)]
+        answers = ram_io_answers(rows, address_bits=9)
+        self.assertEqual(answers[:3], [0, 1, 2])
+        self.assertEqual(answers[600], 600 % 512)
+
+    def test_address_out_of_range(self):
+        # 0x1A0 does not fit 8 address bits: X, and 0xA0 is not written
+        self.assertEqual(ram_io_answers([(0x1A0, 0x12, 0), (0xA0, 0, 1), (0x1A0, 0, 1)]),
+                         ["unknown", "unknown", "unknown"])
+        image = rom("ROM", "Addr", "OE#", "CE#", "Data", 1, [1, 2, 3, 4], address_bits=2)
+        evaluate = image.make_evaluator((0, 1, 2))
+        self.assertEqual(evaluate([3, 0, 0]), 4)
+        self.assertEqual(evaluate([4, 0, 0]), X)
+
+    def test_bad_pins(self):
+        with self.assertRaises(ValueError):
+            MemoryGate("R", "RAM", ["Addr", "OE#", "CE#"], "Data", 1)
+        with self.assertRaises(ValueError):
+            MemoryGate("R", "FIFO", ["Addr", "OE#", "CE#"], "Data", 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
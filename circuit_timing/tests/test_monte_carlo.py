@@ -0,0 +1,80 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Check the Monte Carlo delay variation statistics
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+
+from dataclasses import replace
+import unittest
+
+import numpy as np
+
+from circuit_timing.circuit_timing import Gate
+from circuit_timing.monte_carlo import monte_carlo, sample_delays
+from circuit_timing.tests.test_cycle_sim import DFFS, GATES, INITIAL, PERIOD, clock
+
+
+class TestMonteCarlo(unittest.TestCase):
+    # F = AB + A'C, X falls at 15 and Y rises at 13 + G1, so with inertial
+    # delays F only passes the pulse if it is at least the 1 ps OR delay wide
+    # (G1 > 3)
+    GATES = [
+        Gate("G1", "NOT", ["A"], "A'", 2),
+        Gate("G2", "AND", ["A", "B"], "X", 5),
+        Gate("G3", "AND", ["A'", "C"], "Y", 3),
+        Gate("G4", "OR", ["X", "Y"], "F", 1),
+    ]
+    INITIAL = {"A": 1, "B": 1, "C": 1, "X": 1, "F": 1}
+    DISTRIBUTIONS = {"G1": lambda rng, n: rng.uniform(0, 4, n),
+                     "G2": 0, "G3": 0, "G4": 0}
+
+    def test_glitch_probability(self):
+        n_trials = 200
+        kwargs = dict(n_trials=n_trials, distributions=self.DISTRIBUTIONS, seed=7,
+                      inertial=True)
+        delays = sample_delays(self.GATES, [], n_trials, self.DISTRIBUTIONS, seed=7)
+        expected = np.mean(delays[:, 0] > 3)
+        self.assertTrue(0.1 < expected < 0.4)
+
+        serial = monte_carlo(self.GATES, self.INITIAL, {"A": [(10, 0)]}, 40,
+                             max_workers=1, **kwargs)
+        self.assertAlmostEqual(serial.glitch_probability["F"], expected)
+        self.assertEqual(serial.glitch_probability["X"], 0)
+        np.testing.assert_allclose(serial.settle_times["Y"], 10 + delays[:, 0] + 3)
+
+        parallel = monte_carlo(self.GATES, self.INITIAL, {"A": [(10, 0)]}, 40,
+                               max_workers=2, **kwargs)
+        self.assertEqual(parallel.glitch_probability, serial.glitch_probability)
+        for name, times in serial.settle_times.items():
+            np.testing.assert_array_equal(parallel.settle_times[name], times)
+
+    def test_unconnected_initial_signal(self):
+        # a signal that is only given a starting value, e.g. one that is
+        # only plotted, still gets an id
+        initial = dict(self.INITIAL, LED=1)
+        result = monte_carlo(self.GATES, initial, {"A": [(10, 0)]}, 40, 4,
+                             max_workers=1, seed=1)
+        self.assertEqual(result.n_trials, 4)
+
+    def test_timing_violations(self):
+        x = [(0, 0), (55, 1), (105, 0), (155, 1), (205, 0)]
+        inputs = {"CLK": clock(5), "X": x}
+
+        def run(**window):
+            dffs = [replace(ff, **window) for ff in DFFS]
+            return monte_carlo(GATES, INITIAL, inputs, 5 * PERIOD, 20, dffs=dffs,
+                               max_workers=1, seed=1).violation_fraction
+
+        self.assertEqual(run(), 0)
+        # A+ and B+ settle 15 - 25 ps after X, well before the next edge
+        self.assertEqual(run(setup=10), 0)
+        self.assertEqual(run(setup=PERIOD - 5), 1)
+        # ... but well inside a hold window of most of the period
+        self.assertEqual(run(hold=PERIOD - 5), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
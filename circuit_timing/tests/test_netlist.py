@@ -0,0 +1,217 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Check the compiled netlist simulator against simulate_circuit
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+
+from dataclasses import replace
+import random
+import unittest
+from unittest import mock
+
+from circuit_timing.cells import CELL_FUNCTIONS, register_cell, truth_table
+from circuit_timing.circuit_timing import DFF, Gate, SimStats, X, simulate_circuit
+from circuit_timing.generators import ripple_adder
+from circuit_timing.hazards import find_glitches
+from circuit_timing.netlist import compile_netlist, simulate_netlist
+
+
+class TestCompiledNetlist(unittest.TestCase):
+    def test_two_gates(self):
+        gates = [
+            Gate(name="G1", gate_type="AND", inputs=["A", "B"], output="X", delay=3),
+            Gate(name="G2", gate_type="NOT", inputs=["X"], output="Y", delay=2),
+        ]
+        initial = {"A": 0, "B": 0}
+        transitions = {"A": [(5, 1), (20, 0)], "B": [(10, 1)]}
+        expected = simulate_circuit(gates, initial, transitions, 40)
+        result = simulate_netlist(compile_netlist(gates), initial, transitions, 40)
+        self.assertEqual(result, expected)
+        self.assertEqual(list(result), list(expected))
+
+    def test_ripple_adder_matches_reference(self):
+        rng = random.Random(3)
+        gates = ripple_adder(8)
+        initial = {f"{p}{i}": 0 for p in "AB" for i in range(8)}
+        initial["C0"] = 0
+        transitions = {name: sorted((rng.randrange(0, 200), rng.randrange(2))
+                                    for _ in range(4))
+                       for name in initial}
+        netlist = compile_netlist(gates)
+        expected = simulate_circuit(gates, initial, transitions, 250)
+        self.assertEqual(simulate_netlist(netlist, initial, transitions, 250),
+                         expected)
+
+    def test_timing_wheel_matches_heap(self):
+        rng = random.Random(5)
+        gates = ripple_adder(6)
+        initial = {f"{p}{i}": 0 for p in "AB" for i in range(6)}
+        initial["C0"] = 0
+        # far apart transitions so some start in the overflow heap
+        transitions = {name: sorted((float(rng.randrange(0, 2000)), rng.randrange(2))
+                                    for _ in range(6))
+                       for name in initial}
+        netlist = compile_netlist(gates)
+        expected = simulate_netlist(netlist, initial, transitions, 2100)
+        self.assertEqual(simulate_netlist(netlist, initial, transitions, 2100,
+                                          scheduler="wheel"), expected)
+
+    def test_same_time_transitions_in_listed_order(self):
+        # two transitions of one input at the same time: the one listed
+        # last is the value it keeps, as with simulate_circuit
+        gates = [Gate("N", "NOT", ["A"], "Y", 1)]
+        transitions = {"A": [(5, 1), (5, 0), (8, 1)]}
+        rng = random.Random(13)
+        adder = ripple_adder(4)
+        initial = {f"{p}{i}": 0 for p in "AB" for i in range(4)}
+        initial["C0"] = 0
+        adder_transitions = {}
+        for name in initial:
+            adder_transitions[name] = []
+            for t in sorted(rng.sample(range(0, 200, 5), 4)):
+                pair = [(t, 0), (t, 1)]
+                rng.shuffle(pair)
+                adder_transitions[name].extend(pair)
+        for scheduler in ("heap", "wheel"):
+            history = simulate_netlist(compile_netlist(gates), {"A": 0, "Y": 1},
+                                       transitions, 20, scheduler=scheduler)
+            self.assertEqual(history["Y"], [(0, 1), (9, 0)])
+            self.assertEqual(simulate_netlist(compile_netlist(adder), initial,
+                                              adder_transitions, 250, scheduler=scheduler),
+                             simulate_circuit(adder, initial, adder_transitions, 250))
+
+    def test_stats_match_reference(self):
+        rng = random.Random(4)
+        gates = ripple_adder(4)
+        initial = {f"{p}{i}": 0 for p in "AB" for i in range(4)}
+        initial["C0"] = 0
+        transitions = {name: sorted((rng.randrange(0, 100), rng.randrange(2))
+                                    for _ in range(3))
+                       for name in initial}
+        expected = SimStats(sample_every=5)
+        simulate_circuit(gates, initial, transitions, 150, stats=expected)
+        for scheduler in ("heap", "wheel"):
+            stats = SimStats(sample_every=5)
+            simulate_netlist(compile_netlist(gates), initial, transitions, 150,
+                             scheduler=scheduler, keep_history=False, stats=stats)
+            self.assertEqual(stats, expected, scheduler)
+
+    def test_dff_samples_on_rising_edge(self):
+        dffs = [DFF(name="FF", d="D", clk="CLK", q="Q", delay=2)]
+        transitions = {"CLK": [(10, 1), (20, 0), (30, 1), (40, 0)],
+                       "D": [(5, 1), (25, 0)]}
+        hist = simulate_netlist(compile_netlist([], dffs),
+                                {"CLK": 0, "D": 0}, transitions, 50)
+        self.assertEqual(hist["Q"], [(0, 0), (12, 1), (32, 0)])
+        hist = simulate_netlist(compile_netlist([], dffs), {"CLK": 0, "D": 0},
+                                transitions, 50, scheduler="wheel")
+        self.assertEqual(hist["Q"], [(0, 0), (12, 1), (32, 0)])
+
+    def test_unknown_gate_type(self):
+        with self.assertRaises(ValueError):
+            compile_netlist([Gate("G", "MAYBE", ["A"], "B", 1)])
+
+    def test_cell_tables_match_evaluators(self):
+        # registered for this test only; cleanups run last in first, so the
+        # cached tables are cleared after CELL_FUNCTIONS is put back
+        self.addCleanup(truth_table.cache_clear)
+        registry = mock.patch.dict(CELL_FUNCTIONS)
+        registry.start()
+        self.addCleanup(registry.stop)
+        register_cell("HA_CARRY", lambda x: x[0] & x[1])
+        # row bit 0 is S, bit 1 is D0, bit 2 is D1
+        self.assertEqual(truth_table("MUX", 3), bytes([0, 0, 1, 0, 0, 1, 1, 1]))
+        gates = [
+            Gate("M", "MUX", ["S", "A", "B"], "Y", 2),
+            Gate("J", "MAJ", ["A", "B", "C"], "M1", 3),
+            Gate("O", "AOI21", ["A", "Y", "C"], "N", 1),
+            Gate("F", "FA_SUM", ["M1", "N", "A"], "SUM", 2),
+            Gate("H", "HA_CARRY", ["SUM", "SUM"], "HC", 1),  # same signal twice
+            Gate("X", "XNOR", ["HC", "B"], "Z", 2),
+        ]
+        rng = random.Random(11)
+        initial = {"S": 0, "A": 0, "B": 0, "C": 0}
+        transitions = {name: sorted((rng.randrange(0, 100), rng.randrange(2))
+                                    for _ in range(8))
+                       for name in initial}
+        netlist = compile_netlist(gates)
+        no_tables = replace(netlist, gate_tables=(None,) * netlist.n_gates)
+        for inertial in (False, True):
+            self.assertEqual(
+                simulate_netlist(netlist, initial, transitions, 120, inertial=inertial),
+                simulate_netlist(no_tables, initial, transitions, 120, inertial=inertial))
+
+    def test_registered_cell_is_removed(self):
+        self.test_cell_tables_match_evaluators()
+        self.doCleanups()
+        self.assertNotIn("HA_CARRY", CELL_FUNCTIONS)
+        with self.assertRaises(ValueError):
+            truth_table("HA_CARRY", 2)
+
+    def test_unknown_input_clears(self):
+        # A goes 0 -> X -> 1 with B = 1: the table masks have to come back
+        # in step once the X is gone, AND(1, 1) = 1
+        gates = [Gate("G1", "AND", ["A", "B"], "Y", 1),
+                 Gate("G2", "MAJ", ["A", "B", "C"], "M", 1)]
+        initial = {"A": 0, "B": 1, "C": 0}
+        transitions = {"A": [(1, X), (3, 1), (5, 0)], "C": [(2, 1)]}
+        for scheduler in ("heap", "wheel"):
+            history = simulate_netlist(compile_netlist(gates), initial, transitions, 10,
+                                       scheduler=scheduler)
+            self.assertEqual(history["Y"], [(0, 0), (2, X), (4, 1), (6, 0)])
+            # MAJ has no logic4 plane operation: X while it depends on A
+            self.assertEqual(history["M"], [(0, 0), (2, X), (3, 1)])
+
+    def test_wide_gate_matches_reference(self):
+        ins = [f"I{i}" for i in range(10)]
+        gates = [Gate("W", "OR", ins, "Y", 2),
+                 Gate("N", "NAND", ["Y", "I0", "I9"], "Z", 1)]
+        netlist = compile_netlist(gates)
+        self.assertIsNone(netlist.gate_tables[0])
+        self.assertIsNotNone(netlist.gate_tables[1])
+        rng = random.Random(2)
+        initial = {name: 0 for name in ins}
+        transitions = {name: sorted((rng.randrange(0, 60), rng.randrange(2))
+                                    for _ in range(3))
+                       for name in ins}
+        self.assertEqual(simulate_netlist(netlist, initial, transitions, 80),
+                         simulate_circuit(gates, initial, transitions, 80))
+
+
+class TestHazards(unittest.TestCase):
+    # F = AB + A'C has a static-1 hazard when A falls with B = C = 1
+    GATES = [
+        Gate("G1", "NOT", ["A"], "A'", 2),
+        Gate("G2", "AND", ["A", "B"], "X", 3),
+        Gate("G3", "AND", ["A'", "C"], "Y", 3),
+        Gate("G4", "OR", ["X", "Y"], "F", 1),
+    ]
+    INITIAL = {"A": 1, "B": 1, "C": 1, "X": 1, "F": 1}
+    TRANSITIONS = {"A": [(10, 0)]}
+
+    def test_transport_glitch_is_reported(self):
+        hist = simulate_netlist(compile_netlist(self.GATES), self.INITIAL,
+                                self.TRANSITIONS, 30)
+        self.assertEqual(hist["F"], [(0, 1), (14, 0), (16, 1)])
+        glitches = find_glitches(hist, self.GATES, max_width=3)
+        self.assertEqual(len(glitches), 1)
+        glitch = glitches[0]
+        self.assertEqual((glitch.signal, glitch.start, glitch.width, glitch.level),
+                         ("F", 14, 2, 0))
+        self.assertEqual(glitch.cause, "X")
+        self.assertEqual(find_glitches(hist, self.GATES, max_width=2), [])
+
+    def test_inertial_delay_swallows_glitch(self):
+        # a 3 ps OR gate can not pass the 2 ps pulse
+        gates = self.GATES[:3] + [Gate("G4", "OR", ["X", "Y"], "F", 3)]
+        hist = simulate_netlist(compile_netlist(gates), self.INITIAL,
+                                self.TRANSITIONS, 30, inertial=True)
+        self.assertEqual(hist["F"], [(0, 1)])
+        self.assertEqual(find_glitches(hist, gates, max_width=3), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Conformance test: every engine behind the Simulator interface against the
+reference simulate_circuit
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+
+import random
+import unittest
+
+from circuit_timing import ENGINES, Simulator, get_simulator, simulate, simulate_circuit
+from circuit_timing.buses import WordGate
+from circuit_timing.circuit_timing import DFF
+from circuit_timing.tests.test_cycle_sim import DFFS, GATES, INITIAL, PERIOD, clock
+from circuit_timing.generators import ripple_adder
+from circuit_timing.logic4 import X
+from circuit_timing.memory import ram, rom
+from circuit_timing.sources import Clock
+from circuit_timing.waveform import Waveform
+
+N_BITS = 4
+ADDER = ripple_adder(N_BITS)
+ADDER_INITIAL = dict.fromkeys([f"{p}{i}" for p in "AB" for i in range(N_BITS)] + ["C0"], 0)
+# X of mealy_1, changing 5 ps after the edges so it has settled by the next one
+MEALY_X = [(0, 0), (55, 1), (105, 0), (155, 1), (205, 0), (305, 1), (355, 0)]
+N_CYCLES = 8
+
+# 8-bit accumulator that stores every sum in a RAM at the address held in a
+# 4-bit counter, which also looks up a ROM word added to the next sum
+WORD_GATES = [
+    WordGate("ADD", "ADD", ["ACC", "IN", "OFFSET"], "SUM", 4, width=8),
+    WordGate("MUX", "MUX", ["LOAD", "SUM", "IN"], "D", 2, width=8),
+    WordGate("INC", "INC", ["COUNT"], "NEXT", 1, width=4),
+    ram("RAM", "COUNT", "ACC", "WE#", "OE#", "CE#", "Dout", 2, address_bits=4),
+    rom("ROM", "COUNT", "OE#", "CE#", "OFFSET", 3, list(range(0, 32, 2)), address_bits=4),
+]
+WORD_DFFS = [DFF("REG", "D", "CLK", "ACC", 1), DFF("CNT", "NEXT", "CLK", "COUNT", 1)]
+WORD_INITIAL = {"CLK": 1, "LOAD": 1, "IN": 0x11, "WE#": 1, "OE#": 0, "CE#": 0,
+                "D": 0x11, "NEXT": 1, "Dout": X, "OFFSET": 0}
+
+
+def adder_stimulus(seed: int, spacing: int = 0):
+    """
+    Random input changes, or with spacing one input toggle every spacing
+    (no simultaneous changes, so every output settles in between).
+    """
+    rng = random.Random(seed)
+    if spacing:
+        transitions = {name: [] for name in ADDER_INITIAL}
+        levels = dict(ADDER_INITIAL)
+        for k in range(1, 11):
+            name = rng.choice(list(ADDER_INITIAL))
+            levels[name] ^= 1
+            transitions[name].append((k * spacing, levels[name]))
+        return transitions
+    return {name: sorted((rng.randrange(0, 200), rng.randrange(2)) for _ in range(4))
+            for name in ADDER_INITIAL}
+
+
+class TestConformance(unittest.TestCase):
+    EXACT = [get_simulator("reference"), get_simulator("compiled"),
+             get_simulator("compiled", scheduler="wheel")]
+
+    def test_engine_registry(self):
+        self.assertEqual(set(ENGINES), {"reference", "compiled", "cycle", "bit_parallel"})
+        with self.assertRaises(ValueError):
+            get_simulator("analog")
+        with self.assertRaises(TypeError):
+            Simulator()
+
+    def test_dffs_are_keyword_only(self):
+        # the old timing_diagrams order, simulate_circuit(gates, dffs, ...),
+        # must not take the flip-flops as the starting values
+        with self.assertRaises(TypeError):
+            simulate_circuit(GATES, DFFS, INITIAL, {"X": MEALY_X}, 100)
+
+    def test_exact_engines_combinational(self):
+        for seed in range(3):
+            transitions = adder_stimulus(seed)
+            expected = simulate_circuit(ADDER, ADDER_INITIAL, transitions, 250)
+            for engine in self.EXACT:
+                self.assertTrue(engine.exact_timing)
+                self.assertEqual(engine.simulate(ADDER, ADDER_INITIAL, transitions, 250),
+                                 expected, (type(engine).__name__, seed))
+
+    def test_exact_engines_sequential(self):
+        transitions = {"CLK": clock(N_CYCLES), "X": MEALY_X}
+        expected = simulate_circuit(GATES, INITIAL, transitions, 425, dffs=DFFS)
+        self.assertEqual(expected["A"][1], (120, 0))
+        for engine in self.EXACT:
+            self.assertEqual(engine.simulate(GATES, INITIAL, transitions, 425, DFFS),
+                             expected, type(engine).__name__)
+
+    def test_exact_engines_words_and_memory(self):
+        transitions = {"CLK": Clock(20), "LOAD": [(25, 0), (130, 1)],
+                       "IN": [(70, 0x05), (95, X), (110, 0x07)],
+                       "WE#": Clock(20), "OE#": [(150, 1), (170, 0)]}
+        expected = simulate_circuit(WORD_GATES, WORD_INITIAL, transitions, 200,
+                                    dffs=WORD_DFFS)
+        # ACC gains IN and the ROM word every cycle (0x11 + 0x11 + 2, then
+        # + 0x11 + 4) and the RAM reads back the words written while WE# is low
+        self.assertIn((61, 0x39), expected["ACC"])
+        self.assertIn((52, 0x24), expected["Dout"])
+        for engine in self.EXACT:
+            self.assertEqual(engine.simulate(WORD_GATES, WORD_INITIAL, transitions, 200,
+                                             WORD_DFFS),
+                             expected, type(engine).__name__)
+
+    def test_bit_parallel_settles_like_reference(self):
+        # 100 ps between input changes is longer than any path of the adder
+        transitions = adder_stimulus(7, spacing=100)
+        end_time = 1100
+        # the reference only re-evaluates a gate when an input changes, so
+        # start it from the settled state
+        settled_start = {name: points[0][1] for name, points in
+                         simulate(ADDER, ADDER_INITIAL, {}, 0, engine="bit_parallel").items()}
+        reference = {name: Waveform.from_points(points) for name, points in
+                     simulate_circuit(ADDER, settled_start, transitions, end_time).items()}
+        settled = simulate(ADDER, ADDER_INITIAL, transitions, end_time, engine="bit_parallel")
+        for name, wave in reference.items():
+            zero_delay = Waveform.from_points(settled[name])
+            for t in range(100, end_time, 100):
+                self.assertEqual(zero_delay.value_at(t), wave.value_at(t + 99), (name, t))
+
+    def test_cycle_settles_like_reference(self):
+        transitions = {"CLK": clock(N_CYCLES), "X": MEALY_X}
+        reference = simulate(GATES, INITIAL, transitions, N_CYCLES * PERIOD, DFFS,
+                             engine="reference")
+        cycles = simulate(GATES, INITIAL, transitions, N_CYCLES * PERIOD, DFFS,
+                          engine="cycle", period=PERIOD)
+        self.assertEqual(cycles["CLK"], clock(N_CYCLES))
+        for name in ("A", "B", "A+", "B+"):
+            wave = Waveform.from_points(reference[name])
+            per_cycle = Waveform.from_points(cycles[name])
+            for c in range(N_CYCLES):
+                # value just before the rising edge that ends cycle c
+                self.assertEqual(per_cycle.value_at(c * PERIOD),
+                                 wave.value_at((c + 1) * PERIOD - 1), (name, c))
+
+    def test_bit_parallel_rejects_dffs(self):
+        with self.assertRaises(ValueError):
+            simulate(GATES, INITIAL, {"X": MEALY_X}, 100, DFFS, engine="bit_parallel")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Check the lazy stimulus sources and simulating with them
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+
+from itertools import islice
+import unittest
+
+from circuit_timing.circuit_timing import Gate
+from circuit_timing.incremental import IncrementalSimulator
+from circuit_timing.netlist import compile_netlist, simulate_netlist
+from circuit_timing.sources import LFSR, Clock, Pattern, Periodic, Source, counter_sources
+from circuit_timing.tests.test_cycle_sim import DFFS, GATES, INITIAL, PERIOD, clock
+
+
+class TestSources(unittest.TestCase):
+    def test_clock_matches_list(self):
+        self.assertEqual(Clock(PERIOD, n_cycles=8).materialize(1000), clock(8))
+        self.assertEqual(Clock(PERIOD).materialize(100), clock(2))
+        self.assertEqual(Clock(10, start_level=0).materialize(10), [(0, 0), (5, 1), (10, 0)])
+
+    def test_lfsr_is_maximal_length(self):
+        bits = list(islice(LFSR(1)._values(), 254))
+        self.assertEqual(bits[:127], bits[127:])
+        self.assertEqual(sum(bits[:127]), 64)  # 2^(n - 1) ones per period
+        points = LFSR(10).materialize(1000)
+        self.assertTrue(all(a[1] != b[1] for a, b in zip(points, points[1:])))
+
+    def test_counter_and_pattern(self):
+        bits = counter_sources(["Q0", "Q1"], 10, start=1)
+        self.assertEqual(bits["Q0"].materialize(40), [(0, 1), (10, 0), (20, 1), (30, 0), (40, 1)])
+        self.assertEqual(bits["Q1"].materialize(40), [(0, 0), (10, 1), (30, 0)])
+        self.assertEqual(Pattern([1, 1, 0], 5).materialize(30),
+                         [(0, 1), (10, 0), (15, 1), (25, 0), (30, 1)])
+        self.assertEqual(Pattern([0, 1], 5, repeat=False).materialize(100), [(0, 0), (5, 1)])
+
+    def test_bases_are_abstract(self):
+        with self.assertRaises(TypeError):
+            Source()
+        with self.assertRaises(TypeError):
+            Periodic(10)
+
+    def test_simulate_with_sources(self):
+        netlist = compile_netlist(GATES, DFFS)
+        x = Pattern([0, 1, 0, 1, 0, 0, 1, 0], PERIOD, start_time=55)
+        end_time = 8 * PERIOD + 30
+        expected = simulate_netlist(netlist, INITIAL,
+                                    {"CLK": clock(9), "X": x.materialize(end_time)}, end_time)
+        for scheduler in ("heap", "wheel"):
+            lazy = simulate_netlist(netlist, INITIAL, {"CLK": Clock(PERIOD), "X": x},
+                                    end_time, scheduler=scheduler)
+            self.assertEqual(lazy, expected)
+        sim = IncrementalSimulator(netlist, INITIAL, end_time, 50)
+        self.assertEqual(sim.run({"CLK": Clock(PERIOD), "X": x}), expected)
+
+    def test_zero_gap_on_wheel(self):
+        # start_time=0 gives A two transitions at t = 0, the second one is
+        # pulled while the wheel is draining the t = 0 slot
+        netlist = compile_netlist([Gate("G", "AND", ["A", "B"], "Y", 1)])
+        transitions = {"B": [(1, 0), (2, 1)]}
+        hists = [simulate_netlist(netlist, {"A": 0, "B": 1},
+                                  dict(transitions, A=Pattern([0, 1, 0], 3, repeat=False,
+                                                              start_time=0)),
+                                  20, scheduler=scheduler)
+                 for scheduler in ("heap", "wheel")]
+        self.assertEqual(hists[0]["Y"], [(0, 0), (1, 1), (2, 0), (3, 1), (4, 0)])
+        self.assertEqual(hists[1], hists[0])
+
+    def test_endless_clock(self):
+        n_edges = []
+        simulate_netlist(compile_netlist(GATES, DFFS), INITIAL,
+                         {"CLK": Clock(PERIOD), "X": LFSR(PERIOD, start_time=55)},
+                         200_000, scheduler="wheel", keep_history=False,
+                         on_change=lambda t, name, v: name == "CLK" and n_edges.append(t))
+        self.assertEqual(len(n_edges), 2 * 200_000 // PERIOD)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Check static timing analysis on the mealy_1 circuit and a ripple adder
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+
+from dataclasses import replace
+import unittest
+
+from circuit_timing.generators import ripple_adder
+from circuit_timing.sta import period_sweep, static_timing
+from circuit_timing.tests.test_cycle_sim import DFFS, GATES, INITIAL
+
+SETUP_DFFS = [replace(ff, setup=5, hold=3) for ff in DFFS]
+
+
+class TestStaticTiming(unittest.TestCase):
+    def test_mealy(self):
+        report = static_timing(GATES, DFFS, clock_period=50)
+        self.assertEqual(report.endpoints, {"A+": 35, "B+": 35})
+        self.assertEqual(report.earliest["A+"], 25)
+        self.assertEqual(report.earliest["B+"], 15)
+        self.assertEqual(report.critical_path, [("B", 20), ("A+", 35)])
+        self.assertEqual(report.critical_delay, 35)
+        self.assertEqual(report.worst_slack, 15)
+
+    def test_ripple_carry_chain(self):
+        # C1 = XOR (3) + NAND (2) + NAND (2), then 2 NANDs per bit
+        report = static_timing(ripple_adder(4))
+        self.assertEqual(report.latest["C1"], 7)
+        self.assertEqual(report.latest["C4"], 7 + 3 * 4)
+        self.assertEqual(report.earliest["C4"], 2 + 1 + 2)
+        path = [name for name, _ in report.critical_path]
+        self.assertEqual(path, ["A0", "P0", "T0", "C1", "T1", "C2",
+                                "T2", "C3", "T3", "C4"])
+
+    def test_setup_and_hold_slack(self):
+        report = static_timing(GATES, SETUP_DFFS, clock_period=50)
+        self.assertEqual(report.min_period, 35 + 5)
+        self.assertEqual(report.slack, {"A+": 10, "B+": 10})
+        # earliest arrivals 25 and 15 minus the 3 ps hold
+        self.assertEqual(report.hold_slack, {"A+": 22, "B+": 12})
+        self.assertEqual(static_timing(GATES, DFFS).min_period, 35)
+
+    def test_period_sweep_matches_sta(self):
+        min_period = static_timing(GATES, SETUP_DFFS).min_period
+        points = period_sweep(GATES, SETUP_DFFS, [min_period - 2, min_period, 50], ["X"],
+                              n_cycles=200, initial_signals=INITIAL)
+        self.assertGreater(points[0].failure_rate, 0)
+        self.assertTrue(all(v.kind == "setup" for v in points[0].violations))
+        self.assertEqual([p.failure_rate for p in points[1:]], [0, 0])
+        # without setup / hold windows nothing is ever flagged
+        self.assertEqual(period_sweep(GATES, DFFS, [30], ["X"], 50, INITIAL)[0].violations, [])
+        with self.assertRaises(ValueError):
+            period_sweep(GATES, SETUP_DFFS + [replace(DFFS[0], clk="CLK2")], [50], ["X"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Check the streamed transitions match simulate_circuit and come out lazily
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+
+import asyncio
+import io
+import unittest
+
+from circuit_timing.circuit_timing import Gate, SimStats, iter_circuit, simulate_circuit
+from circuit_timing.generators import ripple_adder
+from circuit_timing.sources import Clock
+from circuit_timing.streaming import astream, iter_steps, sample_stream, stream
+from circuit_timing.tests.test_cycle_sim import DFFS, GATES, INITIAL, clock
+from circuit_timing.vcd import VCDWriter
+
+ADDER = ripple_adder(4)
+ADDER_INITIAL = dict.fromkeys([f"{p}{i}" for p in "AB" for i in range(4)] + ["C0"], 0)
+ADDER_INPUTS = {"A0": [(5, 1), (60, 0)], "B0": [(5, 1)], "C0": [(30, 1)], "B3": [(40, 1)]}
+
+
+def to_history(initial, transitions):
+    history = {name: [(0, value)] for name, value in initial.items()}
+    for time, name, value in transitions:
+        history.setdefault(name, [(0, 0)]).append((time, value))
+    return history
+
+
+class TestStreaming(unittest.TestCase):
+    def test_stream_matches_history(self):
+        expected = simulate_circuit(ADDER, ADDER_INITIAL, ADDER_INPUTS, 100)
+        events = list(stream(ADDER, ADDER_INITIAL, ADDER_INPUTS, 100))
+        self.assertEqual([t for t, _, _ in events], sorted(t for t, _, _ in events))
+        initial = {name: points[0][1] for name, points in expected.items()}
+        self.assertEqual(to_history(initial, events), expected)
+
+    def test_sequential_and_lazy_clock(self):
+        transitions = {"CLK": clock(4), "X": [(55, 1), (155, 0)]}
+        expected = simulate_circuit(GATES, INITIAL, transitions, 200, dffs=DFFS)
+        events = list(stream(GATES, INITIAL, transitions, 200, DFFS))
+        self.assertEqual(len(events), sum(len(p) - 1 for p in expected.values()))
+        lazy = stream(GATES, INITIAL, {"CLK": Clock(50)}, 10 ** 9, DFFS)
+        # an endless clock: only the transitions asked for are simulated
+        first = [next(lazy) for _ in range(5)]
+        self.assertEqual(first[0], (25, "CLK", 0))
+        self.assertEqual(first[1][:2], (50, "CLK"))
+
+    def test_backpressure(self):
+        popped = []
+        events = iter_circuit(ADDER, ADDER_INITIAL, ADDER_INPUTS, 100,
+                              on_pop=lambda *event: popped.append(event))
+        self.assertEqual(popped, [])   # nothing runs until asked
+        next(events)
+        self.assertEqual(len(popped), 1)
+
+    def test_stats_when_stopped_early(self):
+        stats = SimStats()
+        events = iter_circuit(ADDER, ADDER_INITIAL, ADDER_INPUTS, 100, stats=stats)
+        for time, name, value in events:
+            if name == "C0":
+                break
+        # stopped at C0 rising at 30, after A0 and B0 at 5 and before B3 at 40
+        self.assertEqual(stats.toggles["A0"], 1)
+        self.assertEqual(stats.toggles["C0"], 1)
+        self.assertEqual(stats.toggles["B3"], 0)
+        self.assertGreater(sum(stats.gate_evals.values()), 0)
+        self.assertEqual(stats.popped, sum(stats.toggles.values()) + stats.discarded)
+
+    def test_steps_and_samples(self):
+        events = [(0, "A", 1), (5, "A", 0), (5, "B", 1), (5, "A", 1), (12, "B", 0)]
+        self.assertEqual(list(iter_steps(events)),
+                         [(0, {"A": 1}), (5, {"A": 1, "B": 1}), (12, {"B": 0})])
+        samples = list(sample_stream(events, ["A", "B"], 5, end_time=20))
+        self.assertEqual([(s["A"], s["B"]) for s in samples],
+                         [(1, 0), (1, 1), (1, 1), (1, 0), (1, 0)])
+        with self.assertRaises(ValueError):
+            list(sample_stream(events, ["A"], 0))
+
+    def test_to_vcd(self):
+        buffer = io.StringIO()
+        writer = VCDWriter(buffer, ["A", "B", "X"], {"A": 0, "B": 0})
+        gates = [Gate("G1", "AND", ["A", "B"], "X", 3)]
+        for event in stream(gates, {"A": 0, "B": 0}, {"A": [(5, 1)], "B": [(10, 1)]}, 40):
+            writer.change(*event)
+        self.assertIn("#13\n1#", buffer.getvalue())
+
+    def test_async(self):
+        async def collect(**options):
+            return [event async for event in
+                    astream(ADDER, ADDER_INITIAL, ADDER_INPUTS, 100, **options)]
+
+        expected = list(stream(ADDER, ADDER_INITIAL, ADDER_INPUTS, 100))
+        self.assertEqual(asyncio.run(collect(yield_every=4)), expected)
+        self.assertEqual(asyncio.run(collect(time_scale=1e-5)), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
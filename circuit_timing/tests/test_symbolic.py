@@ -0,0 +1,55 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Check the symbolic truth tables against the bit-parallel ones
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+
+import unittest
+
+from circuit_timing.bit_parallel import exhaustive_truth_table
+from circuit_timing.circuit_timing import Gate
+from circuit_timing.symbolic import (equivalent, find_differences, input_function,
+                                     symbolic_functions)
+from circuit_timing.generators import ripple_adder
+
+# XOR made of four NAND gates, the usual key for "build XOR from NANDs"
+NAND_XOR = [
+    Gate("N1", "NAND", ["A", "B"], "T", 1),
+    Gate("N2", "NAND", ["A", "T"], "U", 1),
+    Gate("N3", "NAND", ["B", "T"], "V", 1),
+    Gate("N4", "NAND", ["U", "V"], "F", 1),
+]
+
+
+class TestSymbolic(unittest.TestCase):
+    def test_input_function(self):
+        # A B C rows 0..7, A is the MSB
+        self.assertEqual(input_function(3, 0), 0b11110000)
+        self.assertEqual(input_function(3, 1), 0b11001100)
+        self.assertEqual(input_function(3, 2), 0b10101010)
+
+    def test_matches_bit_parallel(self):
+        gates = ripple_adder(3) + [Gate("M", "MUX", ["S0", "S1", "C3"], "Y", 1)]
+        inputs = ["C0"] + [f"{ab}{i}" for i in range(3) for ab in "AB"]
+        outputs = ["S0", "S1", "S2", "C3", "Y"]
+        table = symbolic_functions(gates, inputs)
+        packed = exhaustive_truth_table(gates, inputs, outputs)
+        self.assertEqual(table.minterm_lists(outputs), packed.minterm_lists())
+        self.assertEqual(sorted(table.minterms("S0") + table.maxterms("S0")),
+                         list(range(128)))
+
+    def test_equivalence(self):
+        key = [Gate("X", "XOR", ["A", "B"], "F", 1)]
+        self.assertTrue(equivalent(NAND_XOR, key, ["A", "B"], ["F"]))
+        # a student who used an OR for the last gate gets rows 0 and 3 wrong
+        student = NAND_XOR[:3] + [Gate("N4", "OR", ["U", "V"], "F", 1)]
+        self.assertEqual(find_differences(student, key, ["A", "B"], ["F"]),
+                         {"F": [0, 3]})
+        self.assertFalse(equivalent(student, key, ["A", "B"], ["F"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
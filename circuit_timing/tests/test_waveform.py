@@ -0,0 +1,87 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Unittest the NumPy backed Waveform / WaveformSet
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from circuit_timing.netlist import compile_netlist, simulate_netlist
+from circuit_timing.tests.test_cycle_sim import DFFS, GATES, INITIAL, clock
+from circuit_timing.sources import Clock
+from circuit_timing.vcd import read_vcd, simulate_to_vcd
+from circuit_timing.waveform import Waveform, WaveformSet
+
+HISTORY = {"CLK": [(0, 1), (25.0, 0), (50, 1), (75.0, 0), (100, 1)],
+           "A": [(0, 1), (120, 0)]}
+
+
+class TestWaveform(unittest.TestCase):
+    def setUp(self):
+        self.waves = WaveformSet.from_history(HISTORY)
+
+    def test_round_trip(self):
+        self.assertEqual(self.waves.to_history(), HISTORY)
+        self.assertEqual(list(self.waves), ["CLK", "A"])
+        self.assertEqual(self.waves["A"], HISTORY["A"])
+        self.assertEqual(sorted(self.waves["CLK"], key=lambda p: p[0]), HISTORY["CLK"])
+
+    def test_value_at_and_sample(self):
+        clk = self.waves["CLK"]
+        self.assertEqual(clk.value_at(24), 1)
+        self.assertEqual(clk.value_at(25), 0)
+        self.assertEqual(clk.value_at(1000), 1)
+        np.testing.assert_array_equal(clk.sample([0, 30, 60, 80]), [1, 0, 1, 0])
+        np.testing.assert_array_equal(self.waves.sample([10, 130]), [[1, 1], [1, 0]])
+
+    def test_edges_and_window(self):
+        clk = self.waves["CLK"]
+        np.testing.assert_array_equal(clk.edges(), [50, 100])
+        np.testing.assert_array_equal(clk.edges(rising=False), [25, 75])
+        self.assertEqual(clk.window(30, 80).to_list(), [(30, 0), (50, 1), (75, 0)])
+
+
+class TestVCD(unittest.TestCase):
+    def test_round_trip_through_vcd(self):
+        netlist = compile_netlist(GATES, DFFS)
+        transitions = {"CLK": clock(8),
+                       "X": [(0, 0), (55, 1), (105, 0), (155, 1), (205, 0)]}
+        expected = simulate_netlist(netlist, INITIAL, transitions, 425)
+        with tempfile.TemporaryDirectory() as folder:
+            filename = os.path.join(folder, "mealy.vcd")
+            simulate_to_vcd(netlist, filename, INITIAL, transitions, 425)
+            waves = read_vcd(filename)
+        self.assertEqual(set(waves), set(expected))
+        for name, points in expected.items():
+            self.assertEqual(waves[name], points, name)
+
+    def test_half_unit_times(self):
+        # an odd period puts the falling clock edges on x.5 ps
+        netlist = compile_netlist(GATES, DFFS)
+        transitions = {"CLK": Clock(45, n_cycles=4), "X": [(0, 0), (55, 1), (105, 0)]}
+        expected = simulate_netlist(netlist, INITIAL, transitions, 180)
+        self.assertIn(22.5, [t for t, _ in expected["CLK"]])
+        with tempfile.TemporaryDirectory() as folder:
+            filename = os.path.join(folder, "odd.vcd")
+            simulate_to_vcd(netlist, filename, INITIAL, transitions, 180)
+            with open(filename) as file:
+                self.assertIn("$timescale 100 fs $end", file.read())
+            waves = read_vcd(filename)
+            ticks = read_vcd(filename, time_unit="100 fs")
+            with self.assertRaises(ValueError):
+                simulate_to_vcd(netlist, filename, INITIAL, transitions, 180,
+                                ticks_per_unit=1)
+        for name, points in expected.items():
+            self.assertEqual(waves[name], points, name)
+        self.assertEqual(ticks["CLK"].times.tolist()[:3], [0, 225, 450])
+
+
+if __name__ == "__main__":
+    unittest.main()
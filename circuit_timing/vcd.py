@@ -0,0 +1,299 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Write and read Value Change Dump (VCD) files.
+
+VCDWriter.change can be given to simulate_netlist as on_change, so every
+committed transition goes straight to the file instead of into the
+history dict and long runs only need memory for the circuit itself. The
+file opens in GTKWave or any other waveform viewer, and read_vcd loads it
+back as a WaveformSet for draw_signals(), so a simulation can be run once
+and the worksheets re-rendered from the cached file.
+
+Times are written as whole VCD ticks. A time that does not fall on a tick
+(e.g. the period / 2 edges of make_clock with an odd period and one tick
+per ps) is an error instead of being rounded; simulate_to_vcd picks enough
+ticks per time unit for the delays and input times it is given. read_vcd
+converts the ticks back to the time unit with the file's $timescale, so a
+write then read gives back the simulated times.
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+# standard libraries
+from fractions import Fraction
+from itertools import takewhile
+import math
+import re
+from typing import Dict, Iterable, Iterator, List, TextIO, Tuple
+
+# installed libraries
+import numpy as np
+
+# local files
+from circuit_timing.circuit_timing import LogicValue, Time
+from circuit_timing.netlist import Netlist, simulate_netlist
+from circuit_timing.sources import materialize_all
+from circuit_timing.waveform import Waveform, WaveformSet
+
+# printable characters VCD uses for the short signal codes
+_CODE_CHARS = [chr(c) for c in range(33, 127)]
+
+# VCD time units, as powers of 10 of a second
+_UNIT_EXPONENTS = {"s": 0, "ms": -3, "us": -6, "ns": -9, "ps": -12, "fs": -15}
+_TIMESCALE = re.compile(r"^\s*(1|10|100)\s*([munpf]?s)\s*$")
+MAX_TICKS_PER_UNIT = 10 ** 6
+
+
+def parse_timescale(timescale: str) -> Fraction:
+    """
+    Seconds in a VCD timescale such as "1 ps" or "100fs".
+
+    Raises
+    ------
+    ValueError
+        If it is not 1, 10 or 100 of s, ms, us, ns, ps or fs.
+    """
+    match = _TIMESCALE.match(timescale)
+    if match is None:
+        raise ValueError(f"Not a VCD timescale: {timescale!r}")
+    return int(match.group(1)) * Fraction(10) ** _UNIT_EXPONENTS[match.group(2)]
+
+
+def _format_timescale(seconds: Fraction) -> str:
+    """ "100 fs" for 1e-13, the inverse of parse_timescale. """
+    for unit, exponent in sorted(_UNIT_EXPONENTS.items(), key=lambda item: -item[1]):
+        for multiplier in (100, 10, 1):
+            if seconds == multiplier * Fraction(10) ** exponent:
+                return f"{multiplier} {unit}"
+    raise ValueError(f"{float(seconds)} s is not a VCD timescale")
+
+
+def _on_tick(ticks: float) -> bool:
+    return math.isclose(ticks, round(ticks), rel_tol=1e-9, abs_tol=1e-9)
+
+
+def ticks_per_unit_for(times: Iterable[Time]) -> int:
+    """
+    Smallest power of 10 ticks per time unit that puts every time (delays
+    and input times, so every sum of them too) on a whole tick.
+
+    Raises
+    ------
+    ValueError
+        If that takes more than MAX_TICKS_PER_UNIT ticks.
+    """
+    times = list(times)
+    ticks = 1
+    while not all(_on_tick(t * ticks) for t in times):
+        ticks *= 10
+        if ticks > MAX_TICKS_PER_UNIT:
+            raise ValueError("Times need more than MAX_TICKS_PER_UNIT VCD ticks per unit")
+    return ticks
+
+
+def _vcd_code(i: int) -> str:
+    code = ""
+    while True:
+        i, rem = divmod(i, len(_CODE_CHARS))
+        code += _CODE_CHARS[rem]
+        if i == 0:
+            return code
+        i -= 1
+
+
+class VCDWriter:
+    """
+    Stream signal changes to a VCD file.
+
+    Parameters
+    ----------
+    file : str or text file
+        Path or open file to write to.
+    signals : iterable of str or dict
+        Signal names, or name -> bit width for buses (default width 1).
+    initial : dict, optional
+        Starting value of the signals, 0 if not given.
+    time_unit : str, optional
+        What one simulation time unit is, default "1 ps".
+    ticks_per_unit : int, optional
+        VCD ticks per simulation time unit, e.g. 10 to keep half-ps times
+        exact (the timescale is then "100 fs"). Times that do not fall on
+        a tick raise ValueError.
+    module : str, optional
+        Name of the scope the signals are put in.
+    """
+    def __init__(self, file: str | TextIO,
+                 signals: Iterable[str] | Dict[str, int],
+                 initial: Dict[str, LogicValue] | None = None,
+                 time_unit: str = "1 ps",
+                 ticks_per_unit: int = 1,
+                 module: str = "circuit"):
+        timescale = _format_timescale(parse_timescale(time_unit) / ticks_per_unit)
+        if isinstance(file, str):
+            self._file = open(file, "w")
+            self._owns_file = True
+        else:
+            self._file = file
+            self._owns_file = False
+        if not isinstance(signals, dict):
+            signals = {name: 1 for name in signals}
+        self.widths = dict(signals)
+        self.codes = {name: _vcd_code(i) for i, name in enumerate(self.widths)}
+        self.ticks_per_unit = ticks_per_unit
+
+        initial = initial or {}
+        write = self._file.write
+        write(f"$timescale {timescale} $end\n")
+        write(f"$scope module {module} $end\n")
+        for name, width in self.widths.items():
+            write(f"$var wire {width} {self.codes[name]} {name.replace(' ', '_')} $end\n")
+        write("$upscope $end\n$enddefinitions $end\n")
+        write("#0\n$dumpvars\n")
+        for name in self.widths:
+            write(self._format(name, initial.get(name, 0)))
+        write("$end\n")
+        self._tick = 0
+
+    def _format(self, name: str, value: LogicValue) -> str:
+        if self.widths[name] == 1:
+            return f"{str(value).lower()}{self.codes[name]}\n"
+        if isinstance(value, int):
+            return f"b{value:b} {self.codes[name]}\n"
+        return f"b{str(value).lower()} {self.codes[name]}\n"
+
+    def change(self, time: Time, name: str, value: LogicValue):
+        """ Record that `name` changed to `value` at `time` (times must not go back). """
+        ticks = time * self.ticks_per_unit
+        tick = round(ticks)
+        if not _on_tick(ticks):
+            raise ValueError(f"Time {time} is not a whole number of VCD ticks, use "
+                             f"ticks_per_unit > {self.ticks_per_unit}")
+        if tick != self._tick:
+            if tick < self._tick:
+                raise ValueError(f"VCD times must not decrease: {time} after "
+                                 f"{self._tick / self.ticks_per_unit}")
+            self._file.write(f"#{tick}\n")
+            self._tick = tick
+        self._file.write(self._format(name, value))
+
+    __call__ = change
+
+    def close(self):
+        if self._owns_file:
+            self._file.close()
+
+    def __enter__(self) -> "VCDWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def simulate_to_vcd(netlist: Netlist,
+                    filename: str,
+                    initial_signals: Dict[str, LogicValue],
+                    input_transitions: Dict[str, List[Tuple[Time, LogicValue]]],
+                    end_time: Time,
+                    **kwargs):
+    """
+    Run simulate_netlist and stream every transition to a VCD file without
+    keeping the history in memory. Extra keyword arguments go to VCDWriter
+    (time_unit, ticks_per_unit, module); without ticks_per_unit it is
+    picked from the delays and input times with ticks_per_unit_for.
+    """
+    if "ticks_per_unit" not in kwargs:
+        input_transitions = materialize_all(input_transitions, end_time)
+        kwargs["ticks_per_unit"] = ticks_per_unit_for(
+            netlist.gate_delays + netlist.dff_delays +
+            tuple(t for trans in input_transitions.values() for t, _ in trans))
+    with VCDWriter(filename, netlist.signal_names, initial_signals, **kwargs) as vcd:
+        simulate_netlist(netlist, initial_signals, input_transitions, end_time,
+                         on_change=vcd.change, keep_history=False)
+
+
+def _parse_value(bits: str) -> LogicValue:
+    try:
+        return int(bits, 2)
+    except ValueError:
+        return bits.upper()
+
+
+def read_vcd(filename: str, time_unit: str = "1 ps") -> WaveformSet:
+    """
+    Load a VCD file as a WaveformSet, one Waveform per declared signal.
+
+    Times are converted from VCD ticks to time_unit with the $timescale of
+    the file, ints if a tick is a whole number of time units, else floats.
+    Values are ints, or "X" / "Z" style strings for unknown bits. VCDWriter
+    writes spaces in signal names as underscores, so "X Bar" comes back as
+    "X_Bar".
+    """
+    order: List[Tuple[str, str]] = []
+    times: Dict[str, List[int]] = {}
+    values: Dict[str, List[LogicValue]] = {}
+
+    with open(filename) as file:
+        tokens = (token for line in file for token in line.split())
+        timescale = _parse_tokens(tokens, order, times, values)
+
+    # time units per tick, a tick of 100 fs is 1 / 10 of a ps
+    scale = parse_timescale(timescale or "1 ps") / parse_timescale(time_unit)
+    waves = {}
+    for name, code in order:
+        vals = values[code]
+        # keep ints as ints when some values are "X" / "Z"
+        dtype = None if all(isinstance(v, int) for v in vals) else object
+        ticks = np.array(times[code], dtype=np.int64)
+        if scale.denominator == 1:
+            wave_times = ticks * scale.numerator
+        else:
+            wave_times = ticks * scale.numerator / scale.denominator
+        waves[name] = Waveform(wave_times, np.array(vals, dtype=dtype))
+    return WaveformSet(waves)
+
+
+def _parse_tokens(tokens: Iterator[str],
+                  order: List[Tuple[str, str]],
+                  times: Dict[str, List[int]],
+                  values: Dict[str, List[LogicValue]]) -> str | None:
+    """
+    Fill the per code times / values from a stream of VCD tokens, returns
+    the $timescale (None if the file has none).
+    """
+    tick = 0
+    timescale = None
+    for token in tokens:
+        if token == "$var":
+            _kind, _width, code, name = (next(tokens) for _ in range(4))
+            for token in tokens:  # skip an optional [msb:lsb] up to $end
+                if token == "$end":
+                    break
+            order.append((name, code))
+            times.setdefault(code, [])
+            values.setdefault(code, [])
+        elif token == "$timescale":
+            timescale = " ".join(takewhile(lambda t: t != "$end", tokens))
+        elif token in ("$scope", "$upscope", "$comment",
+                       "$date", "$version", "$enddefinitions"):
+            for token in tokens:
+                if token == "$end":
+                    break
+        elif token.startswith("#"):
+            tick = int(token[1:])
+        elif token[0] in "bBrR":
+            code = next(tokens)
+            _append(times[code], values[code], tick, _parse_value(token[1:]))
+        elif token[0] in "01xXzZ" and len(token) > 1:
+            _append(times[token[1:]], values[token[1:]], tick, _parse_value(token[0]))
+        # $dumpvars / $end markers around the initial values need nothing
+    return timescale
+
+
+def _append(times: List[int], values: List[LogicValue], tick: int, value: LogicValue):
+    # a value given twice at the same tick (e.g. $dumpvars then #0) keeps the last one
+    if times and times[-1] == tick:
+        values[-1] = value
+    else:
+        times.append(tick)
+        values.append(value)
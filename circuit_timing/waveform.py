@@ -0,0 +1,164 @@
+# Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
+
+"""
+Columnar storage for simulation histories.
+
+A Waveform keeps the transitions of one signal as two NumPy arrays (times
+and values) instead of a list of (time, value) tuples, so looking up the
+value at a time is a binary search and sampling many times at once is one
+vectorized call. Waveform still iterates as (time, value) pairs and
+WaveformSet is a read-only dict of Waveforms, so both can be handed to
+draw_signals() or anything else that expects the simulate_circuit history
+format.
+"""
+
+__author__ = "Kyle Vitautas Lopin"
+
+# standard libraries
+from collections.abc import Mapping, Sequence
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+# installed libraries
+import numpy as np
+
+# local files
+from circuit_timing.circuit_timing import LogicValue, Time
+
+
+class Waveform(Sequence):
+    """
+    Piecewise constant signal: values[i] holds from times[i] until times[i + 1].
+
+    Parameters
+    ----------
+    times : array like
+        Transition times, sorted ascending.
+    values : array like
+        Value after each transition, same length as times.
+    """
+    __slots__ = ("times", "values")
+
+    def __init__(self, times, values):
+        self.times = np.asarray(times)
+        self.values = np.asarray(values)
+        if self.times.shape != self.values.shape or self.times.ndim != 1:
+            raise ValueError("times and values must be 1D arrays of the same length")
+
+    @classmethod
+    def from_points(cls, points: Iterable[Tuple[Time, LogicValue]]) -> "Waveform":
+        """ Build from (time, value) pairs, sorting them by time if needed. """
+        points = sorted(points, key=lambda p: p[0])
+        if not points:
+            return cls(np.array([]), np.array([], dtype=np.int64))
+        times, values = zip(*points)
+        return cls(times, values)
+
+    # --- sequence of (time, value) pairs, like a history list
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return list(zip(self.times[i].tolist(), self.values[i].tolist()))
+        return self.times[i].item(), self.values[i].item()
+
+    def __iter__(self) -> Iterator[Tuple[Time, LogicValue]]:
+        return zip(self.times.tolist(), self.values.tolist())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Waveform):
+            return (np.array_equal(self.times, other.times) and
+                    np.array_equal(self.values, other.values))
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return f"Waveform({list(self)!r})"
+
+    def to_list(self) -> List[Tuple[Time, LogicValue]]:
+        return list(self)
+
+    # --- lookups
+    def value_at(self, t: Time) -> LogicValue:
+        """
+        Value of the signal at time t, O(log n). A transition at exactly t
+        counts, and before the first point the first value is assumed.
+        """
+        i = np.searchsorted(self.times, t, side="right") - 1
+        return self.values[max(i, 0)].item()
+
+    def sample(self, times) -> np.ndarray:
+        """ Value at each of the given times, vectorized value_at(). """
+        i = np.searchsorted(self.times, np.asarray(times), side="right") - 1
+        return self.values[np.maximum(i, 0)]
+
+    def edges(self, rising: bool = True) -> np.ndarray:
+        """ Times of the rising (0 -> 1) or falling (1 -> 0) edges. """
+        step = np.diff(self.values)
+        mask = step > 0 if rising else step < 0
+        return self.times[1:][mask]
+
+    def window(self, t_start: Time, t_end: Time) -> "Waveform":
+        """
+        The part of the waveform between t_start and t_end, starting with a
+        point at t_start that holds the value the signal had then.
+        """
+        lo = np.searchsorted(self.times, t_start, side="right")
+        hi = np.searchsorted(self.times, t_end, side="right")
+        times = np.concatenate(([t_start], self.times[lo:hi]))
+        values = np.concatenate(([self.value_at(t_start)], self.values[lo:hi]))
+        return Waveform(times, values.astype(self.values.dtype))
+
+
+class WaveformSet(Mapping):
+    """
+    Read-only dict of signal name -> Waveform, in the same key order as the
+    history it was made from.
+    """
+    def __init__(self, waveforms: Dict[str, Waveform]):
+        self._waveforms = dict(waveforms)
+
+    @classmethod
+    def from_history(cls, history: Dict[str, Iterable[Tuple[Time, LogicValue]]]
+                     ) -> "WaveformSet":
+        """ Convert a simulate_circuit() style history. """
+        return cls({name: points if isinstance(points, Waveform)
+                    else Waveform.from_points(points)
+                    for name, points in history.items()})
+
+    def __getitem__(self, name: str) -> Waveform:
+        return self._waveforms[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._waveforms)
+
+    def __len__(self) -> int:
+        return len(self._waveforms)
+
+    def __repr__(self) -> str:
+        return f"WaveformSet({list(self._waveforms)!r})"
+
+    def to_history(self) -> Dict[str, List[Tuple[Time, LogicValue]]]:
+        """ Back to the plain dict of (time, value) lists. """
+        return {name: wave.to_list() for name, wave in self._waveforms.items()}
+
+    def value_at(self, t: Time) -> Dict[str, LogicValue]:
+        return {name: wave.value_at(t) for name, wave in self._waveforms.items()}
+
+    def sample(self, times, signals: Iterable[str] | None = None) -> np.ndarray:
+        """
+        Sample several signals at the same times.
+
+        Returns
+        -------
+        numpy.ndarray
+            shape (n_signals, n_times), rows in `signals` order (default all).
+        """
+        names = list(self._waveforms) if signals is None else list(signals)
+        times = np.asarray(times)
+        if not names:
+            return np.empty((0, times.size))
+        return np.stack([self._waveforms[name].sample(times) for name in names])
+
+    def window(self, t_start: Time, t_end: Time) -> "WaveformSet":
+        return WaveformSet({name: wave.window(t_start, t_end)
+                            for name, wave in self._waveforms.items()})
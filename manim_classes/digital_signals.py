@@ -95,26 +95,63 @@ class DigitalSignal(VGroup):
             scene.add(dot)
 
         # Draw line segments
-        if len(points) > 1:
-            for i in range(len(points) - 1):
-                start = points[i]
-                end = points[i + 1]
-                line = Line(start, end, color=color)
-                self.signal_waveform.add(line)
-                # Check if vertical or horizontal
-                is_vertical = start[0] == end[0]
-                run_time = vertical_time if is_vertical else horizontal_time
+        self._play_segment(points, scene, color, dot, vertical_time, horizontal_time)
 
+    def draw_stream(
+             self,
+             values,
+             scene,
+             color=YELLOW,
+             show_dot=False,
+             **kwargs
+        ):
+        """
+        Draws values as they arrive from an iterator, e.g. samples of a
+        running simulation from circuit_timing.streaming.sample_stream, so the
+        waveform is animated while the circuit is still being simulated.
+
+        Parameters:
+        - values (iterable of float): Input values, consumed one at a time.
+        - scene (Scene): The calling Manim scene.
+        - color (Color): Color of the waveform lines.
+        - show_dot (bool): If True, shows a glowing dot at the leading edge.
+        - kwargs: vertical_time and horizontal_time, as for draw().
+        """
+        dot = None
+        last_y = None
+        for i, v in enumerate(values):
+            if self.threshold is not None:
+                v = self.high_level if v >= self.threshold else self.low_level
+            y_val = self.start_y + (self.high_level if v == self.high_level else self.low_level)
+            x_val = self.start_x + i * self.period * self.scale_x
+
+            if last_y is None:
                 if show_dot:
-                    scene.play(
-                        Create(line, rate_func=linear),
-                        dot.animate.move_to(end),
-                        dot.glow.animate.move_to(end),
-                        run_time=run_time,
-                        rate_func=linear
-                    )
-                else:
-                    scene.play(Create(line), run_time=run_time, rate_func=linear)
+                    dot = GlowDot([x_val, y_val, 0], color=color).scale(self.glow_dot_size)
+                    scene.add(dot)
+            else:
+                # the same horizontal then vertical segments draw() would make
+                segment = [[x_val - self.period * self.scale_x, last_y, 0], [x_val, last_y, 0]]
+                if y_val != last_y:
+                    segment.append([x_val, y_val, 0])
+                self._play_segment(segment, scene, color, dot, **kwargs)
+            last_y = y_val
+
+    def _play_segment(self, points, scene, color, dot, vertical_time=0.1, horizontal_time=1.0):
+        for start, end in zip(points[:-1], points[1:]):
+            line = Line(start, end, color=color)
+            self.signal_waveform.add(line)
+            run_time = vertical_time if start[0] == end[0] else horizontal_time
+            if dot is not None:
+                scene.play(
+                    Create(line, rate_func=linear),
+                    dot.animate.move_to(end),
+                    dot.glow.animate.move_to(end),
+                    run_time=run_time,
+                    rate_func=linear
+                )
+            else:
+                scene.play(Create(line), run_time=run_time, rate_func=linear)
 
 
 class DigitalSignalThresholdScene(Scene):
@@ -25,8 +25,8 @@ from schemdraw.logic import And, Or, Not, Xor, Buf
 # ---------------------------
 
 TOK_VAR   = 'VAR'   # variable names: A, B1, X_2, etc.
-TOK_LPAR  = '('
-TOK_RPAR  = ')'
+TOK_LPAR  = 'LPAR'
+TOK_RPAR  = 'RPAR'
 TOK_NOT   = 'NOT'   # !, ~, or postfix '
 TOK_AND   = 'AND'   # &, *
 TOK_OR    = 'OR'    # |, +
@@ -1,48 +1,217 @@
 # Copyright (c) 2025 Kyle Lopin (Naresuan University) <kylel@nu.ac.th>
 
 """
+Benchmark suite for the simulation engines.
 
+Runs every engine on the generated circuits of circuit_timing.generators
+(ripple carry adders, array multipliers, LFSRs, counters and random DAGs)
+at each size and measures
+
+    wall_time           best of --repeat runs of the plain engine, seconds
+    transitions         committed signal changes of the run
+    events              events popped off the queue (event driven engines)
+    events_per_sec      events (or transitions) / wall_time
+    peak_queue_depth    most events waiting in the queue at once
+    peak_rss_kb         peak resident memory of the process that ran the case
+
+Each case runs in a fresh process so peak_rss_kb belongs to that case only.
+Queue depth and event counts come from a second, instrumented run so they
+do not slow down the timed one.
+
+Results go to a JSON file; --compare old.json prints the cases that got
+slower than --threshold times their old wall time:
+
+    python scripts/timeits_.py --sizes 8 16 32 --out bench.json
+    python scripts/timeits_.py --sizes 8 16 32 --compare bench.json
 """
 
 __author__ = "Kyle Vitautas Lopin"
 
+# standard libraries
+import argparse
+import json
+import multiprocessing
+from pathlib import Path
+import platform
+import sys
 import time
+from typing import Dict, List, Tuple
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # adds DigitalLab/ to sys.path
+
+# local files
+from circuit_timing import generators
+from circuit_timing.circuit_timing import SimStats
+from circuit_timing.netlist import compile_netlist, simulate_netlist
+from circuit_timing.simulators import get_simulator
+
+CIRCUITS = ("adder", "multiplier", "lfsr", "counter", "dag")
+# engine label -> (engine name, options)
+ENGINES = {
+    "reference": ("reference", {}),
+    "compiled": ("compiled", {}),
+    "compiled_wheel": ("compiled", {"scheduler": "wheel"}),
+    "cycle": ("cycle", {}),
+    "bit_parallel": ("bit_parallel", {}),
+}
+PERIOD = 200         # clock period of the sequential circuits
+N_CYCLES = 50
+N_CHANGES = 20       # input toggles per input of the combinational circuits
+DAG_GATES_PER_BIT = 32
+
+
+def build_case(circuit: str, size: int) -> Tuple[list, list, Dict[str, int], Dict[str, list], int]:
+    """ gates, dffs, initial values, input transitions and end time of one case. """
+    end_time = PERIOD * N_CYCLES
+    if circuit in ("lfsr", "counter"):
+        if circuit == "lfsr":
+            taps = None if size in generators.LFSR_TAPS else (size, size - 1)
+            gates, dffs = generators.lfsr(size, taps)
+            initial = {"CLK": 0, "Q0": 1}
+            transitions = {}
+        else:
+            gates, dffs = generators.counter(size)
+            initial = {"CLK": 0, "EN": 0}
+            transitions = {"EN": [(1, 1)]}
+        transitions["CLK"] = [(t, v) for k in range(1, N_CYCLES + 1)
+                              for t, v in ((k * PERIOD - PERIOD // 2, 0), (k * PERIOD, 1))]
+        return gates, dffs, initial, transitions, end_time
+
+    if circuit == "adder":
+        gates = generators.ripple_adder(size)
+        inputs = [f"{p}{i}" for p in "AB" for i in range(size)] + ["C0"]
+    elif circuit == "multiplier":
+        gates = generators.array_multiplier(size)
+        inputs = [f"{p}{i}" for p in "AB" for i in range(size)]
+    elif circuit == "dag":
+        gates = generators.random_dag(size, DAG_GATES_PER_BIT * size, seed=size)
+        inputs = [f"I{i}" for i in range(size)]
+    else:
+        raise ValueError(f"Unknown circuit: {circuit}, use one of {CIRCUITS}")
+    transitions = generators.random_stimulus(inputs, end_time, N_CHANGES, seed=size)
+    return gates, [], dict.fromkeys(inputs, 0), transitions, end_time
+
+
+def queue_stats(gates, dffs, initial, transitions, end_time, scheduler) -> Dict[str, int]:
+    """ Instrumented compiled run, counted by simulate_netlist(..., stats=...). """
+    netlist = compile_netlist(gates, dffs, extra_signals=list(initial) + list(transitions))
+    # sample_every past any run, the depth samples are not reported
+    stats = SimStats(sample_every=sys.maxsize)
+    simulate_netlist(netlist, initial, transitions, end_time, scheduler=scheduler,
+                     keep_history=False, stats=stats)
+    return {"events": stats.popped, "pushed": stats.pushed,
+            "peak_queue_depth": stats.peak_depth}
+
+
+def peak_rss_kb() -> int | None:
+    """ Peak resident memory of this process in kB, None where unknown (Windows). """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # macOS reports bytes
+
+
+def run_case(circuit: str, size: int, label: str, repeat: int) -> Dict | None:
+    """ Measure one engine on one circuit, None if the engine can not run it. """
+    gates, dffs, initial, transitions, end_time = build_case(circuit, size)
+    engine, options = ENGINES[label]
+    if (engine == "cycle" and not dffs) or (engine == "bit_parallel" and dffs):
+        return None  # cycle needs flip-flops, bit_parallel can not have them
+    if engine == "cycle":
+        options = dict(options, period=PERIOD)
+    simulator = get_simulator(engine, **options)
+
+    wall_time = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        history = simulator.simulate(gates, initial, transitions, end_time, dffs)
+        wall_time = min(wall_time, time.perf_counter() - start)
+    transitions_count = sum(len(points) - 1 for points in history.values())
+
+    result = {"circuit": circuit, "size": size, "engine": label,
+              "n_gates": len(gates), "n_dffs": len(dffs),
+              "wall_time": wall_time, "transitions": transitions_count,
+              "events": None, "pushed": None, "peak_queue_depth": None}
+    if engine == "compiled":
+        result.update(queue_stats(gates, dffs, initial, transitions, end_time,
+                                  options.get("scheduler", "heap")))
+    counted = result["events"] if result["events"] is not None else transitions_count
+    result["events_per_sec"] = counted / wall_time if wall_time > 0 else None
+    result["peak_rss_kb"] = peak_rss_kb()
+    return result
+
+
+def run_isolated(args: Tuple[str, int, str, int]) -> Dict | None:
+    return run_case(*args)
+
+
+def run_suite(circuits, sizes, engines, repeat: int, isolate: bool = True) -> List[Dict]:
+    cases = [(circuit, size, label, repeat)
+             for circuit in circuits for size in sizes for label in engines]
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for case in cases:
+        if isolate:
+            # a new process per case, so the RSS peak is this case's own
+            with context.Pool(1) as pool:
+                result = pool.apply(run_isolated, (case,))
+        else:
+            result = run_case(*case)
+        if result is not None:
+            print(f"{result['circuit']:>10} {result['size']:>4} {result['engine']:>14}"
+                  f"  {result['wall_time'] * 1000:9.2f} ms"
+                  f"  {result['events_per_sec'] or 0:12,.0f} ev/s"
+                  f"  depth {result['peak_queue_depth'] or '-':>6}"
+                  f"  {result['peak_rss_kb'] or '-':>8} kB")
+            results.append(result)
+    return results
+
+
+def compare(results: List[Dict], old_path: str, threshold: float) -> List[Tuple[Dict, float]]:
+    """ Cases whose wall time is more than threshold x that of the old results. """
+    with open(old_path) as file:
+        old = {(r["circuit"], r["size"], r["engine"]): r for r in json.load(file)["results"]}
+    slower = []
+    for result in results:
+        before = old.get((result["circuit"], result["size"], result["engine"]))
+        if before and before["wall_time"] > 0:
+            ratio = result["wall_time"] / before["wall_time"]
+            if ratio > threshold:
+                slower.append((result, ratio))
+    return slower
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--circuits", nargs="+", default=list(CIRCUITS), choices=CIRCUITS)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[8, 16, 32])
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", default="benchmark_results.json")
+    parser.add_argument("--compare", help="earlier results JSON to check for slowdowns")
+    parser.add_argument("--threshold", type=float, default=1.2)
+    parser.add_argument("--no-isolate", action="store_true",
+                        help="run every case in this process (peak RSS is then cumulative)")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.circuits, args.sizes, args.engines, args.repeat,
+                        isolate=not args.no_isolate)
+    meta = {"python": platform.python_version(), "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "repeat": args.repeat,
+            "isolated": not args.no_isolate}
+    with open(args.out, "w") as file:
+        json.dump({"meta": meta, "results": results}, file, indent=1)
+    print(f"wrote {len(results)} results to {args.out}")
+
+    if args.compare:
+        slower = compare(results, args.compare, args.threshold)
+        for result, ratio in slower:
+            print(f"slower: {result['circuit']} {result['size']} {result['engine']} x{ratio:.2f}")
+        return 1 if slower else 0
+    return 0
 
-def using_modulo(nums):
-    count = 0
-    for n in nums:
-        if n % 2 == 1:  # check for odd
-            count += 1
-    return count
-
-def using_bitwise(nums):
-    count = 0
-    for n in nums:
-        if n & 0x01:  # check for odd
-            count += 1
-    return count
-
-# Generate a list of test numbers
-RANGE = 10_000_000
-nums = list(range(RANGE))  # 10 million numbers
-
-# Time using bitwise 1
-start = time.perf_counter()
-bit_result = using_bitwise(nums)
-bit_time = time.perf_counter() - start
-print(f"Using bitwise:  {RANGE} numbers in {bit_time:.4f} seconds")
-
-# Time using modulo
-start = time.perf_counter()
-mod_result = using_modulo(nums)
-mod_time = time.perf_counter() - start
-
-# Time using bitwise 2
-start = time.perf_counter()
-bit_result = using_bitwise(nums)
-bit_time = time.perf_counter() - start
-
-# Display results
-print(f"Using modulo:   {RANGE} numbers in {mod_time:.4f} seconds")
-print(f"Using bitwise:  {RANGE} numbers in {bit_time:.4f} seconds")
 
+if __name__ == '__main__':
+    sys.exit(main())